@@ -47,6 +47,10 @@ let
     inherit src frontendAssets compiledMessages;
     pythonEnv = productionEnv;
   };
+  jinja2Bytecode = pkgs.callPackage ./nix/jinja2-bytecode.nix {
+    inherit src;
+    pythonEnv = productionEnv;
+  };
   databaseWithMigrations = pkgs.callPackage ./nix/migrate.nix {
     inherit src;
     pythonEnv = productionEnv;
@@ -58,6 +62,7 @@ in
       frontendAssets
       compiledMessages
       staticAssets
+      jinja2Bytecode
       databaseWithMigrations
       ;
     docker = pkgs.callPackage ./nix/docker.nix {
@@ -66,6 +71,7 @@ in
         productionEnv
         frontendAssets
         staticAssets
+        jinja2Bytecode
         ;
     };
   };
@@ -1,15 +1,132 @@
+import base64
+import datetime
+import hashlib
+import json
+import math
+from typing import Any, List, Optional, Tuple
+
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.core.paginator import EmptyPage
+from django.db.models import Q, QuerySet
+from django.utils.encoding import force_bytes
+from django.utils.translation import gettext_lazy as _
+
+COUNT_CACHE_KEY_TEMPLATE = 'api.pagination.count.%s'
+
+
+class CountModes:
+    # Run COUNT(*) on every page
+    EXACT = 'exact'
+    # Reuse COUNT(*) result computed for the same query recently
+    CACHED = 'cached'
+    # Take row estimate from the query planner
+    ESTIMATED = 'estimated'
+
+
+def get_cached_count(queryset: QuerySet, timeout: int) -> int:
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        # Query never matches, e.g. `queryset.none()`
+        return 0
+    key = hashlib.md5(force_bytes(f"{sql}:{params!r}")).hexdigest()
+    cache_key = COUNT_CACHE_KEY_TEMPLATE % key
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
+
+
+def get_estimated_count(queryset: QuerySet) -> int:
+    """
+    Returns the number of rows estimated by the PostgreSQL planner
+    from the table statistics (`pg_class.reltuples` and column stats)
+    without executing the query.
+    """
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+    except EmptyResultSet:
+        return 0
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CountFreePaginationMixin:
+    """
+    Fetches `limit + 1` rows to find out whether the next page exists
+    instead of counting all rows matching the query.
+
+    Total is exact if the last page is reached, otherwise it depends on
+    the `count_mode`. The view could override the paginator default by
+    setting `pagination_count_mode` attribute.
+    """
+    count_mode = CountModes.EXACT
+    count_cache_timeout = 60
+
+    def get_count_mode(self, view=None) -> str:
+        return getattr(view, 'pagination_count_mode', self.count_mode)
 
+    def fetch_page(self, queryset, offset: int, limit: int, view=None) -> List[Any]:
+        results = list(queryset[offset:offset + limit + 1])
+        self.has_next = len(results) > limit
+        results = results[:limit]
+        self.count_is_exact = True
+        if not self.has_next:
+            if results or not offset:
+                self.count = offset + len(results)
+            else:
+                # Out of range page, total is unknown
+                self.count = self._get_approximate_count(queryset, view)
+        else:
+            self.count = self._get_approximate_count(queryset, view)
+            self.count = max(self.count, offset + limit + 1)
+        return results
 
-class StandardPagination(pagination.PageNumberPagination):
+    def _get_approximate_count(self, queryset, view) -> int:
+        self.count_is_exact = False
+        if self.get_count_mode(view) == CountModes.ESTIMATED:
+            return get_estimated_count(queryset)
+        return get_cached_count(queryset, self.count_cache_timeout)
+
+
+class StandardPagination(CountFreePaginationMixin, pagination.PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page = None
+        if self.get_count_mode(view) == CountModes.EXACT:
+            return super().paginate_queryset(queryset, request, view=view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            self.page_number = 1
+        self.page_number = max(self.page_number, 1)
+        self.page_size_value = page_size
+        self.request = request
+        offset = (self.page_number - 1) * page_size
+        results = self.fetch_page(queryset, offset, page_size, view=view)
+        if not results and self.page_number > 1:
+            msg = self.invalid_page_message.format(
+                page_number=self.page_number,
+                message=_('That page contains no results'))
+            raise NotFound(msg)
+        return results
+
     def get_paginated_response(self, data):
+        if self.page is None:
+            return self._get_count_free_paginated_response(data)
+
         try:
             previous_page_number = self.page.previous_page_number()
         except EmptyPage:
@@ -30,3 +147,114 @@ class StandardPagination(pagination.PageNumberPagination):
             },
             'results': data,
         })
+
+    def _get_count_free_paginated_response(self, data):
+        previous_page_number = self.page_number - 1 if self.page_number > 1 else None
+        next_page_number = self.page_number + 1 if self.has_next else None
+        return Response({
+            'pagination': {
+                'previous_page': previous_page_number,
+                'next_page': next_page_number,
+                'total_entries': self.count,
+                'total_entries_is_exact': self.count_is_exact,
+                'total_pages': math.ceil(self.count / self.page_size_value),
+                'page': self.page_number,
+            },
+            'results': data,
+        })
+
+
+class CountFreeLimitOffsetPagination(CountFreePaginationMixin,
+                                     pagination.LimitOffsetPagination):
+    def paginate_queryset(self, queryset, request, view=None):
+        self.has_next = None
+        if self.get_count_mode(view) == CountModes.EXACT:
+            return super().paginate_queryset(queryset, request, view=view)
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        return self.fetch_page(queryset, self.offset, self.limit, view=view)
+
+    def get_next_link(self):
+        if self.has_next is None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        offset = self.offset + self.limit
+        return replace_query_param(url, self.offset_query_param, offset)
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Paginates queryset ordered by the (`ordering_field`, pk) pair. The next
+    page is fetched with a range condition on the last seen key, so the cost
+    of the page doesn't depend on how deep it is and new records do not
+    shift page boundaries.
+
+    Only datetime ordering fields are supported.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    ordering_field = 'modified'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def is_requested(self, request) -> bool:
+        """Returns True if client asks for a paginated response."""
+        return (self.cursor_query_param in request.query_params or
+                self.page_size_query_param in request.query_params)
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, obj) -> str:
+        position = getattr(obj, self.ordering_field)
+        payload = json.dumps([position.isoformat(), obj.pk])
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request) -> Optional[Tuple[datetime.datetime, Any]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(encoded.encode('ascii'))
+            position, pk = json.loads(payload)
+            return datetime.datetime.fromisoformat(position), pk
+        except (TypeError, ValueError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> List[Any]:
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        queryset = queryset.order_by(self.ordering_field, 'pk')
+        if cursor is not None:
+            position, pk = cursor
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__gt': position}) |
+                Q(**{self.ordering_field: position, 'pk__gt': pk}))
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_next_cursor(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_cursor(),
+            'results': data,
+        })
@@ -0,0 +1,35 @@
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.pagination import CountModes, StandardPagination
+from users.models import User
+from users.tests.factories import UserFactory
+
+
+class CachedCountView:
+    pagination_count_mode = CountModes.CACHED
+
+
+def paginate(queryset, query_params):
+    request = Request(APIRequestFactory().get('/', query_params))
+    paginator = StandardPagination()
+    results = paginator.paginate_queryset(queryset, request, view=CachedCountView())
+    return paginator, results
+
+
+@pytest.mark.django_db
+def test_standard_pagination_count_free_out_of_range_page():
+    UserFactory.create_batch(3)
+    queryset = User.objects.order_by('pk')
+    paginator, results = paginate(queryset, {'page_size': 2, 'page': 2})
+    assert len(results) == 1
+    assert paginator.count == 3
+    with pytest.raises(NotFound):
+        paginate(queryset, {'page_size': 2, 'page': 3})
+    paginator, results = paginate(queryset.none(), {'page_size': 2})
+    assert results == []
+    assert paginator.count == 0
+    with pytest.raises(NotFound):
+        paginate(queryset.none(), {'page_size': 2, 'page': 2})
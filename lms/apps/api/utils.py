@@ -1,7 +1,7 @@
 import copy
 import hashlib
 from functools import wraps
-from typing import Iterable, Type
+from typing import Dict, Iterable, List, Type
 from urllib.parse import quote
 
 from rest_framework import serializers
@@ -54,6 +54,20 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
                 self.fields.pop(field_name)
 
 
+def get_projection(fields: Iterable[str], columns: Dict[str, Iterable[str]],
+                   required: Iterable[str] = ()) -> List[str]:
+    """
+    Maps serializer field names to the model fields that should be passed
+    to the `QuerySet.only` to render these serializer fields.
+    """
+    projection = list(required)
+    for field_name in fields:
+        if field_name not in columns:
+            raise ValueError(f"Unknown field '{field_name}'")
+        projection.extend(c for c in columns[field_name] if c not in projection)
+    return projection
+
+
 def create_serializer_class(name, fields):
     return type(name, (serializers.Serializer, ), fields)
 
@@ -1,14 +1,24 @@
 import logging
-from typing import TYPE_CHECKING, Iterable, Mapping, Set
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Set
+)
 
 from django.core import checks
 from django.db import models
-from django.db.models import prefetch_related_objects
+from django.db.models import (
+    BooleanField, Case, F, Q, QuerySet, Value, When, prefetch_related_objects
+)
+from django.db.models.expressions import BaseExpression
+from django.utils.safestring import SafeString, mark_safe
 
 from core.tasks import compute_model_fields
+from core.utils import MARKDOWN_RENDERER_VERSION, render_markdown
 
 logger = logging.getLogger(__name__)
 
+# Called with the number of processed and total objects
+ProgressCallback = Callable[[int, int], None]
+
 
 if TYPE_CHECKING:
     ModelMixinBase = models.Model
@@ -21,6 +31,11 @@ class DerivableFieldsMixin(ModelMixinBase):
     Before computing derivable field value make sure that any data this
     field depends on didn't cache (e.g. related queryset could be cached
     with .prefetch_related)
+
+    Derivable field could additionally declare `_aggregate_<field>`
+    classmethod that returns expression computing the field value for
+    the row (use `OuterRef('pk')` inside subqueries). These fields are
+    updated in bulk by `update_derivable_fields`.
     """
     # TODO: Make as an abstract property
     derivable_fields: Iterable[str] = []
@@ -79,6 +94,91 @@ class DerivableFieldsMixin(ModelMixinBase):
 
         return False
 
+    @classmethod
+    def get_derivable_field_expression(cls, field: str) -> Optional[BaseExpression]:
+        method = getattr(cls, '_aggregate_{}'.format(field), None)
+        if method is None:
+            return None
+        return method()
+
+    @classmethod
+    def _get_stale_pks(cls, pks: List[int], field: str,
+                       expression: BaseExpression) -> List[int]:
+        derived = 'derived_{}'.format(field)
+        is_actual = Case(
+            When(Q(**{field: F(derived)}) |
+                 Q(**{f'{field}__isnull': True, f'{derived}__isnull': True}),
+                 then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField())
+        return list(cls._base_manager  # type: ignore[attr-defined]
+                    .filter(pk__in=pks)
+                    .alias(**{derived: expression})
+                    .alias(is_actual=is_actual)
+                    .filter(is_actual=False)
+                    .values_list('pk', flat=True))
+
+    @classmethod
+    def update_derivable_fields(cls, queryset: Optional[QuerySet] = None,
+                                *derivable_fields: str,
+                                chunk_size: int = 1000,
+                                check: bool = False,
+                                progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Recomputes derivable fields of all objects in the queryset chunk by
+        chunk. Fields with an aggregate expression are recomputed in the
+        database and saved with one UPDATE per chunk for stale rows only,
+        other fields fall back to the per instance `_compute_<field>` method.
+        In `check` mode nothing is saved.
+
+        Returns the number of objects with a stale value by field.
+        """
+        if queryset is None:
+            queryset = cls._base_manager.all()  # type: ignore[attr-defined]
+        fields = list(derivable_fields or cls.derivable_fields)
+        expressions = {}
+        instance_fields = []
+        for field in fields:
+            expression = cls.get_derivable_field_expression(field)
+            if expression is None:
+                instance_fields.append(field)
+            else:
+                expressions[field] = expression
+        prefetch_fields = cls.prefetch_before_compute(*instance_fields)
+        stale = dict.fromkeys(fields, 0)
+        total = queryset.count()
+        processed = 0
+        last_pk = None
+        queryset = queryset.order_by('pk')
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            for field, expression in expressions.items():
+                stale_pks = cls._get_stale_pks(pks, field, expression)
+                stale[field] += len(stale_pks)
+                if stale_pks and not check:
+                    (cls._base_manager  # type: ignore[attr-defined]
+                     .filter(pk__in=stale_pks)
+                     .update(**{field: expression}))
+            if instance_fields:
+                objects = cls._base_manager.filter(pk__in=pks)  # type: ignore[attr-defined]
+                if prefetch_fields:
+                    objects = objects.prefetch_related(*prefetch_fields)
+                for obj in objects:
+                    derived_fields = [f for f in instance_fields
+                                      if obj._call_compute_method('_compute_{}'.format(f))]
+                    for field in derived_fields:
+                        stale[field] += 1
+                    if derived_fields and not check:
+                        obj.save(update_fields=derived_fields)
+            processed += len(pks)
+            if progress is not None:
+                progress(processed, total)
+        return stale
+
     def compute_fields_async(self, *derivable_fields) -> None:
         from django.contrib.contenttypes.models import ContentType
         if not isinstance(self, models.Model):
@@ -123,3 +223,74 @@ class DerivableFieldsMixin(ModelMixinBase):
                     id='derivable_mixin.E003',
                 ))
         return errors
+
+
+class RenderedMarkdownMixin(ModelMixinBase):
+    """
+    Stores html rendered from markdown fields in `<field>_html` columns.
+    Html is rendered on save, `markdown_version` column keeps the version
+    of the renderer. Values rendered with an outdated renderer are
+    re-rendered on access, use `render_markdown_html` command to update
+    them in bulk.
+
+    Usage example:
+        class News(RenderedMarkdownMixin, models.Model):
+            markdown_fields = ['text']
+
+            text = models.TextField()
+            text_html = models.TextField(blank=True, default='', editable=False)
+            markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
+        {{ news.get_html('text') }}
+    """
+    markdown_fields: Iterable[str] = []
+
+    @classmethod
+    def get_markdown_html_fields(cls) -> List[str]:
+        return [f'{field_name}_html' for field_name in cls.markdown_fields]
+
+    def render_markdown_fields(self) -> List[str]:
+        """Renders markdown fields and returns names of the updated fields."""
+        for field_name in self.markdown_fields:
+            text = getattr(self, field_name) or ''
+            setattr(self, f'{field_name}_html', render_markdown(text))
+        self.markdown_version = MARKDOWN_RENDERER_VERSION
+        return [*self.get_markdown_html_fields(), 'markdown_version']
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.render_markdown_fields()
+        elif not set(update_fields).isdisjoint(self.markdown_fields):
+            updated_fields = self.render_markdown_fields()
+            kwargs['update_fields'] = {*update_fields, *updated_fields}
+        super().save(*args, **kwargs)
+
+    def get_html(self, field_name: str) -> SafeString:
+        if self.markdown_version != MARKDOWN_RENDERER_VERSION:
+            updated_fields = self.render_markdown_fields()
+            if self.pk is not None:
+                values = {f: getattr(self, f) for f in updated_fields}
+                self.__class__._base_manager.filter(pk=self.pk).update(**values)
+        return mark_safe(getattr(self, f'{field_name}_html'))
+
+    @classmethod
+    def check(cls, **kwargs):
+        errors = super().check(**kwargs)
+        errors.extend(cls._check_rendered_markdown_fields())
+        return errors
+
+    @classmethod
+    def _check_rendered_markdown_fields(cls):
+        errors = []
+        field_names = {f.name for f in cls._meta.get_fields()}
+        for field_name in [*cls.get_markdown_html_fields(), 'markdown_version']:
+            if field_name not in field_names:
+                errors.append(
+                    checks.Error(
+                        f'`{cls.__name__}` is a subclass of RenderedMarkdownMixin '
+                        f'but `{field_name}` field is missing',
+                        obj=cls,
+                        id='rendered_markdown_mixin.E001',
+                    ))
+        return errors
@@ -0,0 +1,30 @@
+import os
+from hashlib import sha1
+
+from jinja2 import FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from django.conf import settings
+
+
+class SourceChecksumBytecodeCache(FileSystemBytecodeCache):
+    """
+    Stores compiled templates in the `JINJA2_BYTECODE_CACHE_DIR` directory,
+    the directory is created if missing. Cache key depends on the template
+    source, so workers running different releases (e.g. during rolling
+    restart) never overwrite each other's bytecode.
+
+    `name` is required by `django_jinja` backend and is not used.
+    """
+    def __init__(self, name=None):
+        directory = getattr(settings, "JINJA2_BYTECODE_CACHE_DIR", None)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(directory=directory)
+
+    def get_bucket(self, environment, name, filename, source):
+        checksum = self.get_source_checksum(source)
+        key = sha1(f"{name}|{checksum}".encode("utf-8")).hexdigest()
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
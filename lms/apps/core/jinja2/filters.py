@@ -3,11 +3,16 @@ from sorl.thumbnail import get_thumbnail
 
 from django.utils.timezone import now
 
-from core.utils import get_youtube_video_id, render_markdown_and_cache
+from core.utils import get_youtube_video_id, render_markdown
 
 
-def markdown(value, fragment_name, expires_in=0, *vary_on):
-    return mark_safe(render_markdown_and_cache(value, fragment_name, expires_in, *vary_on))
+def markdown(value, fragment_name=None, expires_in=0, *vary_on):
+    """
+    Rendered value is cached by the content, `fragment_name`, `expires_in`
+    and `vary_on` are left for compatibility with existing templates.
+    """
+    # Safe to mark, `render_markdown` sanitizes the output with bleach
+    return mark_safe(render_markdown(value))
 
 
 def pluralize(number, singular, genitive_singular, genitive_plural):
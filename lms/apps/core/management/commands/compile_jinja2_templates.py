@@ -0,0 +1,33 @@
+from jinja2 import TemplateSyntaxError
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+
+TEMPLATE_EXTENSIONS = ('html', 'jinja2', 'txt')
+
+
+class Command(BaseCommand):
+    help = ("Compiles Jinja2 templates and stores bytecode in the bytecode "
+            "cache. Run it at build time so workers don't compile templates "
+            "on first use.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', default='jinja2',
+                            help='Name of the Jinja2 template engine')
+
+    def handle(self, *args, **options):
+        try:
+            environment = engines[options['engine']].env
+        except (KeyError, AttributeError):
+            raise CommandError(f"Jinja2 engine {options['engine']} not found")
+        if environment.bytecode_cache is None:
+            raise CommandError("Bytecode cache is disabled")
+        compiled, failed = 0, 0
+        for name in environment.list_templates(extensions=TEMPLATE_EXTENSIONS):
+            try:
+                environment.get_template(name)
+                compiled += 1
+            except TemplateSyntaxError as e:
+                failed += 1
+                self.stderr.write(f"{name}: {e}")
+        self.stdout.write(f"Templates compiled: {compiled}, failed: {failed}")
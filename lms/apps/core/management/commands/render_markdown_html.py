@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db.mixins import RenderedMarkdownMixin
+from core.utils import MARKDOWN_RENDERER_VERSION, render_markdown_many
+
+
+class Command(BaseCommand):
+    help = ("Renders markdown fields of models with RenderedMarkdownMixin and "
+            "stores html. By default only values rendered with an outdated "
+            "renderer are updated.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', metavar='app_label.ModelName', nargs='*',
+                            help='Models to update, all by default')
+        parser.add_argument('--all', action='store_true', default=False,
+                            help='Re-render up to date values too')
+        parser.add_argument('--batch-size', dest='batch_size', type=int,
+                            default=500, help='Records per query')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                            help='Number of worker processes')
+
+    def get_models(self, labels):
+        if not labels:
+            return [m for m in apps.get_models()
+                    if issubclass(m, RenderedMarkdownMixin)]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            if not issubclass(model, RenderedMarkdownMixin):
+                raise CommandError(f"{model.__name__} model needs subclass of "
+                                   f"RenderedMarkdownMixin")
+            models.append(model)
+        return models
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        processes = max(options['processes'] or 1, 1)
+        models = self.get_models(options['models'])
+        # Worker processes are forked, don't share database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for model in models:
+                queryset = model._base_manager.order_by('pk')
+                if not options['all']:
+                    queryset = queryset.exclude(markdown_version=MARKDOWN_RENDERER_VERSION)
+                ids = list(queryset.values_list('pk', flat=True))
+                for i in range(0, len(ids), batch_size):
+                    batch = ids[i:i + batch_size]
+                    self.render_batch(executor, model, batch, processes)
+                self.stdout.write(f"{model._meta.label}: {len(ids)} updated")
+
+    @staticmethod
+    def render_batch(executor, model, ids, processes):
+        markdown_fields = list(model.markdown_fields)
+        html_fields = model.get_markdown_html_fields()
+        rows = list(model._base_manager
+                    .filter(pk__in=ids)
+                    .values_list('pk', *markdown_fields))
+        texts = [text or '' for row in rows for text in row[1:]]
+        chunk_size = max(len(texts) // processes, 1)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        rendered = iter([html for chunk in executor.map(render_markdown_many, chunks)
+                         for html in chunk])
+        objects = []
+        for row in rows:
+            obj = model(pk=row[0], markdown_version=MARKDOWN_RENDERER_VERSION)
+            for html_field in html_fields:
+                setattr(obj, html_field, next(rendered))
+            objects.append(obj)
+        model._base_manager.bulk_update(objects, [*html_fields, 'markdown_version'])
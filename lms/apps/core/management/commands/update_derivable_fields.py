@@ -23,6 +23,11 @@ class Command(AppCommand):
                             help='Customize one or more filters for queryset. '
                                  'Usage examples: '
                                  ' -f due_date__isnull=True -f id__in=[86]')
+        parser.add_argument('--chunk-size', dest='chunk_size', type=int,
+                            default=1000, help='Objects per UPDATE query')
+        parser.add_argument('--check', action='store_true', default=False,
+                            help='Report the number of objects with stale '
+                                 'values without updating them')
 
     def handle_app_config(self, app_config, **options):
         model_name = options['model_name']
@@ -35,19 +40,21 @@ class Command(AppCommand):
         custom_manager = getattr(model, options['custom_manager'] or 'objects')
         queryset_filters = options['queryset_filters']
 
+        queryset = custom_manager.all()
         if queryset_filters:
             queryset_filters = {
                 field: ast.literal_eval(value) for f in queryset_filters
                 for field, value in [f.split('=')]
             }
-            custom_manager = custom_manager.filter(**queryset_filters)
-        custom_manager = custom_manager.order_by()
-
-        count = 0
-        # TODO: replace with `core.utils.queryset_iterator`
-        for model_object in custom_manager.iterator():
-            count += int(model_object.compute_fields(*derivable_fields,
-                                                     prefetch=True))
-            # TODO: pause?
-
-        self.stdout.write(f'Updated {model_name} objects: {count}')
+            queryset = queryset.filter(**queryset_filters)
+
+        def progress(processed, total):
+            self.stdout.write(f'Processed {processed}/{total}')
+
+        stale = model.update_derivable_fields(queryset, *derivable_fields,
+                                              chunk_size=options['chunk_size'],
+                                              check=options['check'],
+                                              progress=progress)
+        action = 'Stale' if options['check'] else 'Updated'
+        for field, count in stale.items():
+            self.stdout.write(f'{action} {model_name}.{field}: {count}')
@@ -0,0 +1,147 @@
+"""
+Helpers on top of django-rq for jobs that are safe to coalesce.
+
+Enqueueing the same function with the same arguments while the previous
+job is still waiting in the queue (or in the scheduled registry) is a no-op,
+so bursts of identical requests result in a single execution.
+
+The pending job is marked with a `SET NX` key which is claimed atomically
+by the caller that enqueues the job and released by the job itself when
+it starts, so calls made while the job is running enqueue a new one.
+"""
+import hashlib
+import json
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django_rq import get_queue
+from rq import get_current_job
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+PENDING_JOB_STATUSES = frozenset({
+    JobStatus.QUEUED,
+    JobStatus.SCHEDULED,
+    JobStatus.DEFERRED,
+})
+METRIC_KEY = 'core.queues.{queue}.{metric}'
+# Marker outlives the job only if the job is lost, e.g. the queue was
+# flushed. Expired marker results in a duplicate job, not a lost one.
+UNIQUE_JOB_MARKER_TTL = timedelta(minutes=30)
+
+
+def get_unique_job_id(func: Callable, args: tuple = (),
+                      kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """Returns stable id derived from the function path and arguments."""
+    kwargs = kwargs or {}
+    func_path = f"{func.__module__}.{func.__qualname__}"
+    payload = json.dumps([list(args), kwargs], sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    return f"unique:{func_path}:{digest}"
+
+
+def _incr_metric(queue, metric: str) -> None:
+    key = METRIC_KEY.format(queue=queue.name, metric=metric)
+    queue.connection.incr(key)
+
+
+def _get_job_status(job_id: str, connection) -> Optional[str]:
+    try:
+        job = Job.fetch(job_id, connection=connection)
+    except NoSuchJobError:
+        return None
+    return job.get_status(refresh=False)
+
+
+def _release_marker(connection, unique_id: str, job_id: str) -> None:
+    # Not atomic, in the worst case the marker of the next job is removed
+    # and one more job is enqueued
+    value = connection.get(unique_id)
+    if value is not None and value.decode() == job_id:
+        connection.delete(unique_id)
+
+
+def _claim_marker(connection, unique_id: str, job_id: str,
+                  ttl: timedelta) -> bool:
+    if connection.set(unique_id, job_id, nx=True, ex=ttl):
+        return True
+    pending_job_id = connection.get(unique_id)
+    if pending_job_id is None:
+        # Released in between
+        return bool(connection.set(unique_id, job_id, nx=True, ex=ttl))
+    pending_job_id = pending_job_id.decode()
+    status = _get_job_status(pending_job_id, connection)
+    # Missing job could be enqueued right now by another caller
+    if status is None or status in PENDING_JOB_STATUSES:
+        return False
+    # The job has not released the marker, e.g. failed before start
+    _release_marker(connection, unique_id, pending_job_id)
+    return bool(connection.set(unique_id, job_id, nx=True, ex=ttl))
+
+
+def run_unique_job(unique_id: str, func: Callable, *args, **kwargs) -> Any:
+    """Releases the marker of the job and calls the job function."""
+    job = get_current_job()
+    if job is not None:
+        _release_marker(job.connection, unique_id, job.id)
+    return func(*args, **kwargs)
+
+
+def enqueue_unique(func: Callable, *args,
+                   queue_name: str = 'default',
+                   debounce: Optional[timedelta] = None,
+                   **kwargs) -> Optional[Job]:
+    """
+    Enqueues `func(*args, **kwargs)` unless an identical job is already
+    queued or scheduled. Returns the new job or `None` on a dedup hit.
+
+    With `debounce` the execution is postponed by the given period and all
+    identical calls made within this window are coalesced into that job.
+
+    Note:
+        Requires rq scheduler to be running for delayed jobs. Synchronous
+        queues (e.g. in tests) execute the job immediately.
+    """
+    queue = get_queue(queue_name)
+    if not queue.is_async:
+        return queue.enqueue(func, args=args, kwargs=kwargs)
+    connection = queue.connection
+    unique_id = get_unique_job_id(func, args, kwargs)
+    # Job ids are never reused, finished job could be still in the registry
+    job_id = str(uuid.uuid4())
+    ttl = UNIQUE_JOB_MARKER_TTL + (debounce or timedelta())
+    if not _claim_marker(connection, unique_id, job_id, ttl):
+        _incr_metric(queue, 'dedup_hits')
+        logger.debug(f"Job {unique_id} is already pending, skip enqueueing")
+        return None
+    _incr_metric(queue, 'enqueued')
+    job_args = (unique_id, func, *args)
+    description = f"{func.__module__}.{func.__qualname__}{args}"
+    try:
+        if debounce:
+            return queue.enqueue_in(debounce, run_unique_job, args=job_args,
+                                    kwargs=kwargs, job_id=job_id,
+                                    description=description)
+        return queue.enqueue(run_unique_job, args=job_args, kwargs=kwargs,
+                             job_id=job_id, description=description)
+    except Exception:
+        _release_marker(connection, unique_id, job_id)
+        raise
+
+
+def get_queue_metrics(queue_name: str = 'default') -> Dict[str, int]:
+    """Returns queue length and dedup statistics of the `enqueue_unique`."""
+    queue = get_queue(queue_name)
+    connection = queue.connection
+    metrics = {
+        'queued': queue.count,
+        'scheduled': queue.scheduled_job_registry.count,
+    }
+    for metric in ('enqueued', 'dedup_hits'):
+        key = METRIC_KEY.format(queue=queue.name, metric=metric)
+        metrics[metric] = int(connection.get(key) or 0)
+    return metrics
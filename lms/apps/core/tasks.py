@@ -14,11 +14,5 @@ def compute_model_fields(content_type_id, object_id, compute_fields):
         return
 
     if issubclass(model, DerivableFieldsMixin):
-        queryset = model._base_manager  # type: ignore
-
-        prefetch_fields = model.prefetch_before_compute(*compute_fields)
-        if prefetch_fields:
-            queryset = queryset.prefetch_related(*prefetch_fields)
-
-        obj = queryset.get(id=object_id)
-        obj.compute_fields(*compute_fields)
+        queryset = model._base_manager.filter(pk=object_id)  # type: ignore
+        model.update_derivable_fields(queryset, *compute_fields)
@@ -1,8 +1,6 @@
 import os
 import re
 
-from django.core.cache import InvalidCacheBackendError, caches
-from django.core.cache.utils import make_template_fragment_key
 from django.template import Library, Node, TemplateSyntaxError, VariableDoesNotExist
 from django.template.base import TextNode
 from django.utils.safestring import mark_safe
@@ -94,40 +92,31 @@ class MarkdownNode(Node):
         except VariableDoesNotExist:
             raise TemplateSyntaxError('"cache" tag got an unknown variable: %r' % self.expire_time_var.var)
         try:
-            expire_time = int(expire_time)
+            int(expire_time)
         except (ValueError, TypeError):
             raise TemplateSyntaxError('"cache" tag got a non-integer timeout value: %r' % expire_time)
-        try:
-            fragment_cache = caches['markdown_fragments']
-        except InvalidCacheBackendError:
-            fragment_cache = caches['default']
-
-        vary_on = [var.resolve(context) for var in self.vary_on]
-        cache_key = make_template_fragment_key(self.fragment_name, vary_on)
-        value = fragment_cache.get(cache_key)
-        if value is None:
-            context.autoescape = False
-            # Remove unnecessary line breaks and whitespaces. Example:
-            # {% markdown %}\n <- LB for readability in tpl{% endmarkdown %}
-            if self.nodelist:
-                if isinstance(self.nodelist[0], TextNode) and \
-                   not self.nodelist[0].s.strip():
-                    self.nodelist[0].s = ''
-                if isinstance(self.nodelist[-1], TextNode) and \
-                   not self.nodelist[-1].s.strip():
-                    self.nodelist[-1].s = ''
-            value = self.nodelist.render(context)
-            value = render_markdown(value)
-            fragment_cache.set(cache_key, value, expire_time)
-        return mark_safe(value)
+        context.autoescape = False
+        # Remove unnecessary line breaks and whitespaces. Example:
+        # {% markdown %}\n <- LB for readability in tpl{% endmarkdown %}
+        if self.nodelist:
+            if isinstance(self.nodelist[0], TextNode) and \
+               not self.nodelist[0].s.strip():
+                self.nodelist[0].s = ''
+            if isinstance(self.nodelist[-1], TextNode) and \
+               not self.nodelist[-1].s.strip():
+                self.nodelist[-1].s = ''
+        value = self.nodelist.render(context)
+        # Rendered markdown is cached by the content
+        return mark_safe(render_markdown(value))
 
 
 # Note: Inspired by django.templatetags.cache
 @register.tag('markdown')
 def do_markdown(parser, token):
     """
-    This will markdownify the contents of a template fragment, sanitize and
-    cache for a given amount of time.
+    This will markdownify the contents of a template fragment and sanitize it.
+    Rendered markdown is cached by the content, `expire_time`, `fragment_name`
+    and vary on arguments are left for compatibility with existing templates.
 
     Usage::
 
@@ -142,8 +131,6 @@ def do_markdown(parser, token):
         {% markdown [expire_time] [fragment_name] [var1] [var2] .. %}
             .. some expensive processing ..
         {% endmarkdown %}
-
-    Each unique set of arguments will result in a unique cache entry.
     """
     nodelist = parser.parse(('endmarkdown',))
     parser.delete_first_token()
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from django.core import management
@@ -35,3 +37,9 @@ def test_update_site_configuration(settings):
     assert model_configuration.email_use_ssl == use_tls_ssl
     assert model_configuration.email_host_user == email_host_user
     assert model_configuration.default_from_email == default_email_from
+
+
+def test_compile_jinja2_templates():
+    out = io.StringIO()
+    management.call_command("compile_jinja2_templates", stdout=out)
+    assert "failed: 0" in out.getvalue()
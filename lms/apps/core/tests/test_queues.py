@@ -0,0 +1,92 @@
+import pytest
+from rq.job import JobStatus
+
+from core.queues import enqueue_unique, get_unique_job_id, run_unique_job
+
+
+def _job(*args, **kwargs):
+    return args, kwargs
+
+
+def _other_job(*args, **kwargs):
+    pass
+
+
+class RedisConnectionStub:
+    """Subset of redis commands used by `enqueue_unique`"""
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+@pytest.fixture
+def queue(mocker):
+    queue = mocker.Mock(is_async=True, connection=RedisConnectionStub())
+    queue.name = 'default'
+    queue.enqueue.side_effect = lambda func, args, kwargs, job_id, **options: mocker.Mock(
+        id=job_id, func=func, args=args, kwargs=kwargs, connection=queue.connection)
+    mocker.patch('core.queues.get_queue', return_value=queue)
+    return queue
+
+
+def test_get_unique_job_id():
+    job_id = get_unique_job_id(_job, (1,), {'a': 1, 'b': 2})
+    assert job_id == get_unique_job_id(_job, (1,), {'b': 2, 'a': 1})
+    assert job_id.startswith("unique:core.tests.test_queues._job:")
+    assert job_id != get_unique_job_id(_job, (2,), {'a': 1, 'b': 2})
+    assert job_id != get_unique_job_id(_other_job, (1,), {'a': 1, 'b': 2})
+
+
+def test_enqueue_unique_dedup_hit(queue, mocker):
+    mocker.patch('core.queues._get_job_status', return_value=JobStatus.QUEUED)
+    job = enqueue_unique(_job, 1)
+    assert job is not None
+    assert enqueue_unique(_job, 1) is None
+    assert queue.enqueue.call_count == 1
+    # Other arguments
+    assert enqueue_unique(_job, 2) is not None
+    assert queue.enqueue.call_count == 2
+    assert queue.connection.get('core.queues.default.dedup_hits') == 1
+    assert queue.connection.get('core.queues.default.enqueued') == 2
+
+
+def test_enqueue_unique_after_job_started(queue, mocker):
+    mocker.patch('core.queues._get_job_status', return_value=JobStatus.QUEUED)
+    job = enqueue_unique(_job, 1, a=2)
+    mocker.patch('core.queues.get_current_job', return_value=job)
+    # Job releases the marker on start
+    assert run_unique_job(*job.args, **job.kwargs) == ((1,), {'a': 2})
+    next_job = enqueue_unique(_job, 1, a=2)
+    assert next_job is not None
+    assert next_job.id != job.id
+
+
+def test_enqueue_unique_stale_marker(queue, mocker):
+    job_status = mocker.patch('core.queues._get_job_status',
+                              return_value=JobStatus.QUEUED)
+    job = enqueue_unique(_job, 1)
+    # Finished without releasing the marker
+    job_status.return_value = JobStatus.FINISHED
+    next_job = enqueue_unique(_job, 1)
+    assert next_job is not None
+    assert next_job.id != job.id
+    unique_id = get_unique_job_id(_job, (1,), {})
+    assert queue.connection.get(unique_id) == next_job.id.encode()
+    # Job is being enqueued by another caller
+    job_status.return_value = None
+    assert enqueue_unique(_job, 1) is None
@@ -1,4 +1,8 @@
-from core.utils import get_youtube_video_id, instance_memoize
+from django.core.cache import caches
+
+from core.utils import (
+    get_markdown_cache_key, get_youtube_video_id, instance_memoize, render_markdown
+)
 
 
 def test_get_youtube_video_id():
@@ -37,3 +41,16 @@ def test_instance_memoize():
     del a.__dict__["_instance_memoize_cache"]
     assert a.foo(1) == 44
     assert A.foo(a, 1) == 45
+
+
+def test_render_markdown_cache():
+    assert get_markdown_cache_key("*text*") == get_markdown_cache_key("*text*")
+    assert get_markdown_cache_key("*text*") != get_markdown_cache_key("**text**")
+    assert render_markdown("*text*") == "<p><em>text</em></p>\n"
+    assert caches['default'].get(get_markdown_cache_key("*text*")) == "<p><em>text</em></p>\n"
+    # Rendered value is taken from the cache
+    caches['default'].set(get_markdown_cache_key("*text*"), "<p>cached</p>")
+    assert render_markdown("*text*") == "<p>cached</p>"
+    caches['default'].delete(get_markdown_cache_key("*text*"))
+    # Sanitized html is cached
+    assert "<script>" not in render_markdown("<script>alert(1)</script>")
@@ -1,5 +1,6 @@
 import datetime
 import enum
+import hashlib
 import logging
 import random
 from functools import partial
@@ -17,7 +18,6 @@ from django.db.models import Max, Min
 from django.template import loader
 from django.utils import formats
 from django.utils.html import linebreaks, strip_tags
-from django_jinja.builtins.extensions import make_template_fragment_key
 from sqids import Sqids
 
 import core.math
@@ -89,24 +89,54 @@ MARKDOWN_ALLOWED_ATTRS = {
 }
 
 
-def render_markdown(text):
-    """Renders markdown, then sanitizes html based on allowed tags"""
+# Increment after changing markdown plugins or sanitizer settings
+# to invalidate rendered values in the shared cache
+MARKDOWN_RENDERER_VERSION = 1
+MARKDOWN_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _render_markdown(text: str) -> str:
     md_rendered = markdown(text)
     return bleach.clean(md_rendered, tags=MARKDOWN_ALLOWED_TAGS,
                         attributes=MARKDOWN_ALLOWED_ATTRS)
 
 
-def render_markdown_and_cache(value, fragment_name, expires_in=0, *vary_on):
+def render_markdown_many(texts: Iterable[str]) -> List[str]:
+    """
+    Renders texts bypassing the cache. Suitable for a worker process
+    since it doesn't touch cache connections.
+    """
+    return [_render_markdown(text) for text in texts]
+
+
+def get_markdown_cache_key(text: str) -> str:
+    """
+    Rendered value depends on the source text and the renderer only, so
+    the key doesn't need invalidation when the text is changed.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{MARKDOWN_RENDERER_VERSION}:".encode())
+    digest.update(",".join(sorted(MARKDOWN_ALLOWED_TAGS)).encode())
+    digest.update(repr(sorted(MARKDOWN_ALLOWED_ATTRS.items())).encode())
+    digest.update(str(text).encode())
+    return f"markdown.{digest.hexdigest()}"
+
+
+def render_markdown(text: str) -> str:
+    """
+    Renders markdown, then sanitizes html based on allowed tags.
+
+    Rendered values are cached in the `markdown_fragments` (or default) cache.
+    """
     try:
         fragment_cache = caches['markdown_fragments']
     except InvalidCacheBackendError:
         fragment_cache = caches['default']
-    cache_key = make_template_fragment_key(fragment_name, vary_on)
+    cache_key = get_markdown_cache_key(text)
     rendered = fragment_cache.get(cache_key)
     if rendered is None:
-        rendered = render_markdown(value)
-        fragment_cache.set(cache_key, rendered, expires_in)
-    # TODO: think about escaping
+        rendered = _render_markdown(text)
+        fragment_cache.set(cache_key, rendered, MARKDOWN_CACHE_TIMEOUT)
     return rendered
 
 
@@ -1,6 +1,5 @@
 from rest_framework import serializers
 
-from core.utils import render_markdown_and_cache
 from courses.models import Assignment, Course, CourseTeacher, Semester
 
 
@@ -54,5 +53,4 @@ class BaseAssignmentSerializer(serializers.ModelSerializer):
                   'maximum_score', 'weight', 'solution_format')
 
     def get_text(self, obj: Assignment):
-        return render_markdown_and_cache(obj.text, "assignment_text", 3600,
-                                         obj.pk, obj.modified)
+        return obj.get_html('text')
@@ -65,7 +65,9 @@ class CourseClassQuerySet(query.QuerySet):
                                 'course__meta_course',
                                 'course__semester')
                 .defer('course__description',
+                       'course__description_html',
                        'course__meta_course__description',
+                       'course__meta_course__description_html',
                        'course__meta_course__short_description'))
 
     def in_programs(self, programs):
@@ -9,7 +9,7 @@ from django.contrib.staticfiles.storage import staticfiles_storage
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Value, When
 from django.utils import timezone
 from django.utils.encoding import smart_str
 from django.utils.functional import cached_property
@@ -20,7 +20,7 @@ from model_utils.models import TimeStampedModel
 from sorl.thumbnail import ImageField
 
 from core.db.fields import TimeZoneField
-from core.db.mixins import DerivableFieldsMixin
+from core.db.mixins import DerivableFieldsMixin, RenderedMarkdownMixin
 from core.models import LATEX_MARKDOWN_HTML_ENABLED, Location, AcademicProgram
 from core.timezone import TimezoneAwareMixin, now_local, UTC
 from core.timezone.fields import TimezoneAwareDateTimeField
@@ -170,10 +170,12 @@ def meta_course_cover_upload_to(instance: "MetaCourse", filename) -> str:
     return os.path.join("meta_courses", course_slug, f"cover{ext}")
 
 
-class MetaCourse(TimeStampedModel):
+class MetaCourse(RenderedMarkdownMixin, TimeStampedModel):
     """
     General data shared between all courses of the same type.
     """
+    markdown_fields = ['description']
+
     name = models.CharField(_("Course|name"), max_length=140)
     slug = models.SlugField(
         _("News|slug"),
@@ -185,6 +187,8 @@ class MetaCourse(TimeStampedModel):
     description = models.TextField(
         _("Course|description"),
         help_text=LATEX_MARKDOWN_HTML_ENABLED)
+    description_html = models.TextField(blank=True, default='', editable=False)
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
     short_description = models.TextField(
         _("Course|short_description"),
         blank=True)
@@ -237,8 +241,10 @@ def get_course_default_timezone():
     return UTC
 
 
-class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
+class Course(RenderedMarkdownMixin, TimezoneAwareMixin, TimeStampedModel,
+             DerivableFieldsMixin):
     TIMEZONE_AWARE_FIELD_NAME = 'time_zone'
+    markdown_fields = ['description']
 
     meta_course = models.ForeignKey(
         MetaCourse,
@@ -268,6 +274,8 @@ class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
         _("Description"),
         help_text=_("LaTeX+Markdown+HTML is enabled"),
         blank=True)
+    description_html = models.TextField(blank=True, default='', editable=False)
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
     internal_description = models.TextField(
         _("Internal Information"),
         help_text=_("Visible to course listeners only. "
@@ -369,6 +377,13 @@ class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
         """
         return False
 
+    @classmethod
+    def _aggregate_learners_count(cls):
+        from learning.services.enrollment_service import (
+            get_learners_count_subquery
+        )
+        return get_learners_count_subquery(outer_ref=OuterRef('pk'))
+
     def save(self, *args, **kwargs):
         # Make sure `self.completed_at` always has value
         if self.semester_id and not self.completed_at:
@@ -647,8 +662,9 @@ class CourseReview(TimeStampedModel):
         return f"{self.course} [{self.pk}]"
 
 
-class CourseNews(TimezoneAwareMixin, TimeStampedModel):
+class CourseNews(RenderedMarkdownMixin, TimezoneAwareMixin, TimeStampedModel):
     TIMEZONE_AWARE_FIELD_NAME = 'course'
+    markdown_fields = ['text']
 
     course = models.ForeignKey(
         Course,
@@ -662,6 +678,8 @@ class CourseNews(TimezoneAwareMixin, TimeStampedModel):
     text = models.TextField(
         _("CourseNews|text"),
         help_text=LATEX_MARKDOWN_HTML_ENABLED)
+    text_html = models.TextField(blank=True, default='', editable=False)
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-created"]
@@ -950,8 +968,9 @@ class CourseClassAttachment(TimeStampedModel):
         return os.path.basename(self.material.name)
 
 
-class Assignment(TimezoneAwareMixin, TimeStampedModel):
+class Assignment(RenderedMarkdownMixin, TimezoneAwareMixin, TimeStampedModel):
     TIMEZONE_AWARE_FIELD_NAME = 'time_zone'
+    markdown_fields = ['text']
 
     course = models.ForeignKey(
         Course,
@@ -970,6 +989,8 @@ class Assignment(TimezoneAwareMixin, TimeStampedModel):
                              max_length=140)
     text = models.TextField(_("Assignment|text"),
                             help_text=LATEX_MARKDOWN_HTML_ENABLED)
+    text_html = models.TextField(blank=True, default='', editable=False)
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
     maximum_score = models.PositiveSmallIntegerField(
         _("Maximum score"),
         default=5,
@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 
 from django.forms import model_to_dict
 
+from core.utils import MARKDOWN_RENDERER_VERSION
 from courses.models import CourseNews, CourseTeacher
 from courses.tests.factories import (
     CourseFactory, CourseNewsFactory, CourseTeacherFactory
@@ -142,3 +143,21 @@ def test_view_course_add_news_btn_visibility(client):
 
     assert has_create_news_btn(teacher)
     assert not has_create_news_btn(spectator)
+
+
+@pytest.mark.django_db
+def test_course_news_text_html():
+    news = CourseNewsFactory(text="*news*")
+    assert news.text_html == "<p><em>news</em></p>\n"
+    assert news.markdown_version == MARKDOWN_RENDERER_VERSION
+    news.text = "**news**"
+    news.save(update_fields=['text'])
+    news.refresh_from_db()
+    assert news.text_html == "<p><strong>news</strong></p>\n"
+    # Rendered with an outdated renderer
+    CourseNews.objects.filter(pk=news.pk).update(text_html='', markdown_version=0)
+    news.refresh_from_db()
+    assert news.get_html('text') == "<p><strong>news</strong></p>\n"
+    news.refresh_from_db()
+    assert news.text_html == "<p><strong>news</strong></p>\n"
+    assert news.markdown_version == MARKDOWN_RENDERER_VERSION
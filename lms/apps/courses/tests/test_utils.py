@@ -5,9 +5,9 @@ import pytest
 
 from courses.constants import MONDAY_WEEKDAY, SUNDAY_WEEKDAY, SemesterTypes
 from courses.utils import (
-    MonthPeriod, TermIndexError, TermPair, extended_month_date_range,
-    get_current_term_pair, get_end_of_week, get_start_of_week, get_term_by_index,
-    get_term_index
+    MonthPeriod, TermIndexError, TermPair, date_to_term_pair,
+    extended_month_date_range, get_current_term_pair, get_end_of_week,
+    get_start_of_week, get_term_by_index, get_term_index, get_term_starts_at
 )
 
 
@@ -56,6 +56,24 @@ def test_term_tuple_academic_year():
     assert TermPair(2013, SemesterTypes.SUMMER).academic_year == 2012
 
 
+def test_date_to_term_pair():
+    tz = ZoneInfo('Europe/Moscow')
+    spring_starts_at = get_term_starts_at(2020, SemesterTypes.SPRING, tz)
+    assert spring_starts_at == datetime.datetime(2020, 2, 2, tzinfo=tz)
+    assert get_term_starts_at(2020, SemesterTypes.SPRING, tz) is spring_starts_at
+    with pytest.raises(ValueError):
+        get_term_starts_at(2020, 'sprEng', tz)
+    before_spring = spring_starts_at - datetime.timedelta(seconds=1)
+    assert date_to_term_pair(before_spring) == TermPair(2019, SemesterTypes.AUTUMN)
+    assert date_to_term_pair(spring_starts_at) == TermPair(2020, SemesterTypes.SPRING)
+    summer_starts_at = get_term_starts_at(2020, SemesterTypes.SUMMER, tz)
+    assert date_to_term_pair(summer_starts_at) == TermPair(2020, SemesterTypes.SUMMER)
+    autumn_starts_at = get_term_starts_at(2020, SemesterTypes.AUTUMN, tz)
+    assert date_to_term_pair(autumn_starts_at) == TermPair(2020, SemesterTypes.AUTUMN)
+    dt = datetime.datetime(2020, 12, 31, 23, 59, tzinfo=tz)
+    assert date_to_term_pair(dt) == TermPair(2020, SemesterTypes.AUTUMN)
+
+
 @pytest.mark.django_db
 def test_get_current_semester_pair(settings, mocker):
     settings.TIME_ZONE = 'Etc/UTC'
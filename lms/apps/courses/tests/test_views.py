@@ -29,6 +29,7 @@ from learning.settings import StudentStatuses
 from learning.tests.factories import CourseInvitationBindingFactory, EnrollmentFactory
 from users.constants import Roles
 from users.services import update_student_status
+from users.thumbnails import BaseStubImage
 from users.tests.factories import (
     CuratorFactory, StudentFactory, StudentProfileFactory, TeacherFactory, UserFactory
 )
@@ -298,6 +299,12 @@ def test_view_course_student_faces(client):
     assert response.status_code == 200
     assert enrollment1.student.get_full_name().encode() in response.content
     assert enrollment2.student.get_full_name().encode() in response.content
+    # Users without a photo get a stub
+    thumbnails = response.context_data['thumbnails']
+    assert set(thumbnails) == {enrollment1.student_id, enrollment2.student_id}
+    stub = thumbnails[enrollment1.student_id]
+    assert isinstance(stub, BaseStubImage)
+    assert stub.url.encode() in response.content
 
 
 @pytest.mark.django_db
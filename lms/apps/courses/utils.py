@@ -1,7 +1,8 @@
 import datetime
 from calendar import monthrange
 from dataclasses import dataclass, field
-from typing import Iterator, Optional
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
 
 import attr
 from dateutil import parser as dparser
@@ -89,10 +90,7 @@ def date_to_term_pair(dt: datetime.datetime) -> TermPair:
     assert timezone.is_aware(dt)
     year = dt.year
     # Term start should be aware of the same timezone as `date`
-    _convert = convert_term_parts_to_datetime
-    spring_term_start = _convert(year, SPRING_TERM_START, dt.tzinfo)
-    autumn_term_start = _convert(year, AUTUMN_TERM_START, dt.tzinfo)
-    summer_term_start = _convert(year, SUMMER_TERM_START, dt.tzinfo)
+    spring_term_start, summer_term_start, autumn_term_start = _get_term_starts(year, dt.tzinfo)
 
     if spring_term_start <= dt < summer_term_start:
         current_term = SemesterTypes.SPRING
@@ -111,23 +109,43 @@ def get_current_term_pair(tz: datetime.tzinfo = settings.DEFAULT_TIMEZONE) -> Te
     return date_to_term_pair(dt_local)
 
 
+@lru_cache(maxsize=None)
+def _parse_term_start(term_start: str) -> datetime.datetime:
+    return dparser.parse(term_start)
+
+
 def convert_term_parts_to_datetime(year, term_start,
                                    tz: Optional[datetime.tzinfo] = UTC) -> datetime.datetime:
-    dt_naive = dparser.parse(term_start).replace(year=year)
+    dt_naive = _parse_term_start(term_start).replace(year=year)
     return dt_naive.replace(tzinfo=tz)
 
 
+@lru_cache(maxsize=1024)
+def _get_term_starts(year: int, tz: Optional[datetime.tzinfo]) -> Tuple[datetime.datetime, ...]:
+    """
+    Returns start points of the spring, summer and autumn terms of
+    the calendar year. Results are cached since term boundaries are
+    computed for almost every request.
+    """
+    return (
+        convert_term_parts_to_datetime(year, SPRING_TERM_START, tz),
+        convert_term_parts_to_datetime(year, SUMMER_TERM_START, tz),
+        convert_term_parts_to_datetime(year, AUTUMN_TERM_START, tz),
+    )
+
+
+_TERM_STARTS_ORDER = {
+    SemesterTypes.SPRING: 0,
+    SemesterTypes.SUMMER: 1,
+    SemesterTypes.AUTUMN: 2,
+}
+
+
 def get_term_starts_at(year, term_type, tz: datetime.tzinfo) -> datetime.datetime:
     """Returns term start point in datetime format."""
-    if term_type == SemesterTypes.SPRING:
-        term_start_str = SPRING_TERM_START
-    elif term_type == SemesterTypes.SUMMER:
-        term_start_str = SUMMER_TERM_START
-    elif term_type == SemesterTypes.AUTUMN:
-        term_start_str = AUTUMN_TERM_START
-    else:
+    if term_type not in _TERM_STARTS_ORDER:
         raise ValueError("get_term_start: unknown term type")
-    return convert_term_parts_to_datetime(year, term_start_str, tz)
+    return _get_term_starts(year, tz)[_TERM_STARTS_ORDER[term_type]]
 
 
 _FIRST_TERM_YEAR = 1980
@@ -12,7 +12,9 @@ from courses.views.mixins import CourseURLParamsMixin
 from learning.models import Enrollment
 from learning.permissions import ViewStudentGroup
 from learning.settings import StudentStatuses
+from users.constants import ThumbnailSizes
 from users.models import User
+from users.thumbnails import get_users_thumbnails
 
 
 class CourseStudentFacesViewMixin(PermissionRequiredMixin, CourseURLParamsMixin):
@@ -45,6 +47,7 @@ class CourseStudentFacesView(CourseStudentFacesViewMixin, TemplateView):
         context.update({
             'course': self.course,
             'users': self.users,
+            'thumbnails': get_users_thumbnails(self.users, ThumbnailSizes.SQUARE),
             'StudentStatuses': StudentStatuses,
         })
         return context
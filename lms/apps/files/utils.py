@@ -1,6 +1,11 @@
+import multiprocessing
 import os
-from typing import Optional
+import resource
+import time
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
 
+import nbformat
 import requests
 from nbconvert import HTMLExporter
 
@@ -10,15 +15,166 @@ from django.db.models.fields.files import FieldFile
 
 from files.tasks import logger
 
+# Timeouts for connecting to the storage and reading the next chunk
+IPYNB_DOWNLOAD_TIMEOUT = (5, 30)
+
 
 class ConvertError(Exception):
     pass
 
 
+class ConvertedNotebook(NamedTuple):
+    content: ContentFile
+    metrics: Dict[str, Any]
+
+
+class ConversionLimits(NamedTuple):
+    max_size: int
+    output_max_size: int
+    timeout: int
+    memory_limit: int
+
+
+def get_conversion_limits() -> ConversionLimits:
+    """Limits could be overridden in project settings"""
+    return ConversionLimits(
+        max_size=getattr(settings, "IPYNB_CONVERSION_MAX_SIZE", 50 * 1024 * 1024),
+        output_max_size=getattr(settings, "IPYNB_CONVERSION_OUTPUT_MAX_SIZE", 1024 * 1024),
+        timeout=getattr(settings, "IPYNB_CONVERSION_TIMEOUT", 60),
+        memory_limit=getattr(settings, "IPYNB_CONVERSION_MEMORY_LIMIT", 1024 * 1024 * 1024))
+
+
+def strip_large_outputs(notebook: nbformat.NotebookNode,
+                        max_size: int) -> int:
+    """
+    Replaces cell outputs (e.g. embedded images) larger than `max_size`
+    characters with a text placeholder. Returns the number of replaced outputs.
+    """
+    stripped = 0
+    for cell in notebook.cells:
+        for output in cell.get('outputs', []):
+            data = output.get('data')
+            if not data:
+                continue
+            size = sum(len(value) if isinstance(value, str) else len(str(value))
+                       for value in data.values())
+            if size > max_size:
+                output['data'] = {'text/plain': f"[Output of {size} bytes is omitted]"}
+                output.pop('metadata', None)
+                stripped += 1
+    return stripped
+
+
+@lru_cache(maxsize=None)
+def get_html_exporter() -> HTMLExporter:
+    """
+    Returns exporter with loaded templates. It's created in the parent
+    process, so forked conversion processes don't configure it again.
+    """
+    exporter = HTMLExporter()
+    # Template is loaded lazily on the first access
+    exporter.template
+    return exporter
+
+
+def _export_notebook(source: bytes, output_max_size: int) -> Dict[str, Any]:
+    started_at = time.monotonic()
+    notebook = nbformat.reads(source.decode('utf-8'), as_version=4)
+    stripped_outputs = strip_large_outputs(notebook, output_max_size)
+    html, _ = get_html_exporter().from_notebook_node(notebook)
+    return {
+        "html": html,
+        "stripped_outputs": stripped_outputs,
+        "convert_time": round(time.monotonic() - started_at, 3),
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _conversion_worker(connection, source: bytes,
+                       limits: ConversionLimits) -> None:
+    """Runs in a child process, sends back the result or the error"""
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_limit,
+                                                limits.memory_limit))
+        result = _export_notebook(source, limits.output_max_size)
+    except BaseException as e:
+        # Exception instance could be unpicklable
+        connection.send((False, f"{type(e).__name__}: {e}"))
+    else:
+        connection.send((True, result))
+    finally:
+        connection.close()
+
+
+def _run_conversion(source: bytes, limits: ConversionLimits) -> Dict[str, Any]:
+    """
+    Converts notebook in a child process with limited memory. The process
+    is killed if it takes more than `limits.timeout` seconds and is always
+    joined before return.
+    """
+    # Child process inherits configured exporter
+    get_html_exporter()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_conversion_worker,
+                                      args=(sender, source, limits),
+                                      daemon=True)
+    process.start()
+    sender.close()
+    try:
+        # Receive before join, large result doesn't fit the pipe buffer
+        if not receiver.poll(limits.timeout):
+            raise ConvertError(f"Conversion takes more than {limits.timeout}s")
+        succeeded, result = receiver.recv()
+    except EOFError as e:
+        raise ConvertError("Conversion process exited unexpectedly") from e
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+    if not succeeded:
+        raise ConvertError(result)
+    return result
+
+
+def _read_notebook(file_field: FieldFile, max_size: int) -> bytes:
+    if settings.USE_CLOUD_STORAGE:
+        signed_url = file_field.url
+        try:
+            with requests.get(signed_url, allow_redirects=True, stream=True,
+                              timeout=IPYNB_DOWNLOAD_TIMEOUT) as r:
+                r.raise_for_status()
+                content_length = int(r.headers.get('Content-Length') or 0)
+                if content_length > max_size:
+                    raise ConvertError(f"File size {content_length} exceeds {max_size}")
+                chunks, received = [], 0
+                for chunk in r.iter_content(chunk_size=64 * 1024):
+                    received += len(chunk)
+                    if received > max_size:
+                        raise ConvertError(f"File size exceeds {max_size}")
+                    chunks.append(chunk)
+                return b"".join(chunks)
+        except requests.RequestException as e:
+            logger.debug(f"Failed to download {file_field.name} from s3")
+            raise ConvertError from e
+    try:
+        if file_field.size > max_size:
+            raise ConvertError(f"File size {file_field.size} exceeds {max_size}")
+        with file_field.open('rb') as f:
+            return f.read()
+    except (FileNotFoundError, AttributeError) as e:
+        raise ConvertError from e
+
+
 def convert_ipynb_to_html(file_field: FieldFile,
-                          name=None) -> Optional[ContentFile]:
+                          name=None) -> Optional[ConvertedNotebook]:
     """
-    Returns in-memory html version of the .ipynb file stored in S3 or locally.
+    Returns in-memory html version of the .ipynb file stored in S3 or locally
+    along with conversion metrics.
+
+    Conversion runs in a separate process with limited memory and wall-clock
+    time, large outputs are replaced with placeholders. Raises `ConvertError`
+    if the notebook exceeds any of the limits or is not valid.
     """
     if not file_field:
         logger.debug(f"File field or data not found")
@@ -27,20 +183,22 @@ def convert_ipynb_to_html(file_field: FieldFile,
     if ext != '.ipynb':
         logger.debug(f"File extension is not .ipynb")
         return
-    html_exporter = HTMLExporter()
-    if settings.USE_CLOUD_STORAGE:
-        signed_url = file_field.url
-        try:
-            with requests.get(signed_url, allow_redirects=True, stream=True) as r:
-                nb_node, _ = html_exporter.from_file(r.raw)
-        except (FileNotFoundError, AttributeError) as e:
-            logger.debug(f"nbconvert failed to import {file_field.path} from s3")
-            raise ConvertError from e
-    else:
-        try:
-            nb_node, _ = html_exporter.from_filename(file_field.path)
-        except (FileNotFoundError, AttributeError) as e:
-            raise ConvertError from e
+    limits = get_conversion_limits()
+    started_at = time.monotonic()
+    source = _read_notebook(file_field, limits.max_size)
+    download_time = time.monotonic() - started_at
+    try:
+        exported = _run_conversion(source, limits)
+    except ConvertError:
+        raise
+    except Exception as e:
+        raise ConvertError(str(e)) from e
+    html = exported.pop("html").encode()
+    metrics = {
+        "source_size": len(source),
+        "html_size": len(html),
+        "download_time": round(download_time, 3),
+        **exported,
+    }
     name = name or file_field.name + '.html'
-    return ContentFile(nb_node.encode(), name=name)
-    # file_field.storage.save(new_path, ContentFile(nb_node.encode()))
+    return ConvertedNotebook(content=ContentFile(html, name=name), metrics=metrics)
@@ -1,17 +1,15 @@
 import os
 from abc import ABC, abstractmethod
-
-from nbformat.validator import NotebookValidationError
+from typing import Optional
 
 from django.conf import settings
-from django.http import (
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponseRedirect
-)
+from django.db.models.fields.files import FieldFile
+from django.http import HttpResponse, HttpResponseNotFound, HttpResponseRedirect
+from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
 from auth.mixins import PermissionRequiredMixin
 from files.response import XAccelRedirectFileResponse
-from files.utils import convert_ipynb_to_html
 
 
 class ProtectedFileDownloadView(ABC, PermissionRequiredMixin, generic.View):
@@ -22,7 +20,13 @@ class ProtectedFileDownloadView(ABC, PermissionRequiredMixin, generic.View):
     Supports S3 for the remotely stored files and file system storage for
     the locally stored. Local files are distributed by nginx `X-Accel-Redirect`
     feature.
+
+    Pass `?html=1` to get the html version of the *.ipynb file. Notebooks
+    are converted in the background, see `get_html_file`.
     """
+    # Seconds to wait before asking for the html version again
+    html_conversion_retry_after = 10
+
     @property
     @abstractmethod
     def file_field_name(self):
@@ -44,6 +48,17 @@ class ProtectedFileDownloadView(ABC, PermissionRequiredMixin, generic.View):
     def get_file_field(self):
         return getattr(self.protected_object, self.file_field_name, None)
 
+    def get_html_file(self, file_field: FieldFile) -> Optional[FieldFile]:
+        """Returns the pre-converted html version of the *.ipynb file"""
+        return None
+
+    def schedule_html_conversion(self, file_field: FieldFile) -> bool:
+        """
+        Enqueues conversion of the *.ipynb file to html. Returns False if
+        conversion is not supported for the protected object.
+        """
+        return False
+
     def get(self, request, *args, **kwargs):
         if self.protected_object is None:
             return HttpResponseNotFound()
@@ -52,7 +67,26 @@ class ProtectedFileDownloadView(ABC, PermissionRequiredMixin, generic.View):
         if file_field is None:
             return HttpResponseNotFound()
 
-        # FIXME: preprocess ipynb files and save locally or in S3!
+        _, ext = os.path.splitext(file_field.name)
+        if request.GET.get("html", False) and ext == ".ipynb":
+            html_file = self.get_html_file(file_field)
+            if html_file:
+                return self.serve_file(html_file, content_disposition='inline')
+            if self.schedule_html_conversion(file_field):
+                return self.get_conversion_in_progress_response()
+        return self.serve_file(file_field, content_disposition='attachment')
+
+    def get_conversion_in_progress_response(self) -> HttpResponse:
+        message = _("The notebook is being converted to HTML. "
+                    "Refresh the page in a few seconds.")
+        response = HttpResponse(message, status=202,
+                                content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = self.html_conversion_retry_after
+        response['Refresh'] = self.html_conversion_retry_after
+        return response
+
+    @staticmethod
+    def serve_file(file_field: FieldFile, content_disposition: str) -> HttpResponse:
         if settings.USE_CLOUD_STORAGE:
             signed_url = file_field.url
             if getattr(settings, "PROXYING_REMOTE_FILES", False):
@@ -60,30 +94,8 @@ class ProtectedFileDownloadView(ABC, PermissionRequiredMixin, generic.View):
                 protocol = urlparse(signed_url).scheme
                 url = signed_url.replace(protocol + '://', '')
                 remote_file_location = f'/remote-files/{protocol}/{url}'
-                content_disposition = 'attachment'
                 return XAccelRedirectFileResponse(remote_file_location,
                                                   content_disposition)
             else:
                 return HttpResponseRedirect(redirect_to=signed_url)
-        else:
-            return self.get_local_private_file(file_field)
-
-    def get_local_private_file(self, file_field):
-        media_file_uri = file_field.url
-        content_disposition = 'attachment'
-        # Convert *.ipynb to html
-        if self.request.GET.get("html", False):
-            _, ext = os.path.splitext(media_file_uri)
-            if ext == ".ipynb":
-                ipynb_src_path = file_field.path
-                html_ext = ".html"
-                html_dest_path = ipynb_src_path + html_ext
-                try:
-                    exported = convert_ipynb_to_html(ipynb_src_path,
-                                                     html_dest_path)
-                except NotebookValidationError as e:
-                    return HttpResponseBadRequest(e.message)
-                if exported:
-                    media_file_uri = media_file_uri + html_ext
-                    content_disposition = 'inline'
-        return XAccelRedirectFileResponse(media_file_uri, content_disposition)
+        return XAccelRedirectFileResponse(file_field.url, content_disposition)
@@ -15,8 +15,10 @@ from learning.api.serializers import (
 )
 from learning.models import StudentAssignment
 from learning.services.personal_assignment_service import (
-    create_assignment_solution, update_personal_assignment_stats
+    create_assignment_solution, update_personal_assignment_score,
+    update_personal_assignment_stats
 )
+from learning.settings import AssignmentScoreUpdateSource
 from learning.tests.factories import EnrollmentFactory, StudentAssignmentFactory
 from learning.tests.jba.test_jba_submission_service import TEST_JBA_ACCOUNT, KOTLIN_KOANS_ID, mock_jba_service, HELLO_WORLD_TASK_ID
 from users.tests.factories import TeacherFactory
@@ -216,6 +218,108 @@ def test_api_view_personal_assignment_list(client):
     assert response.json()[0]['id'] == student_assignment2.pk
 
 
+@pytest.mark.django_db
+def test_api_view_personal_assignment_list_pagination(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    url = reverse('learning-api:v1:personal_assignments', kwargs={
+        'course_id': course.pk
+    })
+    client.login(teacher)
+    assignment = AssignmentFactory(course=course)
+    personal_assignments = StudentAssignmentFactory.create_batch(3, assignment=assignment)
+    # Emulate the same modification time
+    StudentAssignment.objects.filter(assignment=assignment).update(modified=assignment.created)
+    response = client.get(url, {'page_size': 2, 'fields': 'id,status'})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item['id'] for item in data['results']] == [pa.pk for pa in personal_assignments[:2]]
+    assert set(data['results'][0]) == {'id', 'status'}
+    assert data['next'] is not None
+    response = client.get(url, {'page_size': 2, 'cursor': data['next']})
+    data = response.json()
+    assert [item['id'] for item in data['results']] == [personal_assignments[2].pk]
+    assert data['next'] is None
+    # Poll for updated records only
+    updated_since = assignment.created + datetime.timedelta(minutes=1)
+    StudentAssignment.objects.filter(pk=personal_assignments[1].pk).update(modified=updated_since)
+    response = client.get(url, {'updated_since': updated_since.isoformat()})
+    assert [item['id'] for item in response.json()] == [personal_assignments[1].pk]
+    # Unknown fields
+    response = client.get(url, {'fields': 'id,unknown'})
+    assert response.status_code == 400
+    response = client.get(url, {'cursor': 'invalid'})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_api_view_personal_assignment_list_updated_since(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    url = reverse('learning-api:v1:personal_assignments', kwargs={
+        'course_id': course.pk
+    })
+    client.login(teacher)
+    assignment = AssignmentFactory(course=course, maximum_score=10)
+    pa1, pa2, pa3 = StudentAssignmentFactory.create_batch(3, assignment=assignment)
+    last_poll = assignment.created + datetime.timedelta(minutes=1)
+    StudentAssignment.objects.filter(assignment=assignment).update(modified=assignment.created)
+    response = client.get(url, {'updated_since': last_poll.isoformat()})
+    assert response.json() == []
+    # New grade
+    updated, _ = update_personal_assignment_score(
+        student_assignment=pa1, changed_by=teacher,
+        source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT,
+        score_old=None, score_new=Decimal('5'))
+    assert updated
+    response = client.get(url, {'updated_since': last_poll.isoformat()})
+    assert [item['id'] for item in response.json()] == [pa1.pk]
+    # Stats are updated on a new solution
+    create_assignment_solution(personal_assignment=pa2,
+                               created_by=pa2.student,
+                               message="solution")
+    response = client.get(url, {'updated_since': last_poll.isoformat()})
+    assert {item['id'] for item in response.json()} == {pa1.pk, pa2.pk}
+
+
+@pytest.mark.django_db
+def test_api_view_personal_assignment_review_queue(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    url = reverse('learning-api:v1:personal_assignments_review_queue', kwargs={
+        'course_id': course.pk
+    })
+    client.login(teacher)
+    assignment = AssignmentFactory(course=course)
+    pa1, pa2, pa3 = StudentAssignmentFactory.create_batch(3, assignment=assignment)
+    # Personal assignment of another course
+    StudentAssignmentFactory()
+    StudentAssignment.objects.filter(pk=pa1.pk).update(meta={'stats': {
+        'activity': 'ns',
+        'solutions': {'count': 1, 'first': '2024-01-03T10:00:00Z'}
+    }})
+    StudentAssignment.objects.filter(pk=pa2.pk).update(meta={'stats': {
+        'activity': 'tc',
+        'solutions': {'count': 2, 'first': '2024-01-01T10:00:00Z',
+                      'last': '2024-01-02T10:00:00Z'}
+    }})
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data['count'] == 3
+    assert [item['id'] for item in data['results']] == [pa2.pk, pa1.pk, pa3.pk]
+    response = client.get(url, {'limit': 1})
+    data = response.json()
+    assert [item['id'] for item in data['results']] == [pa2.pk]
+    assert data['next'] is not None
+    response = client.get(url, {'unanswered': 'true'})
+    assert [item['id'] for item in response.json()['results']] == [pa1.pk]
+    response = client.get(url, {'waiting_since': '2024-01-02T12:00:00Z'})
+    assert [item['id'] for item in response.json()['results']] == [pa2.pk]
+    response = client.get(url, {'statuses': 'unknown'})
+    assert response.status_code == 400
+
+
 @pytest.mark.django_db
 def test_api_view_personal_assignment_output_serializer(lms_resolver, django_capture_on_commit_callbacks):
     student_assignment = StudentAssignmentFactory()
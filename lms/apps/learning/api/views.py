@@ -12,12 +12,14 @@ from rest_framework.response import Response
 from django.utils.translation import gettext_lazy as _
 
 from api.mixins import ApiErrorsMixin
+from api.pagination import CountFreeLimitOffsetPagination, CountModes, KeysetPagination
 from api.permissions import CuratorAccessPermission
-from api.utils import inline_serializer
+from api.utils import DynamicFieldsModelSerializer, get_projection, inline_serializer
 from api.views import APIBaseView
 from auth.mixins import RolePermissionRequiredMixin
 from core.api.fields import CharSeparatedField, ScoreField
 from core.http import AuthenticatedAPIRequest
+from courses.constants import AssignmentStatus
 from courses.models import Assignment, Course
 from courses.permissions import CreateAssignment
 from courses.selectors import course_personal_assignments, get_course_teachers
@@ -30,6 +32,9 @@ from learning.models import (
     CourseNewsNotification, Enrollment, PersonalAssignmentActivity, StudentAssignment
 )
 from learning.permissions import EditStudentAssignment, ViewEnrollments, ViewOwnStudentAssignment
+from learning.selectors import (
+    StudentProgress, get_course_students_progress, get_review_queue
+)
 from learning.services.jba_service import JbaService
 from learning.views.views import StudentAssignmentURLParamsMixin
 
@@ -80,12 +85,32 @@ class CourseAssignmentList(RolePermissionRequiredMixin, ApiErrorsMixin, ListAPIV
 
 # FIXME: return all records with deletedAt info (useful for queue)
 class CourseStudentsList(RolePermissionRequiredMixin, APIBaseView):
-    """List of students enrolled in the course."""
+    """
+    List of students enrolled in the course.
+
+    Pass `page_size` or `cursor` to get paginated response. Use `fields`
+    to restrict output fields and `updated_since` to fetch recently
+    modified records only.
+    """
     permission_classes = [ViewEnrollments]
     renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    pagination_class = KeysetPagination
     course: Course
 
-    class OutputSerializer(BaseEnrollmentSerializer):
+    # Model fields required to render the serializer field
+    projection = {
+        'id': ['id'],
+        'grade': ['grade'],
+        'student_group_id': ['student_group'],
+        'student': ['student__id', 'student__first_name', 'student__last_name'],
+        'student_profile_id': ['student_profile'],
+    }
+
+    class FilterSerializer(serializers.Serializer):
+        fields = CharSeparatedField(allow_blank=True, required=False)
+        updated_since = serializers.DateTimeField(required=False)
+
+    class OutputSerializer(DynamicFieldsModelSerializer, BaseEnrollmentSerializer):
         student = UserSerializer(fields=('id', 'first_name', 'last_name'))
         # TODO: consider to use expandable fields https://github.com/rsinger86/drf-flex-fields or
         #  https://github.com/evenicoulddoit/django-rest-framework-serializer-extensions
@@ -103,22 +128,100 @@ class CourseStudentsList(RolePermissionRequiredMixin, APIBaseView):
         return self.course
 
     def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
+        filters_serializer = self.FilterSerializer(data=request.query_params)
+        filters_serializer.is_valid(raise_exception=True)
+        filters = filters_serializer.validated_data
+        fields = filters.get('fields') or None
         queryset = (Enrollment.active
                     .select_related('student')
                     .filter(course=self.course))
-        data = self.OutputSerializer(queryset, many=True).data
+        if 'updated_since' in filters:
+            queryset = queryset.filter(modified__gte=filters['updated_since'])
+        if fields:
+            if 'student' not in fields:
+                queryset = queryset.select_related(None)
+            projection = get_projection(fields, self.projection,
+                                        required=('id', 'modified'))
+            queryset = queryset.only(*projection)
+        paginator = self.pagination_class()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            data = self.OutputSerializer(page, many=True, fields=fields).data
+            return paginator.get_paginated_response(data)
+        data = self.OutputSerializer(queryset, many=True, fields=fields).data
+        return Response(data)
+
+
+class CourseStudentsProgressList(RolePermissionRequiredMixin, APIBaseView):
+    """
+    Total scores and the number of graded and completed personal assignments
+    of the students enrolled in the course.
+    """
+    permission_classes = [ViewEnrollments]
+    renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    course: Course
+
+    class OutputSerializer(serializers.Serializer):
+        student_id = serializers.IntegerField()
+        total_score = serializers.DecimalField(max_digits=None, decimal_places=2,
+                                               coerce_to_string=True)
+        weighted_total_score = serializers.DecimalField(max_digits=None,
+                                                        decimal_places=2,
+                                                        coerce_to_string=True)
+        assignments_count = serializers.IntegerField()
+        graded_count = serializers.IntegerField()
+        completed_count = serializers.IntegerField()
+
+    def initial(self, request, *args, **kwargs):
+        self.course = get_object_or_404(Course.objects.get_queryset(),
+                                        pk=kwargs['course_id'])
+        super().initial(request, *args, **kwargs)
+
+    def get_permission_object(self) -> Course:
+        return self.course
+
+    def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
+        student_ids = (Enrollment.active
+                       .filter(course=self.course)
+                       .values_list('student_id', flat=True))
+        progress = get_course_students_progress(self.course, student_ids=student_ids)
+        data = [progress.get(student_id, StudentProgress(student_id))
+                for student_id in student_ids]
+        data = self.OutputSerializer(data, many=True).data
         return Response(data)
 
 
 class PersonalAssignmentList(RolePermissionRequiredMixin, APIBaseView):
+    """
+    List of personal assignments of the course.
+
+    Pass `page_size` or `cursor` to get paginated response. Use `fields`
+    to restrict output fields and `updated_since` to fetch recently
+    modified records only.
+    """
     permission_classes = [CreateAssignment]
     renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    pagination_class = KeysetPagination
     course: Course
 
+    # Model fields required to render the serializer field
+    projection = {
+        'id': ['id'],
+        'assignment_id': ['assignment'],
+        'score': ['score'],
+        'status': ['status'],
+        'student': ['student__id', 'student__first_name', 'student__last_name',
+                    'student__username'],
+        'assignee': ['assignee'],
+        'solution_at': ['meta'],
+    }
+
     class FilterSerializer(serializers.Serializer):
         assignments = CharSeparatedField(label='test', allow_blank=True, required=False)
+        fields = CharSeparatedField(allow_blank=True, required=False)
+        updated_since = serializers.DateTimeField(required=False)
 
-    class OutputSerializer(serializers.ModelSerializer):
+    class OutputSerializer(DynamicFieldsModelSerializer):
         score = ScoreField(coerce_to_string=True)
         student = UserSerializer(fields=('id', 'first_name', 'last_name', 'username'))
         assignee = inline_serializer(fields={
@@ -151,12 +254,96 @@ class PersonalAssignmentList(RolePermissionRequiredMixin, APIBaseView):
     def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
         filters_serializer = self.FilterSerializer(data=request.query_params)
         filters_serializer.is_valid(raise_exception=True)
+        filters = dict(filters_serializer.validated_data)
+        fields = filters.pop('fields', None) or None
+        updated_since = filters.pop('updated_since', None)
         personal_assignments = course_personal_assignments(course=self.course,
-                                                           filters=filters_serializer.validated_data)
-        data = self.OutputSerializer(personal_assignments, many=True).data
+                                                           filters=filters)
+        if updated_since is not None:
+            personal_assignments = personal_assignments.filter(modified__gte=updated_since)
+        if fields:
+            if 'student' not in fields:
+                personal_assignments = personal_assignments.select_related(None)
+            # Related objects are prefetched by foreign keys
+            projection = get_projection(fields, self.projection,
+                                        required=('id', 'modified', 'assignment', 'assignee'))
+            personal_assignments = personal_assignments.only(*projection)
+        paginator = self.pagination_class()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(personal_assignments, request, view=self)
+            data = self.OutputSerializer(page, many=True, fields=fields).data
+            return paginator.get_paginated_response(data)
+        data = self.OutputSerializer(personal_assignments, many=True, fields=fields).data
         return Response(data)
 
 
+class ReviewQueuePagination(CountFreeLimitOffsetPagination):
+    default_limit = 50
+    max_limit = 500
+
+
+class PersonalAssignmentReviewQueue(RolePermissionRequiredMixin, APIBaseView):
+    """
+    Personal assignments of the course waiting for review, the oldest
+    solution first. Filtering and ordering happen in the database, use
+    `limit` to get the top N items.
+    """
+    permission_classes = [CreateAssignment]
+    renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    pagination_class = ReviewQueuePagination
+    pagination_count_mode = CountModes.CACHED
+    course: Course
+
+    class FilterSerializer(serializers.Serializer):
+        assignments = CharSeparatedField(allow_blank=True, required=False)
+        statuses = CharSeparatedField(allow_blank=True, required=False)
+        assignees = CharSeparatedField(allow_blank=True, required=False)
+        student_groups = CharSeparatedField(allow_blank=True, required=False)
+        unanswered = serializers.BooleanField(required=False)
+        waiting_since = serializers.DateTimeField(required=False)
+
+        def _validate_ids(self, value):
+            try:
+                return [int(v) for v in value]
+            except ValueError:
+                raise serializers.ValidationError(_("Invalid id"))
+
+        def validate_assignments(self, value):
+            return self._validate_ids(value)
+
+        def validate_assignees(self, value):
+            return self._validate_ids(value)
+
+        def validate_student_groups(self, value):
+            return self._validate_ids(value)
+
+        def validate_statuses(self, value):
+            for status in value:
+                if status not in AssignmentStatus.values:
+                    raise serializers.ValidationError(_("Unknown status %s") % status)
+            return value
+
+    OutputSerializer = PersonalAssignmentList.OutputSerializer
+
+    def initial(self, request, *args, **kwargs):
+        self.course = get_object_or_404(Course.objects.get_queryset(), pk=kwargs['course_id'])
+        super().initial(request, *args, **kwargs)
+
+    def get_permission_object(self) -> Course:
+        return self.course
+
+    def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
+        filters_serializer = self.FilterSerializer(data=request.query_params)
+        filters_serializer.is_valid(raise_exception=True)
+        personal_assignments = (get_review_queue(course=self.course,
+                                                 filters=filters_serializer.validated_data)
+                                .select_related('student', 'assignee__teacher'))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(personal_assignments, request, view=self)
+        data = self.OutputSerializer(page, many=True).data
+        return paginator.get_paginated_response(data)
+
+
 class StudentAssignmentUpdate(UpdateAPIView):
     permission_classes = [EditStudentAssignment]
     serializer_class = BaseStudentAssignmentSerializer
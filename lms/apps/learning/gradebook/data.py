@@ -9,10 +9,10 @@ from django.conf import settings
 from django.db.models import Q
 from django.utils.functional import cached_property
 
-from core.db.utils import normalize_score
 from courses.constants import AssignmentStatus
 from courses.models import Assignment, Course
 from learning.models import Enrollment, StudentAssignment, StudentGroup
+from learning.selectors import get_course_students_progress
 from learning.settings import GradeTypes
 
 __all__ = ('GradebookStudent', 'GradeBookData', 'gradebook_data',
@@ -219,14 +219,11 @@ def gradebook_data(course: Course, student_group: Optional[int] = None) -> Grade
         student_assignment.assignment = gradebook_assignment.assignment
         student_assignments[student_index][gradebook_assignment.index] = student_assignment
     # Aggregate student total score
-    for student_id in enrolled_students:
-        gradebook_student = enrolled_students[student_id]
-        student_progress = student_assignments[gradebook_student.index]
+    students_progress = get_course_students_progress(course, assignment_ids=list(assignments))
+    for student_id, gradebook_student in enrolled_students.items():
         total_score = Decimal(0)
-        for s in student_progress:
-            if s is not None and s.final_score is not None:
-                total_score += s.weighted_final_score
-        total_score = normalize_score(total_score)
+        if student_id in students_progress:
+            total_score = students_progress[student_id].weighted_total_score
         setattr(gradebook_student, "total_score", total_score)
     show_weight = any(ga.assignment.weight < 1 for ga in assignments.values())
     return GradeBookData(course=course,
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.enrollment_service import rebuild_passed_meta_courses_count
+from users.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = ("Recalculates the number of passed courses of student profiles. "
+            "The value is maintained on enrollment changes, use this command "
+            "to verify or repair it.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', dest='batch_size', type=int,
+                            default=1000, help='Student profiles per query')
+        parser.add_argument('--check', action='store_true', default=False,
+                            help='Report outdated values without saving them')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['check']
+        profile_ids = list(StudentProfile.objects
+                           .order_by('pk')
+                           .values_list('pk', flat=True))
+        total = 0
+        for i in range(0, len(profile_ids), batch_size):
+            batch = profile_ids[i:i + batch_size]
+            queryset = StudentProfile.objects.filter(pk__in=batch)
+            total += rebuild_passed_meta_courses_count(queryset,
+                                                       dry_run=dry_run)
+        action = "found" if dry_run else "fixed"
+        self.stdout.write(f"Outdated values {action}: {total}")
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from courses.models import Assignment
+from learning.models import StudentAssignment
+from learning.services.personal_assignment_service import (
+    rebuild_personal_assignments_stats
+)
+
+
+class Command(BaseCommand):
+    help = ("Recalculates personal assignment stats from scratch. "
+            "Stats are maintained incrementally, use this command "
+            "to verify or repair them.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', dest='course_ids', type=int,
+                            action='append', default=[],
+                            help='Course id. Could be specified multiple times')
+        parser.add_argument('--assignment', dest='assignment_ids', type=int,
+                            action='append', default=[],
+                            help='Assignment id. Could be specified multiple times')
+        parser.add_argument('--check', action='store_true', default=False,
+                            help='Report outdated stats without saving them')
+
+    def handle(self, *args, **options):
+        course_ids = options['course_ids']
+        assignment_ids = options['assignment_ids']
+        if not course_ids and not assignment_ids:
+            raise CommandError("Specify at least one course or assignment")
+        dry_run = options['check']
+        assignments = (Assignment.objects
+                       .filter(Q(pk__in=assignment_ids) | Q(course_id__in=course_ids))
+                       .order_by('pk')
+                       .values_list('pk', flat=True))
+        total = 0
+        # Process one assignment at a time to keep memory usage bounded
+        for assignment_id in assignments:
+            personal_assignments = (StudentAssignment.objects
+                                    .filter(assignment_id=assignment_id))
+            outdated = rebuild_personal_assignments_stats(personal_assignments,
+                                                          dry_run=dry_run)
+            if outdated:
+                self.stdout.write(f"Assignment {assignment_id}: {outdated} "
+                                  f"personal assignments with outdated stats")
+            total += outdated
+        action = "found" if dry_run else "fixed"
+        self.stdout.write(f"Outdated stats {action}: {total}")
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.18 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_review_load(apps, schema_editor):
+    StudentAssignment = apps.get_model('learning', 'StudentAssignment')
+    AssigneeReviewLoad = apps.get_model('learning', 'AssigneeReviewLoad')
+    review_load = (StudentAssignment.objects
+                   .filter(assignee__isnull=False, deleted_at__isnull=True)
+                   .values('assignment_id', 'assignee_id')
+                   .annotate(total=Count('*'))
+                   .order_by())
+    AssigneeReviewLoad.objects.bulk_create(
+        (AssigneeReviewLoad(assignment_id=row['assignment_id'],
+                            assignee_id=row['assignee_id'],
+                            personal_assignments=row['total'])
+         for row in review_load.iterator()),
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0067_remove_courseprogrambinding_exactly_one_of_invitation_program_and_more"),
+        ("learning", "0061_remove_event_branch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssigneeReviewLoad",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "personal_assignments",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Personal Assignments"
+                    ),
+                ),
+                (
+                    "assignee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.courseteacher",
+                        verbose_name="Assignee",
+                    ),
+                ),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.assignment",
+                        verbose_name="Assignment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Assignee review load",
+                "verbose_name_plural": "Assignee review load",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="assigneereviewload",
+            constraint=models.UniqueConstraint(
+                fields=("assignment", "assignee"),
+                name="unique_review_load_per_assignee",
+            ),
+        ),
+        migrations.RunPython(populate_review_load, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("learning", "0062_assigneereviewload"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="studentassignment",
+            index=models.Index(
+                fields=["assignment", "status", "assignee"],
+                name="personal_assignment_queue_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="studentassignment",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    django.db.models.fields.json.KT("meta__stats__solutions__last"),
+                    django.db.models.fields.json.KT("meta__stats__solutions__first"),
+                ),
+                name="personal_assignment_solution_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0063_studentassignment_review_queue_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assignmentcomment",
+            name="markdown_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="assignmentcomment",
+            name="text_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
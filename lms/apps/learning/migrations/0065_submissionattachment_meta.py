@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0064_assignmentcomment_text_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submissionattachment",
+            name="meta",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -10,7 +10,9 @@ from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Q, Sum
+from django.db.models import Case, F, OuterRef, Q, Subquery, Sum, When
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.encoding import smart_str
 from django.utils.timezone import now
@@ -23,7 +25,7 @@ from model_utils.models import TimeStampedModel
 from rest_framework.utils.encoders import JSONEncoder
 
 from core.db.fields import ScoreField
-from core.db.mixins import DerivableFieldsMixin
+from core.db.mixins import DerivableFieldsMixin, RenderedMarkdownMixin
 from core.db.models import SoftDeletionModel
 from core.models import LATEX_MARKDOWN_HTML_ENABLED, Location, TimestampedModel, AcademicProgram, \
     AcademicProgramRun
@@ -216,6 +218,38 @@ class StudentGroupTeacherBucket(models.Model):
         verbose_name_plural = _("Student groups teachers buckets")
 
 
+class AssigneeReviewLoad(models.Model):
+    """
+    Number of personal assignments of the assignment where the course teacher
+    is set as an assignee. Used for balancing review load between teachers
+    of the same student group bucket.
+
+    Maintained by `learning.services.personal_assignment_service.update_assignee_review_load`
+    """
+    assignment = models.ForeignKey(
+        'courses.Assignment',
+        verbose_name=_("Assignment"),
+        related_name='+',
+        on_delete=models.CASCADE)
+    assignee = models.ForeignKey(
+        'courses.CourseTeacher',
+        verbose_name=_("Assignee"),
+        related_name='+',
+        on_delete=models.CASCADE)
+    personal_assignments = models.PositiveIntegerField(
+        _("Personal Assignments"),
+        default=0)
+
+    class Meta:
+        verbose_name = _("Assignee review load")
+        verbose_name_plural = _("Assignee review load")
+        constraints = [
+            models.UniqueConstraint(
+                fields=('assignment', 'assignee'),
+                name='unique_review_load_per_assignee'),
+        ]
+
+
 class AssignmentGroup(models.Model):
     """
     Course assignment can be restricted to a subset of student groups
@@ -447,6 +481,32 @@ class PersonalAssignmentActivity(models.TextChoices):
     SOLUTION = 'ns'
 
 
+def get_solution_at_expr() -> Coalesce:
+    """
+    Returns the latest solution datetime from the personal assignment stats
+    as ISO 8601 string in UTC, which preserves chronological order.
+
+    The expression is indexed, see `StudentAssignment.Meta.indexes`.
+    """
+    return Coalesce(KT('meta__stats__solutions__last'),
+                    KT('meta__stats__solutions__first'))
+
+
+def get_final_score_expr() -> Case:
+    """
+    Returns the sum of score and penalty points of the personal assignment.
+    SQL counterpart of the `StudentAssignment.final_score` property.
+    """
+    score, penalty = F('score'), F('penalty')
+    return Case(
+        # Negative penalty value is stored in a score field
+        When(assignment__submission_type=AssignmentFormat.PENALTY, then=-score),
+        When(score__isnull=True, then=penalty),
+        When(penalty__isnull=True, then=score),
+        default=score + penalty,
+        output_field=models.DecimalField(max_digits=6, decimal_places=2))
+
+
 class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
                         DerivableFieldsMixin):
     TIMEZONE_AWARE_FIELD_NAME = 'assignment'
@@ -508,7 +568,7 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
 
     objects = StudentAssignmentManager()
 
-    tracker = FieldTracker(fields=['score'])
+    tracker = FieldTracker(fields=['score', 'assignee', 'deleted_at'])
 
     derivable_fields = ['execution_time']
 
@@ -517,6 +577,12 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
         verbose_name = _("Personal Assignment")
         verbose_name_plural = _("Personal Assignments")
         unique_together = [['assignment', 'student']]
+        indexes = [
+            models.Index(fields=['assignment', 'status', 'assignee'],
+                         name='personal_assignment_queue_idx'),
+            models.Index(get_solution_at_expr(),
+                         name='personal_assignment_solution_idx'),
+        ]
 
     def clean(self):
         if self.score and self.score > self.assignment.maximum_score:
@@ -528,6 +594,16 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
         return "{0} - {1}".format(smart_str(self.assignment),
                                   smart_str(self.student.get_full_name()))
 
+    @classmethod
+    def _aggregate_execution_time(cls):
+        return Subquery(AssignmentComment.objects
+                        .filter(type=AssignmentSubmissionTypes.SOLUTION,
+                                student_assignment_id=OuterRef('pk'))
+                        .order_by()
+                        .values('student_assignment_id')  # group by
+                        .annotate(total=Sum('execution_time'))
+                        .values('total'))
+
     def _compute_execution_time(self):
         time_spent = (AssignmentComment.objects
                       .filter(type=AssignmentSubmissionTypes.SOLUTION,
@@ -700,8 +776,10 @@ class AssignmentSubmissionTypes(DjangoChoices):
     SOLUTION = C('solution', _("Solution"))
 
 
-class AssignmentComment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel):
+class AssignmentComment(RenderedMarkdownMixin, SoftDeletionModel,
+                        TimezoneAwareMixin, TimeStampedModel):
     TIMEZONE_AWARE_FIELD_NAME = 'student_assignment'
+    markdown_fields = ['text']
 
     student_assignment = models.ForeignKey(
         'StudentAssignment',
@@ -721,6 +799,8 @@ class AssignmentComment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel)
         _("AssignmentComment|text"),
         help_text=_("LaTeX+Markdown is enabled"),
         blank=True)
+    text_html = models.TextField(blank=True, default='', editable=False)
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         verbose_name=_("Author"),
@@ -831,6 +911,9 @@ class SubmissionAttachment(TimeStampedModel):
     attachment = ConfigurableStorageFileField(
         upload_to=assignment_submission_attachment_upload_to,
         max_length=200)
+    meta = models.JSONField(
+        blank=True, null=True,
+        editable=False)
 
     class Meta:
         verbose_name = _("Assignment Submission Attachment")
@@ -1,15 +1,20 @@
 from abc import ABCMeta, abstractmethod
 from enum import Enum
-from typing import Dict, List, Literal, Set
-
-from django.db.models import Case, Count, F, IntegerField, Prefetch, Q, When
+from typing import Any, Dict, Iterator, List, Literal, Set
+
+from django.db.models import (
+    Case, CharField, Count, F, IntegerField, Prefetch, Q, QuerySet, Value, When
+)
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
+from django.utils.encoding import smart_str
 from pandas import DataFrame
 
-from courses.constants import SemesterTypes
+from courses.constants import AssignmentFormat, AssignmentStatus, SemesterTypes
 from courses.models import Course, MetaCourse
 from courses.selectors import course_teachers_prefetch_queryset
 from courses.utils import get_term_index
-from learning.models import Enrollment
+from learning.models import AssignmentComment, Enrollment
 from learning.settings import StudentStatuses, GradingSystems
 from users.managers import get_enrollments_progress
 from users.models import StudentProfile, StudentTypes, User
@@ -447,3 +452,90 @@ class ProgressReportForInvitation(ProgressReportForSemester):
             "student_profile_id"
         )
         return [Q(type=StudentTypes.INVITED), Q(pk__in=student_profiles)]
+
+
+class AssignmentStatusLog:
+    """
+    Generates status transitions log of online assignments from
+    published comments. Transitions are detected in the database,
+    rows are fetched with a server-side cursor.
+
+    Usage example:
+        comments = AssignmentComment.objects.filter(student_assignment__assignment=assignment)
+        rows = AssignmentStatusLog().generate(comments)
+    """
+    headers = [
+        "student",
+        "student_id",
+        "task",
+        "comment_author",
+        "comment_author_id",
+        "action",
+        "comment_posted_ISO"
+    ]
+    GRADE_UPDATED = 'Grade updated'
+    SOLUTION_SUBMITTED = 'Solution submitted for review'
+    NEED_FIXES = 'New comment received from reviewer'
+    chunk_size = 2000
+
+    def get_queryset(self, comments: QuerySet) -> QuerySet:
+        status = KT('meta__status')
+        status_old = Coalesce(KT('meta__status_old'), Value(''))
+        action = Case(
+            When(Q(status=AssignmentStatus.COMPLETED) &
+                 ~Q(status_old=AssignmentStatus.COMPLETED),
+                 then=Value(self.GRADE_UPDATED)),
+            When(Q(author_id=F('student_assignment__student_id'),
+                   status=AssignmentStatus.ON_CHECKING),
+                 then=Value(self.SOLUTION_SUBMITTED)),
+            When(Q(status=AssignmentStatus.NEED_FIXES) &
+                 ~Q(status_old=AssignmentStatus.NEED_FIXES),
+                 then=Value(self.NEED_FIXES)),
+            default=None,
+            output_field=CharField()
+        )
+        return (comments
+                .filter(is_published=True,
+                        student_assignment__assignment__submission_type=AssignmentFormat.ONLINE,
+                        meta__has_keys=['status', 'status_old'])
+                .alias(status=status, status_old=status_old)
+                .annotate(action=action)
+                .filter(action__isnull=False)
+                .order_by('student_assignment__assignment_id',
+                          'student_assignment__student_id',
+                          'created')
+                .values_list('student_assignment__student__first_name',
+                             'student_assignment__student__last_name',
+                             'student_assignment__student__username',
+                             'student_assignment__student_id',
+                             'student_assignment__assignment__title',
+                             'author__first_name',
+                             'author__last_name',
+                             'author__username',
+                             'author_id',
+                             'action',
+                             'created'))
+
+    @staticmethod
+    def _get_short_name(first_name: str, last_name: str, username: str) -> str:
+        """Same as `User.get_short_name` without the model instance"""
+        return smart_str(" ".join([first_name, last_name]).strip()) or username
+
+    def generate(self, comments: QuerySet) -> Iterator[List[Any]]:
+        yield self.headers
+        queryset = self.get_queryset(comments)
+        for row in queryset.iterator(chunk_size=self.chunk_size):
+            (student_first_name, student_last_name, student_username, student_id,
+             title, author_first_name, author_last_name, author_username,
+             author_id, action, created) = row
+            yield [
+                self._get_short_name(student_first_name, student_last_name,
+                                     student_username),
+                student_id,
+                title,
+                self._get_short_name(author_first_name, author_last_name,
+                                     author_username),
+                author_id,
+                action,
+                created.isoformat()
+            ]
@@ -1,11 +1,26 @@
-from typing import List, Optional, Union
+import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
 
-from django.db.models import Q, QuerySet
+from rest_framework.utils.encoders import JSONEncoder
 
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import (
+    BooleanField, Case, Count, DecimalField, Exists, F, OuterRef, Q, QuerySet,
+    Subquery, Sum, Value, When
+)
+from django.db.models.fields.json import KT
+
+from core.db.utils import normalize_score
+from courses.constants import AssignmentStatus
 from courses.managers import AssignmentQuerySet, CourseClassQuerySet, CourseQuerySet
-from courses.models import Assignment, Course, CourseClass, CourseTeacher
-from learning.managers import EnrollmentQuerySet
-from learning.models import Enrollment, Event
+from courses.models import Assignment, Course, CourseClass, CourseTeacher, Semester
+from learning.managers import EnrollmentQuerySet, StudentAssignmentQuerySet
+from learning.models import (
+    Enrollment, Event, PersonalAssignmentActivity, StudentAssignment,
+    get_final_score_expr, get_solution_at_expr
+)
+from learning.settings import GradingSystems
 from users.models import User
 
 CourseID = int
@@ -87,3 +102,214 @@ def get_teacher_assignments(user):
             .select_related('course',
                             'course__meta_course',
                             'course__semester'))
+
+
+def get_course_participants_overlap(course_ids: List[CourseID]) -> QuerySet:
+    """
+    Returns active participants of the courses grouped by student with
+    the number of these courses the student is enrolled in.
+
+    Example:
+        # Students enrolled in all the courses
+        get_course_participants_overlap(course_ids).filter(courses=len(course_ids))
+    """
+    return (Enrollment.active
+            .filter(course_id__in=course_ids)
+            .order_by()
+            .values('student_id')  # group by
+            .annotate(courses=Count('course_id', distinct=True)))
+
+
+def get_course_participants_overlap_counts(course_ids: List[CourseID]) -> QuerySet:
+    """
+    Returns the number of active participants by the number of the
+    courses they are enrolled in, the largest overlap first.
+
+    Example:
+        [(3, 1), (2, 5), (1, 42)]
+    """
+    enrollments = Enrollment.active.filter(course_id__in=course_ids)
+    # Aggregate can't be grouped by, count courses of the student in a subquery
+    student_courses = (enrollments
+                       .filter(student_id=OuterRef('pk'))
+                       .order_by()
+                       .values('student_id')
+                       .annotate(total=Count('course_id', distinct=True))
+                       .values('total'))
+    return (User.objects
+            .filter(pk__in=enrollments.values('student_id'))
+            .annotate(courses=Subquery(student_courses))
+            .order_by()
+            .values('courses')  # group by
+            .annotate(students=Count('*'))
+            .values_list('courses', 'students')
+            .order_by('-courses'))
+
+
+def get_review_queue(*, course: Course,
+                     filters: Optional[Dict[str, Any]] = None) -> StudentAssignmentQuerySet:
+    """
+    Returns personal assignments of the course, the oldest solution first.
+
+    Supported filters: `assignments`, `statuses`, `assignees`,
+    `student_groups`, `unanswered` (the last activity belongs to the student)
+    and `waiting_since` (the latest solution was sent before the given time).
+    """
+    filters = filters or {}
+    course_assignments = Assignment.objects.filter(course=course).values('pk')
+    queryset = (StudentAssignment.objects
+                .filter(assignment__in=course_assignments)
+                .alias(solution_at=get_solution_at_expr()))
+    if filters.get('assignments'):
+        queryset = queryset.filter(assignment__in=filters['assignments'])
+    if filters.get('statuses'):
+        queryset = queryset.filter(status__in=filters['statuses'])
+    if filters.get('assignees'):
+        queryset = queryset.filter(assignee__in=filters['assignees'])
+    if filters.get('student_groups'):
+        enrollments = (Enrollment.active
+                       .filter(course=course,
+                               student_id=OuterRef('student_id'),
+                               student_group__in=filters['student_groups']))
+        queryset = queryset.filter(Exists(enrollments))
+    if filters.get('unanswered'):
+        student_activity = [PersonalAssignmentActivity.SOLUTION,
+                            PersonalAssignmentActivity.STUDENT_COMMENT]
+        queryset = (queryset
+                    .alias(activity=KT('meta__stats__activity'))
+                    .filter(activity__in=student_activity))
+    waiting_since: Optional[datetime.datetime] = filters.get('waiting_since')
+    if waiting_since is not None:
+        # Stats keep datetimes in UTC without microseconds
+        value = waiting_since.astimezone(datetime.timezone.utc).replace(microsecond=0)
+        queryset = queryset.filter(solution_at__lte=JSONEncoder().default(value))
+    return queryset.order_by(F('solution_at').asc(nulls_last=True), 'pk')
+
+
+class StudentProgress(NamedTuple):
+    student_id: int
+    total_score: Decimal = Decimal(0)
+    weighted_total_score: Decimal = Decimal(0)
+    assignments_count: int = 0
+    graded_count: int = 0
+    completed_count: int = 0
+
+
+def get_course_students_progress(course: Course, *,
+                                 student_ids: Optional[Iterable[int]] = None,
+                                 assignment_ids: Optional[Iterable[int]] = None
+                                 ) -> Dict[int, StudentProgress]:
+    """
+    Aggregates personal assignments of the course by student in a single
+    grouped query: sum of final scores, sum of final scores multiplied by
+    assignment weights, the number of personal assignments, graded
+    and completed ones.
+
+    Students without personal assignments are missing in the result,
+    use `StudentProgress(student_id)` as a default.
+    """
+    queryset = StudentAssignment.objects.filter(assignment__course=course)
+    if student_ids is not None:
+        queryset = queryset.filter(student_id__in=student_ids)
+    if assignment_ids is not None:
+        queryset = queryset.filter(assignment_id__in=assignment_ids)
+    weighted_score = F('assignment__weight') * F('final_score')
+    rows = (queryset
+            .alias(final_score=get_final_score_expr())
+            .order_by()
+            .values('student_id')  # group by
+            .annotate(total_score=Sum('final_score'),
+                      weighted_total_score=Sum(weighted_score,
+                                               output_field=DecimalField()),
+                      assignments_count=Count('pk'),
+                      graded_count=Count('pk', filter=Q(final_score__isnull=False)),
+                      completed_count=Count('pk', filter=Q(status=AssignmentStatus.COMPLETED)))
+            .values_list('student_id', 'total_score', 'weighted_total_score',
+                         'assignments_count', 'graded_count', 'completed_count'))
+    progress = {}
+    for (student_id, total_score, weighted_total_score,
+         assignments_count, graded_count, completed_count) in rows:
+        progress[student_id] = StudentProgress(
+            student_id=student_id,
+            total_score=normalize_score(total_score or Decimal(0)),
+            weighted_total_score=normalize_score(weighted_total_score or Decimal(0)),
+            assignments_count=assignments_count,
+            graded_count=graded_count,
+            completed_count=completed_count)
+    return progress
+
+
+def _get_empty_student_stats() -> Dict[str, Any]:
+    return {
+        "failed": {"total": 0},
+        # All the time
+        "passed": {
+            "total": 0,
+            "adjusted": 0,
+            "center_courses": set(),
+            "club_courses": set(),
+        },
+        "in_term": {
+            "total": 0,
+            "courses": set(),
+            "passed": 0,
+            "failed": 0,
+            "in_progress": 0,
+        }
+    }
+
+
+def get_students_stats(semester: Semester, student_ids: Iterable[int], *,
+                       enrollments: Optional[EnrollmentQuerySet] = None
+                       ) -> Dict[int, Dict[str, Any]]:
+    """
+    Stats for successfully completed courses and enrollments in the
+    requested term computed for many students with a single grouped query.
+    Enrollment is passed if the grade is not lower than the passing grade
+    of the grading system of the course program binding.
+
+    Active enrollments are used by default, pass `enrollments` queryset
+    to override it. Returns stats by student id in `User.stats` format.
+    """
+    student_ids = list(student_ids)
+    if enrollments is None:
+        enrollments = Enrollment.active.all()
+    is_passed = Case(
+        When(grade__gte=GradingSystems.get_passing_grade_expr(), then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField()
+    )
+    passed = Q(is_passed=True)
+    in_term = Q(course__semester_id=semester.pk)
+    rows = (enrollments
+            .filter(student_id__in=student_ids)
+            .alias(is_passed=is_passed)
+            .order_by()
+            .values('student_id')  # group by
+            .annotate(failed=Count('pk', filter=~passed),
+                      passed_courses=ArrayAgg('course__meta_course_id',
+                                              filter=passed, distinct=True,
+                                              default=None),
+                      in_term_total=Count('pk', filter=in_term),
+                      in_term_courses=ArrayAgg('course__meta_course_id',
+                                               filter=in_term, distinct=True,
+                                               default=None),
+                      in_term_passed=Count('pk', filter=in_term & passed),
+                      in_term_failed=Count('pk', filter=in_term & ~passed)))
+    stats = {student_id: _get_empty_student_stats() for student_id in student_ids}
+    for row in rows:
+        student_stats = stats[row['student_id']]
+        passed_courses = set(row['passed_courses'] or [])
+        student_stats['failed']['total'] = row['failed']
+        student_stats['passed'].update({
+            "total": len(passed_courses),
+            "adjusted": len(passed_courses),
+            "center_courses": passed_courses,
+        })
+        student_stats['in_term'].update({
+            "total": row['in_term_total'],
+            "courses": set(row['in_term_courses'] or []),
+            "passed": row['in_term_passed'],
+            "failed": row['in_term_failed'],
+        })
+    return stats
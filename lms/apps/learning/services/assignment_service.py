@@ -1,6 +1,7 @@
 from datetime import timedelta
+from functools import partial
 from django.core.files.uploadedfile import UploadedFile
-from django.db import router
+from django.db import router, transaction
 from django.db.models import Avg, Q
 from typing import Iterable, List, Optional, Union
 
@@ -109,6 +110,11 @@ class AssignmentService:
         for batch in chunks(objs, batch_size):
             batch = [x for x in batch if x is not None]
             StudentAssignment.objects.bulk_create(batch, batch_size)
+        # Bulk create doesn't send `post_save`, drop cached open assignments
+        # of the course participants explicitly
+        from learning.study.services import invalidate_open_assignments_cache
+        transaction.on_commit(partial(invalidate_open_assignments_cache,
+                                      course_id=assignment.course_id))
         # TODO: move to the separated method
         # Generate notifications
         to_notify = [sid for sid in students if sid not in already_exist]
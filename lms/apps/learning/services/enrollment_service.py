@@ -1,13 +1,15 @@
 import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.db import transaction
-from django.db.models import Count, F, Func, OuterRef, Q, Subquery, TextField, Value
+from django.db.models import (
+    Case, Count, F, Func, OuterRef, Q, QuerySet, Subquery, TextField, Value, When
+)
 from django.db.models.functions import Coalesce, Concat
 from django.db.models.signals import post_save
 
-from core.timezone import now_local
+from core.timezone import get_now_utc, now_local
 from core.timezone.constants import DATE_FORMAT_RU
 from courses.constants import AssignmentFormat
 from courses.models import Course, CourseGroupModes, CourseProgramBinding
@@ -166,6 +168,56 @@ def update_course_learners_count(course_id: int) -> None:
     )
 
 
+def get_passed_meta_courses_count_subquery(outer_ref: OuterRef) -> Func:
+    """
+    Counts distinct meta courses of the student enrollments except those
+    with a grade below the passing grade of the course program binding.
+    """
+    passing_grade = GradingSystems.get_passing_grade_expr()
+    passed_meta_course = Case(
+        When(grade__lt=passing_grade, then=Value(None)),
+        default=F('course__meta_course_id')
+    )
+    return Coalesce(Subquery(
+        (Enrollment.objects
+         .filter(student_id=outer_ref)
+         .order_by()
+         .values('student_id')  # group by
+         .annotate(total=Count(passed_meta_course, distinct=True))
+         .values('total'))
+    ), Value(0))
+
+
+def update_passed_meta_courses_count(user_ids: Iterable[int]) -> None:
+    """
+    Updates `StudentProfile.passed_meta_courses_count` of all student
+    profiles of the users.
+    """
+    (StudentProfile.objects
+     .filter(user_id__in=user_ids)
+     .update(passed_meta_courses_count=get_passed_meta_courses_count_subquery(
+         outer_ref=OuterRef('user_id'))))
+
+
+def rebuild_passed_meta_courses_count(queryset: QuerySet, *,
+                                      dry_run: bool = False) -> int:
+    """
+    Recalculates `passed_meta_courses_count` of the student profiles
+    from the queryset. Returns the number of profiles with outdated value.
+    """
+    actual_value = get_passed_meta_courses_count_subquery(
+        outer_ref=OuterRef('user_id'))
+    outdated = list(queryset
+                    .annotate(actual_value=actual_value)
+                    .exclude(passed_meta_courses_count=F('actual_value'))
+                    .values_list('pk', flat=True))
+    if outdated and not dry_run:
+        (StudentProfile.objects
+         .filter(pk__in=outdated)
+         .update(passed_meta_courses_count=actual_value))
+    return len(outdated)
+
+
 def recreate_assignments_for_student(enrollment: Enrollment) -> None:
     """
     Resets progress for existing and creates missing assignments
@@ -203,7 +255,7 @@ def update_enrollment_grade(enrollment: Enrollment, *,
         raise ValidationError("Unknown Enrollment Grade change Source", code="invalid")
     updated = (Enrollment.objects
                .filter(pk=enrollment.pk, grade__in=[old_grade, new_grade])
-               .update(grade=new_grade))
+               .update(grade=new_grade, modified=get_now_utc()))
     if not updated:
         return False, enrollment
     enrollment.grade = new_grade
@@ -215,5 +267,6 @@ def update_enrollment_grade(enrollment: Enrollment, *,
     if grade_changed_at:
         log_entry.grade_changed_at = grade_changed_at
     log_entry.save()
+    update_passed_meta_courses_count([enrollment.student_id])
 
     return True, enrollment
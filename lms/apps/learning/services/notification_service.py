@@ -1,9 +1,14 @@
-from courses.models import CourseTeacher
+from django.db import connection, transaction
+
+from core.timezone import get_now_utc
+from courses.models import CourseNews, CourseTeacher
 from learning.models import (
     AssignmentComment, AssignmentNotification, AssignmentSubmissionTypes,
     CourseNewsNotification, Enrollment, StudentAssignment
 )
-from notifications.tasks import send_assignment_notifications
+from notifications.tasks import (
+    send_assignment_notifications, send_course_news_notifications
+)
 
 
 # TODO: store it closer to services or here?
@@ -53,3 +58,41 @@ def generate_notifications_about_new_submission(submission: AssignmentComment):
             notifications.append(n)
     AssignmentNotification.objects.bulk_create(notifications)
     send_assignment_notifications.delay([x.id for x in notifications])
+
+
+def create_notifications_about_course_news(course_news: CourseNews) -> int:
+    """
+    Fans out course news to active students and course teachers with a single
+    INSERT ... SELECT statement, so the audience is never loaded into memory.
+    Returns the number of created notifications.
+    """
+    qn = connection.ops.quote_name
+    notification_table = qn(CourseNewsNotification._meta.db_table)
+    enrollment_table = qn(Enrollment._meta.db_table)
+    course_teacher_table = qn(CourseTeacher._meta.db_table)
+    sql = f"""
+        INSERT INTO {notification_table}
+            (created, modified, user_id, course_offering_news_id,
+             is_unread, is_notified)
+        SELECT %(now)s, %(now)s, audience.user_id, %(news_id)s, TRUE, FALSE
+          FROM (SELECT student_id AS user_id
+                  FROM {enrollment_table}
+                 WHERE course_id = %(course_id)s AND NOT is_deleted
+                 UNION
+                SELECT teacher_id AS user_id
+                  FROM {course_teacher_table}
+                 WHERE course_id = %(course_id)s) AS audience
+        RETURNING id
+    """
+    params = {
+        'now': get_now_utc(),
+        'news_id': course_news.pk,
+        'course_id': course_news.course_id,
+    }
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            notification_ids = [row[0] for row in cursor.fetchall()]
+    if notification_ids:
+        send_course_news_notifications.delay(notification_ids)
+    return len(notification_ids)
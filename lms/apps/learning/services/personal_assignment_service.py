@@ -1,20 +1,23 @@
+import json
 import logging
 from collections import defaultdict
 from datetime import timedelta
 from decimal import Decimal
 from functools import partial
-from typing import Any, Dict, List, Optional, Tuple, Literal
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Literal
 
 from django.core.exceptions import ValidationError, MultipleObjectsReturned
 from django.core.files.uploadedfile import UploadedFile
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import (
-    Case, Count, DateTimeField, F, IntegerField, Max, Min, When, Window
+    Case, Count, DateTimeField, F, IntegerField, Max, Min, QuerySet, When, Window
 )
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from markupsafe import Markup
+from rest_framework.utils.encoders import JSONEncoder
 
+from core.queues import enqueue_unique
 from core.timezone import get_now_utc
 from core.typings import assert_never
 from core.utils import _empty
@@ -22,8 +25,9 @@ from courses.constants import AssigneeMode, AssignmentStatus
 from courses.models import Assignment, CourseTeacher
 from courses.selectors import personal_assignments_list
 from learning.models import (
-    AssignmentComment, AssignmentScoreAuditLog, AssignmentSubmissionTypes, Enrollment,
-    PersonalAssignmentActivity, StudentAssignment, StudentGroupTeacherBucket
+    AssigneeReviewLoad, AssignmentComment, AssignmentScoreAuditLog,
+    AssignmentSubmissionTypes, Enrollment, PersonalAssignmentActivity,
+    StudentAssignment, StudentGroupTeacherBucket
 )
 from learning.services import StudentGroupService
 from learning.settings import AssignmentScoreUpdateSource
@@ -32,6 +36,63 @@ from users.models import User
 logger = logging.getLogger(__name__)
 
 
+def _get_submission_activity(submission_type: str, author_id: Optional[int],
+                             student_id: int) -> PersonalAssignmentActivity:
+    if submission_type == AssignmentSubmissionTypes.SOLUTION:
+        return PersonalAssignmentActivity.SOLUTION
+    elif submission_type == AssignmentSubmissionTypes.COMMENT:
+        if author_id == student_id:
+            return PersonalAssignmentActivity.STUDENT_COMMENT
+        return PersonalAssignmentActivity.TEACHER_COMMENT
+    raise ValueError('Unknown submission type')
+
+
+def _build_personal_assignment_stats(*, activity: PersonalAssignmentActivity,
+                                     submissions_total: int,
+                                     solutions_total: int,
+                                     solution_first, solution_latest) -> Dict[str, Any]:
+    new_stats: Dict[str, Any] = {'activity': str(activity)}
+    comments_total = submissions_total - solutions_total
+    if comments_total:
+        new_stats['comments'] = comments_total
+    # Omit default or null values to save space
+    if solutions_total:
+        solution_stats = {
+            'count': solutions_total,
+            'first': solution_first.replace(microsecond=0),
+        }
+        if solutions_total > 1:
+            solution_stats['last'] = solution_latest.replace(microsecond=0)
+        new_stats['solutions'] = solution_stats
+    return new_stats
+
+
+def _get_solution_aggregates():
+    solutions_count = Count(
+        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
+                  then=1),
+             output_field=IntegerField()))
+    solution_first = Min(
+        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
+                  then=F('created')),
+             output_field=DateTimeField()))
+    solution_latest = Max(
+        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
+                  then=F('created')),
+             output_field=DateTimeField()))
+    return solutions_count, solution_first, solution_latest
+
+
+def update_personal_assignments_execution_time(personal_assignment_ids: Iterable[int]) -> int:
+    """
+    Recalculates total execution time of solutions for the given personal
+    assignments in bulk. Returns the number of updated rows.
+    """
+    queryset = StudentAssignment.objects.filter(pk__in=list(personal_assignment_ids))
+    updated = StudentAssignment.update_derivable_fields(queryset, 'execution_time')
+    return updated['execution_time']
+
+
 def update_personal_assignment_stats(*, personal_assignment: StudentAssignment) -> None:
     """
     Calculates personal assignment stats and saves it in a `stats` property
@@ -47,19 +108,11 @@ def update_personal_assignment_stats(*, personal_assignment: StudentAssignment)
             },
             "activity": "sc",  // code of the latest activity
         }
+
+    Scans all published submissions of the personal assignment, use
+    `update_personal_assignment_stats_on_submission` to account for a new one.
     """
-    solutions_count = Count(
-        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
-                  then=1),
-             output_field=IntegerField()))
-    solution_first = Min(
-        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
-                  then=F('created')),
-             output_field=DateTimeField()))
-    solution_latest = Max(
-        Case(When(type=AssignmentSubmissionTypes.SOLUTION,
-                  then=F('created')),
-             output_field=DateTimeField()))
+    solutions_count, solution_first, solution_latest = _get_solution_aggregates()
     window = {
         'partition_by': [F('student_assignment_id')],
         'order_by': F('created').asc()
@@ -75,36 +128,134 @@ def update_personal_assignment_stats(*, personal_assignment: StudentAssignment)
     if latest_submission is None:
         return
 
-    if latest_submission.type == AssignmentSubmissionTypes.SOLUTION:
-        latest_activity = PersonalAssignmentActivity.SOLUTION
-    elif latest_submission.type == AssignmentSubmissionTypes.COMMENT:
-        is_student = latest_submission.author_id == personal_assignment.student_id
-        if is_student:
-            latest_activity = PersonalAssignmentActivity.STUDENT_COMMENT
-        else:
-            latest_activity = PersonalAssignmentActivity.TEACHER_COMMENT
-    else:
-        raise ValueError('Unknown submission type')
+    latest_activity = _get_submission_activity(latest_submission.type,
+                                               latest_submission.author_id,
+                                               personal_assignment.student_id)
     # Django 3.2 doesn't support partial update of the json field,
     # better to select_for_update
     meta = personal_assignment.meta or {}
-    new_stats = {'activity': str(latest_activity)}
-    comments_total = latest_submission.submissions_total - latest_submission.solutions_total
-    if comments_total:
-        new_stats['comments'] = comments_total
-    # Omit default or null values to save space
-    if latest_submission.solutions_total:
-        solution_stats = {
-            'count': latest_submission.solutions_total,
-            'first': latest_submission.solution_first.replace(microsecond=0),
-        }
-        if latest_submission.solutions_total > 1:
-            solution_stats['last'] = latest_submission.solution_latest.replace(microsecond=0)
-        new_stats['solutions'] = solution_stats
-    meta['stats'] = new_stats
+    meta['stats'] = _build_personal_assignment_stats(
+        activity=latest_activity,
+        submissions_total=latest_submission.submissions_total,
+        solutions_total=latest_submission.solutions_total,
+        solution_first=latest_submission.solution_first,
+        solution_latest=latest_submission.solution_latest)
     (StudentAssignment.objects
      .filter(pk=personal_assignment.pk)
-     .update(meta=meta))
+     .update(meta=meta, modified=get_now_utc()))
+
+
+_INCREMENT_COMMENT_STATS_SQL = """
+    UPDATE {table}
+       SET modified = %(modified)s,
+           meta = jsonb_set(meta, '{{stats}}', (meta -> 'stats') || jsonb_build_object(
+               'activity', %(activity)s::text,
+               'comments', COALESCE((meta #>> '{{stats,comments}}')::int, 0) + 1))
+     WHERE id = %(id)s AND meta -> 'stats' IS NOT NULL
+"""
+
+_INCREMENT_SOLUTION_STATS_SQL = """
+    UPDATE {table}
+       SET modified = %(modified)s,
+           meta = jsonb_set(meta, '{{stats}}', (meta -> 'stats') || jsonb_build_object(
+               'activity', %(activity)s::text,
+               'solutions', jsonb_strip_nulls(jsonb_build_object(
+                   'count', COALESCE((meta #>> '{{stats,solutions,count}}')::int, 0) + 1,
+                   'first', COALESCE(meta #> '{{stats,solutions,first}}', %(created)s::jsonb),
+                   'last', CASE WHEN meta #> '{{stats,solutions,first}}' IS NULL
+                                THEN NULL ELSE %(created)s::jsonb END))))
+     WHERE id = %(id)s AND meta -> 'stats' IS NOT NULL
+"""
+
+
+def update_personal_assignment_stats_on_submission(*, personal_assignment: StudentAssignment,
+                                                   submission: AssignmentComment) -> bool:
+    """
+    Applies a new published submission to the personal assignment stats
+    in place with a single UPDATE statement instead of rescanning
+    all submissions.
+
+    Returns False if stats were never calculated before, in that case
+    the caller should fall back to the full recalculation.
+    """
+    activity = _get_submission_activity(submission.type, submission.author_id,
+                                        personal_assignment.student_id)
+    if submission.type == AssignmentSubmissionTypes.SOLUTION:
+        sql = _INCREMENT_SOLUTION_STATS_SQL
+    else:
+        sql = _INCREMENT_COMMENT_STATS_SQL
+    table = connection.ops.quote_name(StudentAssignment._meta.db_table)
+    params = {
+        'id': personal_assignment.pk,
+        'modified': get_now_utc(),
+        'activity': str(activity),
+        'created': json.dumps(submission.created.replace(microsecond=0),
+                              cls=JSONEncoder),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(table=table), params)
+        return cursor.rowcount > 0
+
+
+def rebuild_personal_assignments_stats(queryset: QuerySet, *,
+                                       dry_run: bool = False) -> int:
+    """
+    Recalculates stats for all personal assignments of the queryset with
+    two grouped queries and returns the number of personal assignments
+    with outdated stats. Nothing is saved if `dry_run` is True.
+    """
+    solutions_count, solution_first, solution_latest = _get_solution_aggregates()
+    personal_assignments = {pk: (student_id, meta) for pk, student_id, meta in
+                            queryset.values_list('pk', 'student_id', 'meta')}
+    published = (AssignmentComment.published
+                 .filter(student_assignment_id__in=list(personal_assignments))
+                 .order_by())
+    totals = (published
+              .values('student_assignment_id')
+              .annotate(submissions_total=Count('*'),
+                        solutions_total=solutions_count,
+                        solution_first=solution_first,
+                        solution_latest=solution_latest))
+    latest_submissions = (published
+                          .order_by('student_assignment_id', '-created')
+                          .distinct('student_assignment_id')
+                          .values_list('student_assignment_id', 'type', 'author_id'))
+    latest_activity = {}
+    for personal_assignment_id, submission_type, author_id in latest_submissions:
+        student_id, _ = personal_assignments[personal_assignment_id]
+        latest_activity[personal_assignment_id] = _get_submission_activity(
+            submission_type, author_id, student_id)
+    outdated = []
+    for row in totals:
+        personal_assignment_id = row['student_assignment_id']
+        stats = _build_personal_assignment_stats(
+            activity=latest_activity[personal_assignment_id],
+            submissions_total=row['submissions_total'],
+            solutions_total=row['solutions_total'],
+            solution_first=row['solution_first'],
+            solution_latest=row['solution_latest'])
+        # Compare serialized values since stored stats hold strings
+        stats = json.loads(json.dumps(stats, cls=JSONEncoder))
+        _, meta = personal_assignments[personal_assignment_id]
+        meta = meta or {}
+        if meta.get('stats') != stats:
+            outdated.append(StudentAssignment(pk=personal_assignment_id,
+                                              meta={**meta, 'stats': stats},
+                                              modified=get_now_utc()))
+    if outdated and not dry_run:
+        StudentAssignment.objects.bulk_update(outdated, fields=['meta', 'modified'],
+                                              batch_size=1000)
+    return len(outdated)
+
+
+def _update_stats_on_new_submission(personal_assignment: StudentAssignment,
+                                   submission: AssignmentComment) -> None:
+    updated = update_personal_assignment_stats_on_submission(
+        personal_assignment=personal_assignment, submission=submission)
+    if not updated:
+        from learning.tasks import update_student_assignment_stats
+        update_stats = partial(enqueue_unique, update_student_assignment_stats, personal_assignment.pk)
+        transaction.on_commit(update_stats)
 
 
 def create_assignment_solution(*, personal_assignment: StudentAssignment,
@@ -136,9 +287,7 @@ def create_assignment_solution(*, personal_assignment: StudentAssignment,
                                  meta=meta,
                                  attached_file=attachment)
     solution.save()
-    from learning.tasks import update_student_assignment_stats
-    update_stats = partial(update_student_assignment_stats.delay, personal_assignment.pk)
-    transaction.on_commit(update_stats)
+    _update_stats_on_new_submission(personal_assignment, solution)
 
     return solution
 
@@ -194,10 +343,8 @@ def create_assignment_comment(*, personal_assignment: StudentAssignment,
             **meta
         }
     comment.save()
-
-    from learning.tasks import update_student_assignment_stats
-    update_stats = partial(update_student_assignment_stats.delay, personal_assignment.pk)
-    transaction.on_commit(update_stats)
+    if comment.is_published:
+        _update_stats_on_new_submission(personal_assignment, comment)
 
     return comment
 
@@ -247,9 +394,10 @@ def update_personal_assignment_score(*, student_assignment: StudentAssignment,
                               f"score {student_assignment.assignment.maximum_score}",
                               code="score_overflow")
 
+    now_utc = get_now_utc()
     updated = (StudentAssignment.objects
                .filter(pk=student_assignment.pk, score=score_old)
-               .update(score=score_new, score_changed=get_now_utc()))
+               .update(score=score_new, score_changed=now_utc, modified=now_utc))
     if not updated:
         return False, student_assignment
 
@@ -323,37 +471,87 @@ def create_personal_assignment_review(
     return comment
 
 
+def update_assignee_review_load(*, assignment_id: int,
+                                assignee_ids: Iterable[Optional[int]],
+                                create_missing: bool = True) -> None:
+    """
+    Recounts personal assignments of the assignment for each assignee and
+    stores result in the `AssigneeReviewLoad` counters.
+
+    Counter rows are locked before counting, this way concurrent
+    transactions updating the same assignee are applied one after another.
+    Set `create_missing=False` to update existing counters only.
+    """
+    assignee_ids = sorted({pk for pk in assignee_ids if pk is not None})
+    if not assignee_ids:
+        return
+    with transaction.atomic():
+        if create_missing:
+            counters = [AssigneeReviewLoad(assignment_id=assignment_id, assignee_id=pk)
+                        for pk in assignee_ids]
+            AssigneeReviewLoad.objects.bulk_create(counters, ignore_conflicts=True)
+        counters = list(AssigneeReviewLoad.objects
+                        .select_for_update()
+                        .filter(assignment_id=assignment_id,
+                                assignee_id__in=assignee_ids)
+                        .order_by('assignee_id'))
+        review_load = dict(StudentAssignment.objects
+                           .filter(assignment_id=assignment_id,
+                                   assignee_id__in=assignee_ids)
+                           .values('assignee_id')
+                           .annotate(total=Count('*'))
+                           .order_by()
+                           .values_list('assignee_id', 'total'))
+        for counter in counters:
+            counter.personal_assignments = review_load.get(counter.assignee_id, 0)
+        AssigneeReviewLoad.objects.bulk_update(counters, fields=['personal_assignments'])
+
+
 def calculate_teachers_overall_expected_load_in_bucket(bucket: StudentGroupTeacherBucket) -> dict:
     """
         For each teacher in a bucket calculates amount of expected load
          over all buckets in which teacher is.
         In all baskets in which the teacher is located, the expected load will be the same.
     """
-    candidates = list(t.id for t in bucket.teachers.only("teacher_id"))
-    related_buckets = (StudentGroupTeacherBucket.objects
-                       .filter(assignment=bucket.assignment_id,
-                               teachers__in=candidates)
-                       .distinct()
-                       .prefetch_related("groups", "teachers"))
+    BucketTeachers = StudentGroupTeacherBucket.teachers.through
+    BucketGroups = StudentGroupTeacherBucket.groups.through
+    buckets_teachers = defaultdict(list)
+    all_buckets_teachers = (BucketTeachers.objects
+                            .filter(studentgroupteacherbucket__assignment_id=bucket.assignment_id)
+                            .order_by('pk')
+                            .values_list('studentgroupteacherbucket_id', 'courseteacher_id'))
+    for bucket_id, teacher_id in all_buckets_teachers:
+        buckets_teachers[bucket_id].append(teacher_id)
+    candidates = set(buckets_teachers.get(bucket.pk, []))
+    related_buckets = [bucket_id for bucket_id, teachers in buckets_teachers.items()
+                       if candidates.intersection(teachers)]
+    buckets_groups = defaultdict(list)
+    related_buckets_groups = (BucketGroups.objects
+                              .filter(studentgroupteacherbucket_id__in=related_buckets)
+                              .order_by('pk')
+                              .values_list('studentgroupteacherbucket_id', 'studentgroup_id'))
+    for bucket_id, group_id in related_buckets_groups:
+        buckets_groups[bucket_id].append(group_id)
     student_group_field = "student__enrollment__student_group"
     # for each group calculate count of expected solutions
+    related_groups = [group_id for groups in buckets_groups.values() for group_id in groups]
     expected_groups_load = (StudentAssignment.objects
                             .filter(assignee__isnull=True,
                                     assignment=bucket.assignment_id,
                                     student__enrollment__is_deleted=False,
-                                    student__enrollment__student_group__buckets__in=related_buckets)
+                                    student__enrollment__student_group__in=related_groups)
                             .values(student_group_field)
                             .annotate(count=Count(student_group_field))
                             .order_by())
     expected_groups_load = {sa[student_group_field]: sa["count"] for sa in expected_groups_load}
     expected_teachers_loads = defaultdict(int)
-    for rel_bucket in related_buckets:
-        rel_bucket_teachers = rel_bucket.teachers.only("teacher_id")
-        for group in rel_bucket.groups.only("id"):
-            exp_group_load = expected_groups_load.get(group.id, 0)
-            for teacher in rel_bucket_teachers:
-                if teacher.id in candidates:
-                    expected_teachers_loads[teacher.id] += exp_group_load / len(rel_bucket_teachers)
+    for bucket_id in related_buckets:
+        rel_bucket_teachers = buckets_teachers[bucket_id]
+        for group_id in buckets_groups[bucket_id]:
+            exp_group_load = expected_groups_load.get(group_id, 0)
+            for teacher_id in rel_bucket_teachers:
+                if teacher_id in candidates:
+                    expected_teachers_loads[teacher_id] += exp_group_load / len(rel_bucket_teachers)
     return {k: v for k, v in expected_teachers_loads.items() if k in candidates}
 
 
@@ -369,15 +567,7 @@ def get_assignee_with_minimal_load(student_assignment: StudentAssignment) -> Lis
         logger.info(f"User {student_assignment.student_id} has left the course.")
         return []
     student_group_id = enrollment.student_group_id
-    assignees_load = (StudentAssignment.objects
-                      .filter(assignee__isnull=False,
-                              assignment=assignment)
-                      .values('assignee_id')
-                      .annotate(assignee_count=Count('assignee_id'))
-                      .order_by())
-    buckets = (StudentGroupTeacherBucket.objects
-               .filter(assignment=assignment)
-               .prefetch_related('groups', 'teachers'))
+    buckets = StudentGroupTeacherBucket.objects.filter(assignment=assignment)
     try:
         target_bucket = buckets.get(groups__in=[student_group_id])
     except StudentGroupTeacherBucket.DoesNotExist:
@@ -387,9 +577,12 @@ def get_assignee_with_minimal_load(student_assignment: StudentAssignment) -> Lis
         logger.error(f"Buckets are in inconsistent states.")
         raise
     teachers_load = calculate_teachers_overall_expected_load_in_bucket(target_bucket)
-    for sa in assignees_load:
-        if sa['assignee_id'] in teachers_load:
-            teachers_load[sa['assignee_id']] += sa['assignee_count']
+    assignees_load = (AssigneeReviewLoad.objects
+                      .filter(assignment=assignment,
+                              assignee_id__in=list(teachers_load))
+                      .values_list('assignee_id', 'personal_assignments'))
+    for assignee_id, personal_assignments in assignees_load:
+        teachers_load[assignee_id] += personal_assignments
     result = []
     if teachers_load:
         min_load_teacher_pk = min(teachers_load.items(), key=lambda item: item[1])[0]
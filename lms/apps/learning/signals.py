@@ -1,23 +1,36 @@
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django_rq import get_queue
 
 from courses.constants import AssignmentFormat
 from courses.models import (
-    Assignment, Course, CourseGroupModes, CourseNews, CourseTeacher,
-    StudentGroupTypes, CourseProgramBinding
+    Assignment, Course, CourseGroupModes, CourseNews, StudentGroupTypes,
+    CourseProgramBinding
 )
+from core.queues import enqueue_unique
 from learning.models import (
     AssignmentComment, AssignmentNotification, AssignmentSubmissionTypes,
-    CourseNewsNotification, Enrollment, StudentAssignment, StudentGroup
+    Enrollment, StudentAssignment, StudentGroup
 )
 from learning.services import StudentGroupService
-from learning.services.enrollment_service import update_course_learners_count
+from learning.services.enrollment_service import (
+    update_course_learners_count, update_passed_meta_courses_count
+)
 from learning.services.jba_service import JbaService
+from learning.services.personal_assignment_service import update_assignee_review_load
+from learning.study.services import invalidate_open_assignments_cache
 # FIXME: post_delete нужен? Что лучше - удалять StudentGroup + SET_NULL у Enrollment или делать soft-delete?
 # FIXME: группу лучше удалить, т.к. она будет предлагаться для новых заданий, хотя типа уже удалена.
-from learning.tasks import convert_assignment_submission_ipynb_file_to_html
-from notifications.tasks import send_assignment_notifications, send_course_news_notifications
+from learning.tasks import (
+    convert_assignment_submission_ipynb_file_to_html,
+    generate_course_news_notifications,
+    update_student_assignment_execution_time
+)
+from notifications.tasks import send_assignment_notifications
+from users.models import StudentProfile
 
 
 @receiver(post_save, sender=Course)
@@ -104,25 +117,45 @@ def compute_course_learners_count(sender, instance: Enrollment, created,
     update_course_learners_count(instance.course_id)
 
 
+@receiver(post_save, sender=Enrollment)
+def compute_passed_meta_courses_count(sender, instance: Enrollment,
+                                      *args, **kwargs):
+    update_passed_meta_courses_count([instance.student_id])
+
+
+@receiver(post_delete, sender=Enrollment)
+def compute_passed_meta_courses_count_on_delete(sender, instance: Enrollment,
+                                                *args, **kwargs):
+    update_passed_meta_courses_count([instance.student_id])
+
+
+@receiver(post_save, sender=CourseProgramBinding)
+def compute_passed_meta_courses_count_on_grading_system_change(
+        sender, instance: CourseProgramBinding, created, *args, **kwargs):
+    # Passing grade depends on the grading system of the binding
+    if created:
+        return
+    student_ids = (Enrollment.objects
+                   .filter(course_program_binding=instance)
+                   .values('student_id'))
+    update_passed_meta_courses_count(student_ids)
+
+
+@receiver(post_save, sender=StudentProfile)
+def compute_passed_meta_courses_count_for_new_profile(
+        sender, instance: StudentProfile, created, *args, **kwargs):
+    if created:
+        update_passed_meta_courses_count([instance.user_id])
+
+
 @receiver(post_save, sender=CourseNews)
 def create_notifications_about_course_news(sender, instance: CourseNews,
                                            created, *args, **kwargs):
     if not created:
         return
-    co_id = instance.course_id
-    notifications = []
-    active_enrollments = Enrollment.active.filter(course_id=co_id)
-    for e in active_enrollments.iterator():
-        notifications.append(
-            CourseNewsNotification(user_id=e.student_id,
-                                   course_offering_news_id=instance.pk))
-    teachers = CourseTeacher.objects.filter(course_id=co_id)
-    for co_t in teachers.iterator():
-        notifications.append(
-            CourseNewsNotification(user_id=co_t.teacher_id,
-                                   course_offering_news_id=instance.pk))
-    CourseNewsNotification.objects.bulk_create(notifications)
-    send_course_news_notifications.delay([x.id for x in notifications])
+    fan_out = partial(generate_course_news_notifications.delay,
+                      course_news_id=instance.pk)
+    transaction.on_commit(fan_out)
 
 
 @receiver(post_save, sender=Assignment)
@@ -175,6 +208,52 @@ def schedule_jba_progress_update_at_deadline(
     )
 
 
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def invalidate_open_assignments_on_assignment_change(sender, instance: Assignment,
+                                                     *args, **kwargs):
+    # Invalidate after commit, otherwise a concurrent request could cache
+    # the state before the transaction is committed
+    transaction.on_commit(partial(invalidate_open_assignments_cache,
+                                  course_id=instance.course_id))
+
+
+@receiver(post_save, sender=StudentAssignment)
+@receiver(post_delete, sender=StudentAssignment)
+def invalidate_open_assignments_on_personal_assignment_change(
+        sender, instance: StudentAssignment, *args, **kwargs):
+    transaction.on_commit(partial(invalidate_open_assignments_cache,
+                                  student_id=instance.student_id))
+
+
+@receiver(post_save, sender=StudentAssignment)
+def update_review_load_on_assignee_change(sender, instance: StudentAssignment,
+                                          created, *args, **kwargs):
+    if created:
+        assignee_ids = [instance.assignee_id]
+    elif instance.tracker.has_changed('assignee') or instance.tracker.has_changed('deleted_at'):
+        assignee_ids = [instance.tracker.previous('assignee'), instance.assignee_id]
+    else:
+        return
+    update_assignee_review_load(assignment_id=instance.assignment_id,
+                                assignee_ids=assignee_ids)
+
+
+@receiver(post_delete, sender=StudentAssignment)
+def update_review_load_on_delete(sender, instance: StudentAssignment,
+                                 *args, **kwargs):
+    if instance.assignee_id is None:
+        return
+    # Soft deletion and restoring of the record also send this signal.
+    # Do not create counters on hard delete since related assignment or
+    # course teacher could be deleted in the same transaction.
+    is_restored = (instance.deleted_at is None and
+                   StudentAssignment.base.filter(pk=instance.pk).exists())
+    update_assignee_review_load(assignment_id=instance.assignment_id,
+                                assignee_ids=[instance.assignee_id],
+                                create_missing=is_restored)
+
+
 @receiver(post_save, sender=AssignmentComment)
 def convert_ipynb_files(sender, instance: AssignmentComment, *args, **kwargs):
     # TODO: convert for solutions only? both?
@@ -186,13 +265,21 @@ def convert_ipynb_files(sender, instance: AssignmentComment, *args, **kwargs):
         convert_assignment_submission_ipynb_file_to_html.delay(**kwargs)
 
 
+def _schedule_execution_time_update(student_assignment_id: int) -> None:
+    # Solutions saved in a row are coalesced into a single recalculation
+    update_execution_time = partial(enqueue_unique,
+                                    update_student_assignment_execution_time,
+                                    student_assignment_id)
+    transaction.on_commit(update_execution_time)
+
+
 # TODO: move to the create_assignment_solution service method
 @receiver(post_save, sender=AssignmentComment)
 def save_student_solution(sender, instance: AssignmentComment, *args, **kwargs):
     """Updates aggregated execution time value on StudentAssignment model"""
     if instance.type != AssignmentSubmissionTypes.SOLUTION:
         return
-    instance.student_assignment.compute_fields('execution_time')
+    _schedule_execution_time_update(instance.student_assignment_id)
 
 
 @receiver(post_delete, sender=AssignmentComment)
@@ -201,4 +288,4 @@ def delete_student_solution(sender, instance: AssignmentComment,
     """Updates aggregated execution time value on StudentAssignment model"""
     if instance.type != AssignmentSubmissionTypes.SOLUTION:
         return
-    instance.student_assignment.compute_fields('execution_time')
+    _schedule_execution_time_update(instance.student_assignment_id)
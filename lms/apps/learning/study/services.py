@@ -1,5 +1,12 @@
-from typing import Optional
+import datetime
+import hashlib
+import uuid
+from typing import Iterable, List, Optional
 
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, Value, When
+
+from core.timezone import get_now_utc
 from core.urls import reverse
 from courses.constants import AssignmentFormat
 from courses.models import Semester
@@ -53,3 +60,73 @@ def get_current_semester_active_courses(student: User, current_term: Semester):
     return (Enrollment.active
             .filter(course__semester=current_term, student=student)
             .values_list("course", flat=True))
+
+
+OPEN_ASSIGNMENTS_CACHE_KEY = 'learning.study.open_assignments.{}'
+OPEN_ASSIGNMENTS_CACHE_TIMEOUT = 600
+ASSIGNMENT_LIST_VERSION_CACHE_KEY = 'learning.study.assignment_list.version.{}.{}'
+
+
+def invalidate_open_assignments_cache(*, student_id: Optional[int] = None,
+                                      course_id: Optional[int] = None) -> None:
+    """
+    Drops cached open assignments of the student or of all course
+    participants (e.g. on deadline change).
+    """
+    keys = []
+    if student_id is not None:
+        keys.append(ASSIGNMENT_LIST_VERSION_CACHE_KEY.format('student', student_id))
+    if course_id is not None:
+        keys.append(ASSIGNMENT_LIST_VERSION_CACHE_KEY.format('course', course_id))
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+
+
+def _get_open_assignments_cache_key(student: User, course_ids: List[int]) -> str:
+    version_keys = [ASSIGNMENT_LIST_VERSION_CACHE_KEY.format('student', student.pk)]
+    version_keys.extend(ASSIGNMENT_LIST_VERSION_CACHE_KEY.format('course', course_id)
+                        for course_id in course_ids)
+    versions = cache.get_many(version_keys)
+    missing = {key: uuid.uuid4().hex for key in version_keys if key not in versions}
+    if missing:
+        # Evicted version invalidates all dependent values
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    digest = hashlib.md5(" ".join(versions[key] for key in version_keys).encode())
+    return OPEN_ASSIGNMENTS_CACHE_KEY.format(f"{student.pk}.{digest.hexdigest()}")
+
+
+def get_open_personal_assignment_ids(queryset, student: User,
+                                     enrolled_in: Iterable[int]) -> List[int]:
+    """
+    Returns ids of open personal assignments of the student: the student is
+    enrolled in the course of the current term and the deadline hasn't
+    passed yet. Result is cached until the nearest deadline or until
+    personal assignments of the student or course assignments are changed.
+    """
+    course_ids = sorted(enrolled_in)
+    if not course_ids:
+        return []
+    cache_key = _get_open_assignments_cache_key(student, course_ids)
+    open_ids = cache.get(cache_key)
+    if open_ids is None:
+        is_open = Case(
+            When(assignment__deadline_at__gte=get_now_utc(),
+                 assignment__course_id__in=course_ids,
+                 then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField())
+        rows = (queryset
+                .alias(is_open=is_open)
+                .filter(is_open=True)
+                .values_list('pk', 'assignment__deadline_at'))
+        open_ids, deadlines = [], []
+        for pk, deadline_at in rows:
+            open_ids.append(pk)
+            deadlines.append(deadline_at)
+        timeout = OPEN_ASSIGNMENTS_CACHE_TIMEOUT
+        if deadlines:
+            expires_in = min(deadlines) - get_now_utc()
+            timeout = min(timeout, int(expires_in / datetime.timedelta(seconds=1)))
+        if timeout > 0:
+            cache.set(cache_key, open_ids, timeout)
+    return open_ids
@@ -13,11 +13,15 @@ from auth.mixins import PermissionRequiredMixin
 from core.timezone import get_now_utc
 from core.urls import reverse
 from courses.tests.factories import AssignmentFactory, CourseFactory, SemesterFactory, CourseProgramBindingFactory
+from courses.models import CourseGroupModes
 from courses.utils import get_current_term_pair
 from learning.permissions import ViewOwnStudentAssignments
-from learning.services import CourseRole, course_access_role
+from learning.services import CourseRole, StudentGroupService, course_access_role
+from learning.study.views import StudentAssignmentListView
 from learning.settings import GradeTypes, StudentStatuses
-from learning.tests.factories import EnrollmentFactory, StudentAssignmentFactory, AssignmentCommentFactory
+from learning.tests.factories import (
+    AssignmentCommentFactory, EnrollmentFactory, StudentAssignmentFactory, StudentGroupFactory
+)
 from users.services import get_student_profile
 from users.tests.factories import StudentFactory, StudentProfileFactory, TeacherFactory, InvitedStudentFactory, \
     UserFactory
@@ -206,7 +210,8 @@ def test_view_assignment_list_permissions(client, lms_resolver,
 
 @pytest.mark.parametrize('student_type', StudentTypes.values)
 @pytest.mark.django_db
-def test_view_assignment_list(client, student_type, program_cub001, program_run_cub):
+def test_view_assignment_list(client, student_type, program_cub001, program_run_cub,
+                              django_capture_on_commit_callbacks):
     url = reverse('study:assignment_list')
 
     student = StudentFactory(student_profile__type=student_type)
@@ -228,7 +233,8 @@ def test_view_assignment_list(client, student_type, program_cub001, program_run_
     assert len(response.context_data['assignment_list_open']) == 2
     assert len(response.context_data['assignment_list_archive']) == 0
     # Add more assignments to the course
-    assignments2 = AssignmentFactory.create_batch(3, course=course)
+    with django_capture_on_commit_callbacks(execute=True):
+        assignments2 = AssignmentFactory.create_batch(3, course=course)
     response = client.get(url)
     assert len(assignments1) + len(assignments2) == len(response.context_data['assignment_list_open'])
     assert {(StudentAssignment.objects.get(assignment=a, student=student))
@@ -236,8 +242,9 @@ def test_view_assignment_list(client, student_type, program_cub001, program_run_
     # Add assignments from the current semester with an expired deadline
     deadline_at = (datetime.datetime.now().replace(tzinfo=timezone.utc)
                    - datetime.timedelta(days=1))
-    as_olds = AssignmentFactory.create_batch(2, course=course,
-                                             deadline_at=deadline_at)
+    with django_capture_on_commit_callbacks(execute=True):
+        as_olds = AssignmentFactory.create_batch(2, course=course,
+                                                 deadline_at=deadline_at)
     response = client.get(url)
     for a in assignments1 + assignments2 + as_olds:
         assert smart_bytes(a.title) in response.content
@@ -295,6 +302,88 @@ def test_assignment_list_view_context_unenrolled_course(client, program_cub001,
     assert len(response.context_data['assignment_list_archive']) == 0
 
 
+@pytest.mark.django_db
+def test_assignment_list_view_open_assignments_cache(client, django_capture_on_commit_callbacks):
+    url = reverse('study:assignment_list')
+    student = StudentFactory()
+    course = CourseFactory(semester=SemesterFactory.create_current())
+    EnrollmentFactory(student=student, course=course)
+    assignment = AssignmentFactory(course=course)
+    personal_assignment = StudentAssignment.objects.get(assignment=assignment,
+                                                        student=student)
+    client.login(student)
+    response = client.get(url)
+    assert response.context_data['assignment_list_open'] == [personal_assignment]
+    # Deadline change invalidates cached open assignments
+    assignment.deadline_at = get_now_utc() - datetime.timedelta(days=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        assignment.save()
+    response = client.get(url)
+    assert response.context_data['assignment_list_open'] == []
+    assert response.context_data['assignment_list_archive'] == [personal_assignment]
+    assignment.deadline_at = get_now_utc() + datetime.timedelta(days=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        assignment.save()
+        new_assignment = AssignmentFactory(course=course)
+    response = client.get(url)
+    assert set(response.context_data['assignment_list_open']) == {
+        personal_assignment,
+        StudentAssignment.objects.get(assignment=new_assignment, student=student)
+    }
+    assert response.context_data['assignment_list_archive'] == []
+
+
+@pytest.mark.django_db
+def test_assignment_list_view_open_assignments_cache_group_transfer(
+        client, django_capture_on_commit_callbacks):
+    url = reverse('study:assignment_list')
+    student = StudentFactory()
+    course = CourseFactory(semester=SemesterFactory.create_current(),
+                           group_mode=CourseGroupModes.MANUAL)
+    student_group1, student_group2 = StudentGroupFactory.create_batch(2, course=course)
+    assignment = AssignmentFactory(course=course)
+    restricted_assignment = AssignmentFactory(course=course)
+    restricted_assignment.restricted_to.add(student_group2)
+    enrollment = EnrollmentFactory(student=student, course=course,
+                                   student_group=student_group1)
+    client.login(student)
+    response = client.get(url)
+    assert response.context_data['assignment_list_open'] == [
+        StudentAssignment.objects.get(assignment=assignment, student=student)
+    ]
+    # Personal assignments are created in bulk without `post_save` signal
+    with django_capture_on_commit_callbacks(execute=True):
+        StudentGroupService.transfer_students(source=student_group1,
+                                              destination=student_group2,
+                                              enrollments=[enrollment.pk])
+    response = client.get(url)
+    assert set(response.context_data['assignment_list_open']) == {
+        StudentAssignment.objects.get(assignment=assignment, student=student),
+        StudentAssignment.objects.get(assignment=restricted_assignment, student=student),
+    }
+
+
+@pytest.mark.django_db
+def test_assignment_list_view_open_assignments_truncated(client, mocker,
+                                                         django_capture_on_commit_callbacks):
+    mocker.patch.object(StudentAssignmentListView, 'open_assignments_limit', 1)
+    url = reverse('study:assignment_list')
+    student = StudentFactory()
+    course = CourseFactory(semester=SemesterFactory.create_current())
+    EnrollmentFactory(student=student, course=course)
+    AssignmentFactory(course=course)
+    client.login(student)
+    response = client.get(url)
+    assert len(response.context_data['assignment_list_open']) == 1
+    assert not response.context_data['assignment_list_open_is_truncated']
+    with django_capture_on_commit_callbacks(execute=True):
+        AssignmentFactory(course=course)
+    response = client.get(url)
+    assert len(response.context_data['assignment_list_open']) == 1
+    assert response.context_data['assignment_list_open_is_truncated']
+    assert "Only the first 1 open assignments are shown" in response.content.decode()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("learner_factory", [StudentFactory, InvitedStudentFactory])
 def test_view_deadline_l10n_on_student_assignment_list_page(learner_factory,
@@ -233,7 +233,7 @@ def test_view_solution_form_is_visible_by_default(client):
 
 
 @pytest.mark.django_db
-def test_view_student_assignment_add_solution(client):
+def test_view_student_assignment_add_solution(client, django_capture_on_commit_callbacks):
     student_profile = StudentProfileFactory()
     student = student_profile.user
     semester = SemesterFactory.create_current()
@@ -282,7 +282,8 @@ def test_view_student_assignment_add_solution(client):
         'solution-text': 'Test solution',
         'solution-execution_time': '1:12',
     }
-    response = client.post(create_solution_url, form_data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(create_solution_url, form_data)
     messages = list(get_messages(response.wsgi_request))
     assert len(messages) == 1
     assert 'success' in messages[0].tags
@@ -293,7 +294,8 @@ def test_view_student_assignment_add_solution(client):
         'solution-text': 'Fixes on test solution',
         'solution-execution_time': '0:34',
     }
-    response = client.post(create_solution_url, form_data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(create_solution_url, form_data)
     student_assignment.refresh_from_db()
     assert student_assignment.execution_time == timedelta(hours=1, minutes=46)
 
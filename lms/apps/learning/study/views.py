@@ -26,7 +26,6 @@ from courses.utils import MonthPeriod, extended_month_date_range, get_current_te
 from courses.views import MonthEventsCalendarView, WeekEventsView
 from info_blocks.constants import CurrentInfoBlockTags
 from info_blocks.models import InfoBlock
-from learning import utils
 from learning.calendar import get_all_calendar_events, get_student_calendar_events
 from learning.models import Enrollment, StudentAssignment
 from learning.permissions import (
@@ -40,7 +39,10 @@ from learning.services.personal_assignment_service import (
     get_assignment_update_history_message, get_draft_comment
 )
 from learning.study.forms import AssignmentCommentForm, StudentAssignmentListFilter
-from learning.study.services import get_solution_form, save_solution_form, get_current_semester_active_courses
+from learning.study.services import (
+    get_current_semester_active_courses, get_open_personal_assignment_ids,
+    get_solution_form, save_solution_form
+)
 from learning.views import AssignmentSubmissionBaseView
 from learning.views.views import (
     AssignmentCommentUpsertView, StudentAssignmentURLParamsMixin
@@ -101,22 +103,20 @@ class StudentAssignmentListView(PermissionRequiredMixin, TemplateView):
     """Shows assignments for the current term."""
     template_name = "lms/study/assignment_list.html"
     permission_required = ViewOwnStudentAssignments.name
+    open_assignments_limit = 200
+    archive_limit = 100
 
     def get_queryset(self, current_term):
         today = get_now_utc().date()
-        left_enrollments = Enrollment.objects.filter(
-            student=self.request.user,
-            is_deleted=True,
-            course__completed_at__gt=today
-        )
-        left_courses = [e.course_id for e in left_enrollments]
+        left_courses = (Enrollment.objects
+                        .filter(student=self.request.user,
+                                is_deleted=True,
+                                course__completed_at__gt=today)
+                        .values('course_id'))
         return (StudentAssignment.objects
                 .for_student(self.request.user)
                 .filter(assignment__course__completed_at__gt=today)
-                .exclude(assignment__course__pk__in=left_courses)
-                .order_by('assignment__deadline_at',
-                          'assignment__course__meta_course__name',
-                          'pk'))
+                .exclude(assignment__course__pk__in=left_courses))
 
     def get_context_data(self, filter_form: StudentAssignmentListFilter,
                          enrolled_in_courses: List[int],
@@ -125,22 +125,36 @@ class StudentAssignmentListView(PermissionRequiredMixin, TemplateView):
         filter_course = kwargs.get("course", None)
         filter_formats = kwargs.get("formats", [])
         filter_statuses = kwargs.get("statuses", [])
-        assignment_list = filter(
-            lambda sa:
-            (filter_course is None or sa.assignment.course_id == filter_course) and
-            (not filter_formats or sa.assignment.submission_type in filter_formats) and
-            (not filter_statuses or sa.status in filter_statuses),
-            self.get_queryset(current_term)
-        )
-        in_progress, archive = utils.split_on_condition(
-            assignment_list,
-            lambda sa: not sa.assignment.deadline_is_exceeded and
-                       sa.assignment.course_id in enrolled_in_courses)
-        archive.reverse()
+        queryset = self.get_queryset(current_term)
+        open_ids = get_open_personal_assignment_ids(queryset, student,
+                                                    enrolled_in_courses)
+        if filter_course is not None:
+            queryset = queryset.filter(assignment__course_id=filter_course)
+        if filter_formats:
+            queryset = queryset.filter(assignment__submission_type__in=filter_formats)
+        if filter_statuses:
+            queryset = queryset.filter(status__in=filter_statuses)
+        in_progress = list(queryset
+                           .filter(pk__in=open_ids)
+                           .order_by('assignment__deadline_at',
+                                     'assignment__course__meta_course__name',
+                                     'pk')
+                           [:self.open_assignments_limit + 1])
+        in_progress_is_truncated = len(in_progress) > self.open_assignments_limit
+        archive = list(queryset
+                       .exclude(pk__in=open_ids)
+                       .order_by('-assignment__deadline_at',
+                                 '-assignment__course__meta_course__name',
+                                 '-pk')
+                       [:self.archive_limit + 1])
+        archive_is_truncated = len(archive) > self.archive_limit
         context = {
             'filter_form': filter_form,
-            'assignment_list_open': in_progress,
-            'assignment_list_archive': archive,
+            'assignment_list_open': in_progress[:self.open_assignments_limit],
+            'assignment_list_open_is_truncated': in_progress_is_truncated,
+            'assignment_list_open_limit': self.open_assignments_limit,
+            'assignment_list_archive': archive[:self.archive_limit],
+            'assignment_list_archive_is_truncated': archive_is_truncated,
             'tz_override': student.time_zone,
             'ViewOwnStudentAssignment': ViewOwnStudentAssignment,
         }
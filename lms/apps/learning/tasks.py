@@ -1,14 +1,23 @@
 import logging
 from django_rq import job
 
-from files.utils import convert_ipynb_to_html
+from django.core.cache import cache
+
+from courses.models import CourseNews
+from files.utils import ConvertError, convert_ipynb_to_html
 from learning.models import AssignmentComment, StudentAssignment, SubmissionAttachment, AssignmentNotification
+from learning.services.notification_service import (
+    create_notifications_about_course_news
+)
 from learning.services.personal_assignment_service import (
-    update_personal_assignment_stats
+    update_personal_assignment_stats,
+    update_personal_assignments_execution_time
 )
 
 logger = logging.getLogger(__file__)
 
+IPYNB_CONVERSION_FAILED_CACHE_KEY = 'learning.ipynb_conversion_failed.{}'
+
 
 @job('default')
 def convert_assignment_submission_ipynb_file_to_html(*, assignment_submission_id):
@@ -17,18 +26,30 @@ def convert_assignment_submission_ipynb_file_to_html(*, assignment_submission_id
     except AssignmentComment.DoesNotExist:
         logger.debug(f"Submission with id={assignment_submission_id} not found")
         return
-    file_name = submission.attached_file.name + '.html'
-    # Actually it could be any file with the same name
-    file_field = SubmissionAttachment._meta.get_field('attachment')
-    if file_field.storage.exists(file_name):
+    converted = (SubmissionAttachment.objects
+                 .filter(submission=submission, attachment__endswith='.html')
+                 .exists())
+    if converted:
         return
-    html_source = convert_ipynb_to_html(submission.attached_file,
-                                        name=file_name)
-    if html_source is None:
+    file_name = submission.attached_file.name + '.html'
+    try:
+        converted_notebook = convert_ipynb_to_html(submission.attached_file,
+                                                   name=file_name)
+    except ConvertError as e:
+        logger.warning(f"Submission id={assignment_submission_id}: "
+                       f"failed to convert notebook: {e}")
+        converted_notebook = None
+    if converted_notebook is None:
         logger.debug("File not converted")
+        # Download view returns the source file from now on
+        cache_key = IPYNB_CONVERSION_FAILED_CACHE_KEY.format(assignment_submission_id)
+        cache.set(cache_key, True, timeout=60 * 60 * 24)
         return
+    logger.info(f"Submission id={assignment_submission_id}: notebook "
+                f"converted {converted_notebook.metrics}")
     submission_attachment = SubmissionAttachment(submission=submission,
-                                                 attachment=html_source)
+                                                 attachment=converted_notebook.content,
+                                                 meta={"conversion": converted_notebook.metrics})
     submission_attachment.save()
 
 
@@ -40,3 +61,20 @@ def update_student_assignment_stats(student_assignment_id: int) -> None:
     if not student_assignment:
         return
     update_personal_assignment_stats(personal_assignment=student_assignment)
+
+
+@job('default')
+def update_student_assignment_execution_time(student_assignment_id: int) -> None:
+    update_personal_assignments_execution_time([student_assignment_id])
+
+
+@job('default')
+def generate_course_news_notifications(*, course_news_id: int) -> int:
+    course_news = CourseNews.objects.filter(pk=course_news_id).first()
+    if course_news is None:
+        logger.debug(f"Course news with id={course_news_id} not found")
+        return 0
+    created = create_notifications_about_course_news(course_news)
+    logger.info(f"{created} notifications about course news "
+                f"id={course_news_id} were created")
+    return created
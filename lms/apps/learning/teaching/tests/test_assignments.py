@@ -172,7 +172,7 @@ def test_view_student_assignment_detail_update_score(client):
 
 
 @pytest.mark.django_db
-def test_create_assignment_public_form(client):
+def test_create_assignment_public_form(client, django_capture_on_commit_callbacks):
     """Create assignments for active enrollments only"""
     ss = StudentFactory.create_batch(3)
     current_semester = SemesterFactory.create_current()
@@ -198,7 +198,8 @@ def test_create_assignment_public_form(client):
     assert AssignmentNotification.objects.count() == enrolled_students
     CourseNewsNotification.objects.all().delete()
     assert CourseNewsNotification.objects.count() == 0
-    CourseNewsFactory.create(course=co)
+    with django_capture_on_commit_callbacks(execute=True):
+        CourseNewsFactory.create(course=co)
     assert CourseNewsNotification.objects.count() == enrolled_students
 
 
@@ -364,7 +364,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     response = client.get(csv_download_url)
     assert response.status_code == 200
     assert response['Content-Type'] == 'text/csv; charset=utf-8'
-    status_log_csv = response.content.decode('utf-8')
+    status_log_csv = response.getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert data == [table_headers]
 
@@ -373,13 +373,13 @@ def test_view_assignment_status_log_csv_online_assignments(client):
 
     # just student comment
     AssignmentCommentFactory(student_assignment=sa_one, author=student_one)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert data == [table_headers]
 
     AssignmentCommentFactory(student_assignment=sa_one, author=student_one,
                              type=AssignmentSubmissionTypes.SOLUTION)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_created_student1_row = [
         student_one.get_short_name(),
@@ -395,7 +395,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     # submission
     AssignmentCommentFactory(student_assignment=sa_two, author=student_two,
                              type=AssignmentSubmissionTypes.SOLUTION)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_created_student2_row = [
         student_two.get_short_name(),
@@ -420,7 +420,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=sa_one.status,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert len(data) == 3
     assert data[1][:-1] == expected_created_student1_row
@@ -437,7 +437,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=AssignmentStatus.NEED_FIXES,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_need_fixes_row = [
         student_one.get_short_name(),
@@ -464,7 +464,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=AssignmentStatus.COMPLETED,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = client.get(csv_download_url).getvalue().decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_completed_row = [
         student_two.get_short_name(),
@@ -479,3 +479,28 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     assert data[2][:-1] == expected_need_fixes_row
     assert data[3][:-1] == expected_created_student2_row
     assert data[4][:-1] == expected_completed_row
+
+
+@pytest.mark.django_db
+def test_view_course_status_log_csv(client):
+    teacher = TeacherFactory()
+    student = StudentFactory()
+    course = CourseFactory(teachers=[teacher])
+    EnrollmentFactory(course=course, student=student)
+    assignment1, assignment2 = AssignmentFactory.create_batch(
+        2, course=course, submission_type=AssignmentFormat.ONLINE)
+    AssignmentFactory(course=course, submission_type=AssignmentFormat.NO_SUBMIT)
+    for assignment in (assignment1, assignment2):
+        personal_assignment = StudentAssignment.objects.get(assignment=assignment)
+        AssignmentCommentFactory(student_assignment=personal_assignment, author=student,
+                                 type=AssignmentSubmissionTypes.SOLUTION)
+    url = reverse('teaching:course_status_log_csv', kwargs=course.url_kwargs)
+    client.login(student)
+    assert client.get(url).status_code == 403
+    client.login(teacher)
+    response = client.get(url)
+    assert response.status_code == 200
+    data = [s for s in csv.reader(io.StringIO(response.getvalue().decode('utf-8'))) if s]
+    assert len(data) == 3
+    assert [row[2] for row in data[1:]] == [assignment1.title, assignment2.title]
+    assert all(row[5] == 'Solution submitted for review' for row in data[1:])
@@ -15,7 +15,7 @@ from learning.teaching.views import TimetableView as TeacherTimetable
 from learning.teaching.views.assignments import (
     AssignmentCheckQueueView, AssignmentCommentUpdateView, AssignmentDetailView,
     AssignmentDownloadSolutionAttachmentsView, StudentAssignmentCommentCreateView,
-    StudentAssignmentDetailView, AssignmentStatusLogCSVView
+    StudentAssignmentDetailView, AssignmentStatusLogCSVView, CourseStatusLogCSVView
 )
 from learning.teaching.views.student_groups import (
     StudentGroupCreateView, StudentGroupDeleteView, StudentGroupDetailView,
@@ -56,7 +56,8 @@ urlpatterns = [
         re_path(RE_COURSE_URI, include([
             path('students/', include([
                 path('<int:enrollment_id>/', CourseStudentProgressView.as_view(), name='student-progress'),
-            ]))
+            ])),
+            path('export/status-changes', CourseStatusLogCSVView.as_view(), name='course_status_log_csv'),
         ])),
         # TODO: separate api views?
         path("news/<int:news_pk>/stats", CourseNewsUnreadNotificationsView.as_view(), name="course_news_unread"),
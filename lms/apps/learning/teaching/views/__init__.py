@@ -1,5 +1,4 @@
-from decimal import Decimal
-from typing import Any, Dict, Iterable
+from typing import Any, Dict
 
 from vanilla import TemplateView
 
@@ -8,7 +7,6 @@ from django.shortcuts import get_object_or_404
 from django.views import generic
 
 from auth.mixins import PermissionRequiredMixin
-from core.db.utils import normalize_score
 from core.exceptions import Redirect
 from core.http import HttpRequest
 from courses.calendar import TimetableEvent
@@ -23,7 +21,9 @@ from learning.calendar import get_all_calendar_events, get_teacher_calendar_even
 from learning.gradebook.views import GradeBookListBaseView
 from learning.models import Enrollment, StudentAssignment
 from learning.permissions import AccessTeacherSection, CreateCourseNews, ViewEnrollment
-from learning.selectors import get_teacher_classes
+from learning.selectors import (
+    StudentProgress, get_course_students_progress, get_teacher_classes
+)
 from learning.teaching.utils import get_student_groups_url
 from users.mixins import TeacherOnlyMixin
 
@@ -119,16 +119,6 @@ class GradeBookListView(TeacherOnlyMixin, GradeBookListBaseView):
         return context
 
 
-# FIXME: accept enrollment argument and do prefetch_related inside?
-# FIXME: enrollment.get_student_assignments?
-def _get_total_score(student_assignments: Iterable[StudentAssignment]) -> Decimal:
-    total_score = Decimal(0)
-    for s in student_assignments:
-        if s is not None and s.final_score is not None:
-            total_score += s.weighted_final_score
-    return normalize_score(total_score)
-
-
 class CourseStudentProgressView(CourseURLParamsMixin, PermissionRequiredMixin,
                                 TemplateView):
     enrollment: Enrollment
@@ -148,14 +138,18 @@ class CourseStudentProgressView(CourseURLParamsMixin, PermissionRequiredMixin,
         return self.enrollment
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        student_id = self.enrollment.student_profile.user_id
         student_assignments = (StudentAssignment.objects
-                               .filter(student=self.enrollment.student_profile.user,
+                               .filter(student_id=student_id,
                                        assignment__course=self.course)
                                .select_related('assignment', 'assignee__teacher'))
+        progress = get_course_students_progress(self.course, student_ids=[student_id])
+        progress = progress.get(student_id, StudentProgress(student_id))
         # TODO: enrollment.total_score
-        self.enrollment.total_score = _get_total_score(student_assignments)
+        self.enrollment.total_score = progress.weighted_total_score
         context = {
             "enrollment": self.enrollment,
+            "progress": progress,
             "student_assignments": student_assignments
         }
         return context
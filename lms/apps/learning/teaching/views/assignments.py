@@ -1,4 +1,3 @@
-import csv
 import datetime
 import os.path
 import tempfile
@@ -23,8 +22,9 @@ from core import comment_persistence
 from core.api.fields import CharSeparatedField
 from core.exceptions import Redirect
 from core.http import HttpRequest
+from core.reports import csv_streaming_response
 from core.urls import reverse
-from core.utils import bucketize, render_markdown
+from core.utils import bucketize
 from courses.constants import AssignmentStatus, AssignmentFormat
 from courses.models import Assignment, Course, CourseTeacher
 from courses.permissions import DeleteAssignment, EditAssignment, ViewAssignment
@@ -32,6 +32,7 @@ from courses.selectors import (
     assignments_list, course_teachers_prefetch_queryset, get_course_teachers
 )
 from courses.services import CourseService
+from courses.views.mixins import CourseURLParamsMixin
 from learning.forms import AssignmentModalCommentForm, AssignmentReviewForm
 from learning.models import (
     AssignmentComment, AssignmentSubmissionTypes, Enrollment, StudentAssignment
@@ -40,6 +41,7 @@ from learning.permissions import (
     CreateAssignmentComment, DownloadAssignmentSolutions, EditStudentAssignment,
     ViewStudentAssignment, ViewStudentAssignmentList, ViewOwnStudentAssignment
 )
+from learning.reports import AssignmentStatusLog
 from learning.selectors import get_enrollment, get_teacher_not_spectator_courses
 from learning.services import AssignmentService
 from learning.services.personal_assignment_service import (
@@ -159,7 +161,7 @@ class AssignmentCommentUpdateView(generic.UpdateView):
 
     def form_valid(self, form):
         self.object = form.save()
-        html = render_markdown(self.object.text)
+        html = self.object.get_html('text')
         return JsonResponse({"success": 1,
                              "id": self.object.pk,
                              "html": html})
@@ -244,54 +246,26 @@ class AssignmentStatusLogCSVView(PermissionRequiredMixin, generic.DetailView):
         assignment = self.get_object()
         if assignment.submission_type != AssignmentFormat.ONLINE:
             return HttpResponseBadRequest()
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
         filename = f"{datetime.date.today()}-status-changes_pk-{assignment.pk}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        writer = csv.writer(response)
-        headers = [
-            "student",
-            "student_id",
-            "task",
-            "comment_author",
-            "comment_author_id",
-            "action",
-            "comment_posted_ISO"
-        ]
-        writer.writerow(headers)
+        comments = AssignmentComment.objects.filter(student_assignment__assignment=assignment)
+        rows = AssignmentStatusLog().generate(comments)
+        return csv_streaming_response(rows, filename)
+
+
+class CourseStatusLogCSVView(PermissionRequiredMixin, CourseURLParamsMixin,
+                             generic.base.View):
+    """Status transitions log of all online assignments of the course"""
+    permission_required = ViewAssignment.name
+
+    def get_permission_object(self):
+        return self.course
+
+    def get(self, request, *args, **kwargs):
+        filename = f"{datetime.date.today()}-status-changes_course-{self.course.pk}.csv"
         comments = (AssignmentComment.objects
-                    .filter(is_published=True,
-                            student_assignment__assignment=assignment)
-                    .select_related('author',
-                                    'student_assignment__student')
-                    .order_by('student_assignment__student', 'created'))
-        for comment in comments:
-            title = assignment.title
-            student = comment.student_assignment.student
-            comment_author = comment.author
-            created = comment.created.isoformat()
-            action_text = None
-            if not isinstance(comment.meta, dict) or \
-                'status' not in comment.meta or 'status_old' not in comment.meta:
-                continue
-            is_comment_from_student = comment_author == student
-            is_publish_online_solution = is_comment_from_student and \
-                                         assignment.submission_type == AssignmentFormat.ONLINE and \
-                                         comment.meta['status'] == AssignmentStatus.ON_CHECKING
-            is_status_changed_on_needfixes = comment.meta['status'] != comment.meta['status_old'] and \
-                                             comment.meta['status'] == AssignmentStatus.NEED_FIXES
-            is_status_changed_on_completed = comment.meta['status'] != comment.meta['status_old'] and \
-                                             comment.meta['status'] == AssignmentStatus.COMPLETED
-            if is_status_changed_on_completed:
-                action_text = 'Grade updated'
-            elif is_publish_online_solution:
-                action_text = 'Solution submitted for review'
-            elif is_status_changed_on_needfixes:
-                action_text = 'New comment received from reviewer'
-            if action_text is not None:
-                writer.writerow([student.get_short_name(), student.pk, title,
-                                 comment_author.get_short_name(), comment_author.pk,
-                                 action_text, created])
-        return response
+                    .filter(student_assignment__assignment__course=self.course))
+        rows = AssignmentStatusLog().generate(comments)
+        return csv_streaming_response(rows, filename)
 
 
 class StudentAssignmentDetailView(PermissionRequiredMixin,
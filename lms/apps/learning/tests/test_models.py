@@ -20,6 +20,9 @@ from learning.models import (
     AssignmentComment, AssignmentNotification, AssignmentSubmissionTypes,
     StudentAssignment, StudentGroup, Enrollment
 )
+from learning.services.personal_assignment_service import (
+    update_personal_assignments_execution_time
+)
 from learning.tests.factories import (
     AssignmentCommentFactory, AssignmentNotificationFactory,
     CourseNewsNotificationFactory, EnrollmentFactory,
@@ -222,23 +225,30 @@ def test_learning_space_full_name():
 
 
 @pytest.mark.django_db
-def test_student_assignment_execution_time():
+def test_student_assignment_execution_time(django_capture_on_commit_callbacks):
     student_assignment = StudentAssignmentFactory()
-    solution1 = AssignmentCommentFactory(student_assignment=student_assignment,
-                                         type=AssignmentSubmissionTypes.SOLUTION,
-                                         execution_time=timedelta(hours=2))
-    solution2 = AssignmentCommentFactory(student_assignment=student_assignment,
-                                         type=AssignmentSubmissionTypes.SOLUTION,
-                                         execution_time=timedelta(minutes=3))
-    # Doesn't take into account even if an exec time has been provided
-    comment1 = AssignmentCommentFactory(student_assignment=student_assignment,
-                                        type=AssignmentSubmissionTypes.COMMENT,
-                                        execution_time=timedelta(hours=2))
-    # student_assignment.compute_fields("execution_time")
+    with django_capture_on_commit_callbacks(execute=True):
+        solution1 = AssignmentCommentFactory(student_assignment=student_assignment,
+                                             type=AssignmentSubmissionTypes.SOLUTION,
+                                             execution_time=timedelta(hours=2))
+        solution2 = AssignmentCommentFactory(student_assignment=student_assignment,
+                                             type=AssignmentSubmissionTypes.SOLUTION,
+                                             execution_time=timedelta(minutes=3))
+        # Doesn't take into account even if an exec time has been provided
+        comment1 = AssignmentCommentFactory(student_assignment=student_assignment,
+                                            type=AssignmentSubmissionTypes.COMMENT,
+                                            execution_time=timedelta(hours=2))
+    student_assignment.refresh_from_db()
     assert student_assignment.execution_time == timedelta(hours=2, minutes=3)
     # Recalculate on removing solution through admin interface
-    solution2.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        solution2.delete()
+    student_assignment.refresh_from_db()
     assert student_assignment.execution_time == timedelta(hours=2)
+    solution1.delete()
+    update_personal_assignments_execution_time([student_assignment.pk])
+    student_assignment.refresh_from_db()
+    assert student_assignment.execution_time is None
 
 
 @pytest.mark.django_db
@@ -345,3 +355,34 @@ def test_course_delete_with_existing_enrollments():
         course.delete()
     with pytest.raises(ProtectedError):
         binding.delete()
+
+
+@pytest.mark.django_db
+def test_student_assignment_update_derivable_fields():
+    student_assignment1, student_assignment2 = StudentAssignmentFactory.create_batch(2)
+    AssignmentCommentFactory(student_assignment=student_assignment1,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(minutes=5))
+    # Make values stale
+    queryset = (StudentAssignment.objects
+                .filter(pk__in=[student_assignment1.pk, student_assignment2.pk])
+                .order_by('pk'))
+    queryset.update(execution_time=timedelta(hours=1))
+    stale = StudentAssignment.update_derivable_fields(queryset, 'execution_time',
+                                                      check=True)
+    assert stale == {'execution_time': 2}
+    assert all(sa.execution_time == timedelta(hours=1) for sa in queryset)
+    progress = []
+    stale = StudentAssignment.update_derivable_fields(
+        queryset, 'execution_time', chunk_size=1,
+        progress=lambda processed, total: progress.append((processed, total)))
+    assert stale == {'execution_time': 2}
+    assert progress == [(1, 2), (2, 2)]
+    student_assignment1.refresh_from_db()
+    assert student_assignment1.execution_time == timedelta(minutes=5)
+    student_assignment2.refresh_from_db()
+    assert student_assignment2.execution_time is None
+    # Values are up to date
+    stale = StudentAssignment.update_derivable_fields(queryset, 'execution_time',
+                                                      check=True)
+    assert stale == {'execution_time': 0}
@@ -16,6 +16,9 @@ from learning.models import AssignmentNotification, CourseNewsNotification, Stud
 from learning.services.enrollment_service import (
     EnrollmentService, is_course_failed_by_student
 )
+from learning.services.notification_service import (
+    create_notifications_about_course_news
+)
 from learning.settings import StudentStatuses
 from learning.tests.factories import EnrollmentFactory, StudentAssignmentFactory, AssignmentNotificationFactory, \
     CourseNewsNotificationFactory, AssignmentCommentFactory
@@ -324,6 +327,26 @@ def test_new_course_news_notification_context(settings):
     assert context['course_link'] == build_absolute_url(course.get_absolute_url(), settings)
 
 
+@pytest.mark.django_db
+def test_create_notifications_about_course_news():
+    teacher1, teacher2 = TeacherFactory.create_batch(2)
+    course = CourseFactory(teachers=[teacher1, teacher2])
+    enrollments = EnrollmentFactory.create_batch(3, course=course)
+    EnrollmentFactory(course=course, is_deleted=True)
+    EnrollmentFactory()
+    news = CourseNewsFactory(course=course)
+    CourseNewsNotification.objects.all().delete()
+    mail.outbox = []
+    created = create_notifications_about_course_news(news)
+    assert created == 5
+    notified = set(CourseNewsNotification.objects
+                   .filter(course_offering_news=news, is_unread=True)
+                   .values_list('user_id', flat=True))
+    expected = {teacher1.pk, teacher2.pk, *(e.student_id for e in enrollments)}
+    assert notified == expected
+    assert len(mail.outbox) == 5
+
+
 @pytest.mark.django_db
 def test_change_assignment_comment(settings):
     """Don't send notification on editing assignment comment"""
@@ -410,11 +433,12 @@ def test_remove_assignment_notifications_on_leaving_course(settings):
 
 
 @pytest.mark.django_db
-def test_remove_course_news_notifications_on_leaving_course(settings):
+def test_remove_course_news_notifications_on_leaving_course(settings, django_capture_on_commit_callbacks):
     course = CourseFactory()
     other_course = CourseFactory()
     enrollment = EnrollmentFactory(course=course)
-    CourseNewsFactory(course=course)
+    with django_capture_on_commit_callbacks(execute=True):
+        CourseNewsFactory(course=course)
     cn = CourseNewsNotificationFactory(course_offering_news__course=other_course)
     assert CourseNewsNotification.objects.count() == 2
     EnrollmentService.leave(enrollment)
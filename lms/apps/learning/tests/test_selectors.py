@@ -1,9 +1,19 @@
+from decimal import Decimal
+
 import pytest
 
+from courses.constants import AssignmentFormat, AssignmentStatus
 from courses.models import CourseTeacher
-from courses.tests.factories import CourseFactory, CourseTeacherFactory
-from learning.selectors import get_teacher_not_spectator_courses
-from users.tests.factories import TeacherFactory
+from courses.tests.factories import (
+    AssignmentFactory, CourseFactory, CourseTeacherFactory, SemesterFactory
+)
+from learning.models import StudentAssignment
+from learning.selectors import (
+    StudentProgress, get_course_students_progress, get_students_stats,
+    get_teacher_not_spectator_courses
+)
+from learning.tests.factories import EnrollmentFactory
+from users.tests.factories import StudentFactory, TeacherFactory
 
 
 @pytest.mark.django_db
@@ -39,3 +49,74 @@ def test_get_teacher_not_spectator_courses():
 
     courses = get_teacher_not_spectator_courses(teacher_three)
     assert not len(courses)
+
+
+@pytest.mark.django_db
+def test_get_course_students_progress():
+    course = CourseFactory()
+    student_one, student_two, student_three = StudentFactory.create_batch(3)
+    for student in (student_one, student_two, student_three):
+        EnrollmentFactory(course=course, student=student)
+    assignment_one = AssignmentFactory(course=course, weight=Decimal('0.5'),
+                                       maximum_score=10)
+    assignment_two = AssignmentFactory(course=course, maximum_score=10)
+    assignment_penalty = AssignmentFactory(course=course, maximum_score=10,
+                                           submission_type=AssignmentFormat.PENALTY)
+    (StudentAssignment.objects
+     .filter(student=student_one, assignment=assignment_one)
+     .update(score=5, penalty=1, status=AssignmentStatus.COMPLETED))
+    (StudentAssignment.objects
+     .filter(student=student_one, assignment=assignment_two)
+     .update(score=3))
+    (StudentAssignment.objects
+     .filter(student=student_one, assignment=assignment_penalty)
+     .update(score=2))
+    (StudentAssignment.objects
+     .filter(student=student_two, assignment=assignment_two)
+     .update(penalty=Decimal('1.5')))
+    progress = get_course_students_progress(course)
+    assert progress[student_one.pk] == StudentProgress(
+        student_id=student_one.pk,
+        total_score=Decimal(7),
+        weighted_total_score=Decimal(4),
+        assignments_count=3,
+        graded_count=3,
+        completed_count=1)
+    assert progress[student_two.pk].total_score == Decimal('1.5')
+    assert progress[student_two.pk].graded_count == 1
+    assert progress[student_three.pk] == StudentProgress(student_three.pk, assignments_count=3)
+    # Same as the sum of weighted final scores
+    for student_id, student_progress in progress.items():
+        personal_assignments = (StudentAssignment.objects
+                                .filter(student_id=student_id)
+                                .select_related('assignment'))
+        weighted_total = sum(s.weighted_final_score for s in personal_assignments
+                             if s.final_score is not None)
+        assert student_progress.weighted_total_score == weighted_total
+    progress = get_course_students_progress(course, student_ids=[student_one.pk],
+                                            assignment_ids=[assignment_one.pk])
+    assert list(progress) == [student_one.pk]
+    assert progress[student_one.pk].weighted_total_score == 3
+
+
+@pytest.mark.django_db
+def test_get_students_stats():
+    student1, student2, student3 = StudentFactory.create_batch(3)
+    course1, course2 = CourseFactory.create_batch(2)
+    next_term = SemesterFactory.create_next(course1.semester)
+    course3 = CourseFactory(meta_course=course1.meta_course, semester=next_term)
+    EnrollmentFactory(course=course1, student=student1, grade=4)
+    EnrollmentFactory(course=course2, student=student1, grade=1)
+    EnrollmentFactory(course=course3, student=student1, grade=4)
+    EnrollmentFactory(course=course3, student=student2, grade=1)
+    stats = get_students_stats(next_term, [student1.pk, student2.pk, student3.pk])
+    assert stats[student1.pk]['passed']['total'] == 1
+    assert stats[student1.pk]['passed']['center_courses'] == {course1.meta_course_id}
+    assert stats[student1.pk]['failed']['total'] == 1
+    assert stats[student1.pk]['in_term']['total'] == 1
+    assert stats[student1.pk]['in_term']['passed'] == 1
+    assert stats[student2.pk]['passed']['total'] == 0
+    assert stats[student2.pk]['in_term']['courses'] == {course1.meta_course_id}
+    assert stats[student2.pk]['in_term']['failed'] == 1
+    assert stats[student3.pk]['in_term']['total'] == 0
+    assert student1.stats(next_term) == stats[student1.pk]
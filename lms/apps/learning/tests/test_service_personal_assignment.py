@@ -12,7 +12,7 @@ from courses.constants import AssigneeMode, AssignmentFormat, AssignmentStatus
 from courses.models import CourseGroupModes, CourseTeacher
 from courses.tests.factories import AssignmentFactory, CourseFactory, CourseTeacherFactory, CourseProgramBindingFactory
 from learning.models import (
-    AssignmentComment, AssignmentSubmissionTypes, Enrollment,
+    AssigneeReviewLoad, AssignmentComment, AssignmentSubmissionTypes, Enrollment,
     PersonalAssignmentActivity, StudentAssignment, StudentGroupTeacherBucket
 )
 from learning.services import EnrollmentService, StudentGroupService
@@ -21,7 +21,8 @@ from learning.services.personal_assignment_service import (
     create_personal_assignment_review, resolve_assignees_for_personal_assignment,
     update_personal_assignment_score, update_personal_assignment_stats,
     update_personal_assignment_status, get_assignee_with_minimal_load,
-    calculate_teachers_overall_expected_load_in_bucket
+    calculate_teachers_overall_expected_load_in_bucket,
+    rebuild_personal_assignments_stats
 )
 from learning.settings import AssignmentScoreUpdateSource
 from learning.tests.factories import (
@@ -155,6 +156,65 @@ def test_service_update_personal_assignment_stats_published(django_capture_on_co
     assert solutions_stats['last'] == fixed_dt.replace(microsecond=0)
 
 
+@pytest.mark.django_db
+def test_service_update_personal_assignment_stats_incrementally(django_capture_on_commit_callbacks):
+    curator = CuratorFactory()
+    student_assignment = StudentAssignmentFactory()
+    student = student_assignment.student
+    with django_capture_on_commit_callbacks(execute=True):
+        create_assignment_comment(personal_assignment=student_assignment,
+                                  is_draft=False, created_by=student,
+                                  message='Comment1 message')
+    student_assignment.refresh_from_db()
+    assert student_assignment.stats == {
+        'activity': PersonalAssignmentActivity.STUDENT_COMMENT,
+        'comments': 1
+    }
+    # Stats exist, new submissions are applied in place without the full
+    # recalculation on commit
+    solution1 = create_assignment_solution(personal_assignment=student_assignment,
+                                           created_by=student, message="solution1")
+    create_assignment_comment(personal_assignment=student_assignment,
+                              is_draft=False, created_by=curator,
+                              message='Comment2 message')
+    solution2 = create_assignment_solution(personal_assignment=student_assignment,
+                                           created_by=student, message="solution2")
+    student_assignment.refresh_from_db()
+    stats = student_assignment.stats
+    assert stats['activity'] == PersonalAssignmentActivity.SOLUTION
+    assert stats['comments'] == 2
+    assert stats['solutions']['count'] == 2
+    assert stats['solutions']['first'] == solution1.created.replace(microsecond=0)
+    assert stats['solutions']['last'] == solution2.created.replace(microsecond=0)
+    queryset = StudentAssignment.objects.filter(pk=student_assignment.pk)
+    assert rebuild_personal_assignments_stats(queryset, dry_run=True) == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_personal_assignments_stats():
+    student_assignment1, student_assignment2 = StudentAssignmentFactory.create_batch(2)
+    AssignmentCommentFactory(student_assignment=student_assignment1,
+                             author=student_assignment1.student,
+                             type=AssignmentSubmissionTypes.SOLUTION)
+    AssignmentCommentFactory(student_assignment=student_assignment2,
+                             type=AssignmentSubmissionTypes.COMMENT)
+    StudentAssignment.objects.update(meta=None)
+    queryset = StudentAssignment.objects.all()
+    assert rebuild_personal_assignments_stats(queryset, dry_run=True) == 2
+    student_assignment1.refresh_from_db()
+    assert student_assignment1.meta is None
+    assert rebuild_personal_assignments_stats(queryset) == 2
+    assert rebuild_personal_assignments_stats(queryset, dry_run=True) == 0
+    student_assignment1.refresh_from_db()
+    assert student_assignment1.stats['activity'] == PersonalAssignmentActivity.SOLUTION
+    assert student_assignment1.stats['solutions']['count'] == 1
+    student_assignment2.refresh_from_db()
+    assert student_assignment2.stats == {
+        'activity': PersonalAssignmentActivity.TEACHER_COMMENT,
+        'comments': 1
+    }
+
+
 @pytest.mark.django_db
 def test_maybe_set_assignee_for_personal_assignment_already_assigned():
     """Don't overwrite assignee if someone was set before student activity."""
@@ -1240,3 +1300,41 @@ def test_get_assignee_with_minial_load_assignment_load_independency():
     # Independency check in both directions
     assignee_a2_sa1 = get_assignee_with_minimal_load(sg1_a2_sa)[0]
     assert assignee_a2_sa1 == teachers[1]
+
+
+@pytest.mark.django_db
+def test_assignee_review_load_counters():
+    course, teachers, student_groups, buckets = create_buckets_testing_environment(
+        group_sizes=[3],
+        buckets_structs={
+            (0,): {0, 1},
+        }
+    ).values()
+    assignment = buckets[0].assignment
+
+    def get_review_load():
+        return dict(AssigneeReviewLoad.objects
+                    .filter(assignment=assignment)
+                    .values_list('assignee_id', 'personal_assignments'))
+
+    assert get_review_load() == {}
+    sa1, sa2, sa3 = StudentAssignment.objects.filter(assignment=assignment).order_by('pk')
+    sa1.assignee = teachers[0]
+    sa1.save()
+    sa2.assignee = teachers[0]
+    sa2.save()
+    assert get_review_load() == {teachers[0].pk: 2}
+    # Change assignee
+    sa2.assignee = teachers[1]
+    sa2.save()
+    assert get_review_load() == {teachers[0].pk: 1, teachers[1].pk: 1}
+    # Soft delete and restore
+    sa1.delete()
+    assert get_review_load() == {teachers[0].pk: 0, teachers[1].pk: 1}
+    sa1.restore()
+    assert get_review_load() == {teachers[0].pk: 1, teachers[1].pk: 1}
+    # Counters affect assignee selection
+    assert get_assignee_with_minimal_load(sa3) == [teachers[0]]
+    sa2.delete(permanent=True)
+    assert get_review_load() == {teachers[0].pk: 1, teachers[1].pk: 0}
+    assert get_assignee_with_minimal_load(sa3) == [teachers[1]]
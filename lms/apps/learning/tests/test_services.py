@@ -15,13 +15,16 @@ from learning.models import (
     AssignmentNotification, Enrollment, StudentAssignment, StudentGroup, EnrollmentGradeLog
 )
 from learning.services import AssignmentService
-from learning.services.enrollment_service import update_enrollment_grade
+from learning.services.enrollment_service import (
+    rebuild_passed_meta_courses_count, update_enrollment_grade
+)
 from learning.services.notification_service import generate_notifications_about_new_submission
 from learning.settings import StudentStatuses, GradeTypes, EnrollmentGradeUpdateSource
 from learning.tests.factories import (
     AssignmentCommentFactory, AssignmentNotificationFactory, EnrollmentFactory,
     StudentAssignmentFactory, StudentGroupAssigneeFactory
 )
+from users.models import StudentProfile
 from users.tests.factories import StudentProfileFactory, StudentFactory, CuratorFactory, TeacherFactory
 
 
@@ -458,3 +461,35 @@ def test_update_enrollment_grade_concurrency():
     assert enrollment.grade == 5  # db values has been changed
     logs = EnrollmentGradeLog.objects.all()
     assert logs.count() == 2
+
+
+@pytest.mark.django_db
+def test_update_enrollment_grade_passed_meta_courses_count():
+    curator = CuratorFactory()
+    student_profile = StudentProfileFactory()
+    enrollment = EnrollmentFactory(student=student_profile.user,
+                                   student_profile=student_profile,
+                                   grade=GradeTypes.NOT_GRADED)
+    student_profile.refresh_from_db()
+    assert student_profile.passed_meta_courses_count == 0
+    update_enrollment_grade(enrollment=enrollment,
+                            old_grade=enrollment.grade,
+                            new_grade=GradeTypes.GOOD,
+                            editor=curator,
+                            source=EnrollmentGradeUpdateSource.GRADEBOOK)
+    student_profile.refresh_from_db()
+    assert student_profile.passed_meta_courses_count == 1
+    # Value is shared by all profiles of the student
+    other_profile = StudentProfileFactory(user=student_profile.user)
+    assert StudentProfile.objects.get(pk=other_profile.pk).passed_meta_courses_count == 1
+    enrollment.delete()
+    student_profile.refresh_from_db()
+    assert student_profile.passed_meta_courses_count == 0
+    # Rebuild outdated values
+    StudentProfile.objects.filter(pk=student_profile.pk).update(passed_meta_courses_count=3)
+    queryset = StudentProfile.objects.filter(user=student_profile.user)
+    assert rebuild_passed_meta_courses_count(queryset, dry_run=True) == 1
+    assert rebuild_passed_meta_courses_count(queryset) == 1
+    student_profile.refresh_from_db()
+    assert student_profile.passed_meta_courses_count == 0
+    assert rebuild_passed_meta_courses_count(queryset) == 0
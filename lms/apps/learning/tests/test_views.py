@@ -1,6 +1,7 @@
 import datetime
 import logging
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.forms import ValidationError
 import pytest
 from bs4 import BeautifulSoup
@@ -19,6 +20,7 @@ from courses.models import CourseTeacher
 from courses.tests.factories import *
 from courses.tests.factories import CourseProgramBindingFactory
 from learning.invitation.views import create_invited_profile
+from learning.models import SubmissionAttachment
 from learning.permissions import ViewEnrollment
 from learning.settings import StudentStatuses
 from learning.tests.factories import *
@@ -390,3 +392,59 @@ def test_ask_enrollment_reason(client):
     assert 'reason' in response.context_data['form'].helper.layout
     response = client.post(unenroll_url)
     assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_assignment_comment_attachment_download_ipynb_as_html(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    student_assignment = StudentAssignmentFactory(assignment__course=course)
+    notebook = b'{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}'
+    comment = AssignmentCommentFactory(
+        student_assignment=student_assignment,
+        attached_file=SimpleUploadedFile("solution.ipynb", notebook))
+    client.login(teacher)
+    url = f"{comment.get_attachment_download_url()}?html=1"
+    # Notebook is converted in the background after the comment is created
+    submission_attachment = SubmissionAttachment.objects.get(submission=comment)
+    assert submission_attachment.meta['conversion']['source_size'] == len(notebook)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'].endswith('.html')
+    assert 'Content-Disposition' not in response
+    # Conversion is enqueued if the html version is missing
+    SubmissionAttachment.objects.filter(submission=comment).delete()
+    response = client.get(url)
+    assert response.status_code == 202
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'].endswith('.html')
+    # Source file
+    response = client.get(comment.get_attachment_download_url())
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'].endswith('.ipynb')
+    assert response['Content-Disposition'].startswith('attachment')
+
+
+@pytest.mark.django_db
+def test_assignment_comment_attachment_download_ipynb_conversion_failed(client, settings):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    student_assignment = StudentAssignmentFactory(assignment__course=course)
+    client.login(teacher)
+    # Malformed notebook fails inside the conversion process
+    comment = AssignmentCommentFactory(
+        student_assignment=student_assignment,
+        attached_file=SimpleUploadedFile("solution.ipynb", b'{"cells": 1}'))
+    assert not SubmissionAttachment.objects.filter(submission=comment).exists()
+    # Source file is returned instead of waiting for the html version
+    response = client.get(f"{comment.get_attachment_download_url()}?html=1")
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'].endswith('.ipynb')
+    # Limits are read on conversion
+    settings.IPYNB_CONVERSION_MAX_SIZE = 10
+    notebook = b'{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}'
+    comment = AssignmentCommentFactory(
+        student_assignment=student_assignment,
+        attached_file=SimpleUploadedFile("solution.ipynb", notebook))
+    assert not SubmissionAttachment.objects.filter(submission=comment).exists()
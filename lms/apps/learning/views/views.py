@@ -5,8 +5,10 @@ from typing import Optional
 from vanilla import GenericModelView, TemplateView
 
 from django.contrib import messages
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Prefetch
+from django.db.models.fields.files import FieldFile
 from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views import generic
@@ -28,6 +30,9 @@ from learning.permissions import (
 )
 from learning.services.personal_assignment_service import create_assignment_comment
 from learning.study.forms import AssignmentCommentForm
+from learning.tasks import (
+    IPYNB_CONVERSION_FAILED_CACHE_KEY, convert_assignment_submission_ipynb_file_to_html
+)
 from users.mixins import TeacherOnlyMixin
 
 logger = logging.getLogger(__name__)
@@ -187,6 +192,27 @@ class AssignmentCommentAttachmentDownloadView(ProtectedFileDownloadView):
     def get_permission_object(self):
         return self.protected_object.student_assignment
 
+    def get_html_file(self, file_field: FieldFile) -> Optional[FieldFile]:
+        submission_attachment = (SubmissionAttachment.objects
+                                 .filter(submission=self.protected_object,
+                                         attachment__endswith='.html')
+                                 .order_by('-pk')
+                                 .first())
+        if submission_attachment is None:
+            return None
+        return submission_attachment.attachment
+
+    def schedule_html_conversion(self, file_field: FieldFile) -> bool:
+        failed_key = IPYNB_CONVERSION_FAILED_CACHE_KEY.format(self.protected_object.pk)
+        if cache.get(failed_key):
+            return False
+        # Prevents flooding the queue with page refreshes
+        lock_key = f"learning.ipynb_conversion.{self.protected_object.pk}"
+        if cache.add(lock_key, True, timeout=60):
+            convert_assignment_submission_ipynb_file_to_html.delay(
+                assignment_submission_id=self.protected_object.pk)
+        return True
+
 
 class AssignmentSubmissionAttachmentDownloadView(ProtectedFileDownloadView):
     """Download file attached to the SubmissionAttachment model"""
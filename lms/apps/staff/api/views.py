@@ -1,11 +1,11 @@
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
+from api.pagination import CountFreeLimitOffsetPagination, CountModes
 from api.permissions import CuratorAccessPermission
 from auth.mixins import RolePermissionRequiredMixin
 from core.api.serializers import AcademicProgramRunSerializer
@@ -15,13 +15,14 @@ from users.filters import StudentFilter
 from users.models import StudentProfile
 
 
-class StudentOffsetPagination(LimitOffsetPagination):
+class StudentOffsetPagination(CountFreeLimitOffsetPagination):
     default_limit = 500
 
 
 class StudentSearchJSONView(ListAPIView):
     permission_classes = [CuratorAccessPermission]
     pagination_class = StudentOffsetPagination
+    pagination_count_mode = CountModes.CACHED
     filter_backends = (DjangoFilterBackend,)
     filterset_class = StudentFilter
 
@@ -5,9 +5,10 @@ import pytest
 from core.models import University
 from core.tests.factories import AcademicProgramRunFactory, LegacyUniversityFactory
 from core.urls import reverse
-from courses.tests.factories import SemesterFactory
+from courses.tests.factories import CourseFactory, SemesterFactory
+from learning.tests.factories import EnrollmentFactory
 from users.models import StudentProfile
-from users.tests.factories import CuratorFactory, StudentProfileFactory
+from users.tests.factories import CuratorFactory, StudentFactory, StudentProfileFactory
 
 
 @pytest.mark.django_db
@@ -79,3 +80,27 @@ def test_view_student_faces(client):
     search(university_2, 2023, {student_profile_2023_2})
     search(university_2, 2024, set())
     search(university_2, 2025, {student_profile_2025})
+
+
+@pytest.mark.django_db
+def test_view_course_participants_intersection(client):
+    course1, course2, course3 = CourseFactory.create_batch(3)
+    student1, student2, student3 = StudentFactory.create_batch(3)
+    for course in (course1, course2, course3):
+        EnrollmentFactory(course=course, student=student1)
+    for course in (course1, course2):
+        EnrollmentFactory(course=course, student=student2)
+    EnrollmentFactory(course=course3, student=student3)
+    client.login(CuratorFactory())
+    url = reverse("staff:course_participants_intersection")
+    query = urlencode({"course_offerings[]": [course1.pk, course2.pk, course3.pk]}, doseq=True)
+    response = client.get(f"{url}?{query}")
+    assert response.status_code == 200
+    assert [row[0] for row in response.context_data["intersection"]] == [student1.pk]
+    assert response.context_data["union_size"] == 3
+    assert response.context_data["overlap_counts"] == [(3, 1), (2, 1), (1, 1)]
+    response = client.get(f"{url}?{query}&format=csv&min_courses=2")
+    assert response.status_code == 200
+    rows = response.getvalue().decode("utf-8").splitlines()
+    assert len(rows) == 3
+    assert {int(row.split(",")[0]) for row in rows[1:]} == {student1.pk, student2.pk}
@@ -1,7 +1,6 @@
 import datetime
 
 from django.conf import settings
-from django.db.models import Prefetch
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
@@ -13,24 +12,29 @@ from vanilla import TemplateView
 
 import core.utils
 from core.models import University, AcademicProgram
-from core.reports import dataframe_to_response
+from core.reports import csv_streaming_response, dataframe_to_response
 from core.urls import reverse
 from courses.constants import SemesterTypes
 from courses.models import Course, Semester
 from courses.utils import get_current_term_pair
 from learning.gradebook.views import GradeBookListBaseView
-from learning.models import Enrollment, Invitation
+from learning.models import Invitation
 from learning.reports import (
     ProgressReportForInvitation,
     ProgressReportForSemester,
     ProgressReportFull,
 )
+from learning.selectors import (
+    get_course_participants_overlap, get_course_participants_overlap_counts
+)
 from learning.settings import StudentStatuses
 from staff.filters import EnrollmentInvitationFilter, StudentProfileFilter
 from staff.models import Hint
 from users.filters import StudentFilter
+from users.constants import ThumbnailSizes
 from users.mixins import CuratorOnlyMixin
 from users.models import StudentProfile, StudentTypes
+from users.thumbnails import get_users_thumbnails
 
 
 class StudentSearchCSVView(CuratorOnlyMixin, BaseFilterView):
@@ -201,9 +205,14 @@ class StudentFacesView(CuratorOnlyMixin, TemplateView):
         return self.render_to_response(context)
 
     def get_context_data(self, filter_set: FilterSet, **kwargs):
+        users = [x.user for x in filter_set.qs]
+        thumbnails = None
+        if "print" not in self.request.GET:
+            thumbnails = get_users_thumbnails(users, ThumbnailSizes.SQUARE)
         context = {
             "filter_form": filter_set.form,
-            "users": [x.user for x in filter_set.qs],
+            "users": users,
+            "thumbnails": thumbnails,
             "StudentStatuses": StudentStatuses,
         }
         return context
@@ -218,48 +227,73 @@ class StudentFacesView(CuratorOnlyMixin, TemplateView):
 
 
 class CourseParticipantsIntersectionView(CuratorOnlyMixin, generic.TemplateView):
+    """
+    Shows students enrolled in all the selected courses. Add `format=csv`
+    to download students enrolled in at least `min_courses` of them.
+    """
     template_name = "staff/courses_intersection.html"
 
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "csv":
+            return self.get_csv_response()
+        return super().get(request, *args, **kwargs)
+
+    def get_selected_courses(self):
+        query_courses = self.request.GET.getlist("course_offerings[]", [])
+        query_courses = [int(t) for t in query_courses if t]
+        return list(Course.objects
+                    .filter(pk__in=query_courses)
+                    .select_related("meta_course")
+                    .order_by("meta_course__name"))
+
+    @staticmethod
+    def get_participants(courses, min_courses: int):
+        course_ids = [c.pk for c in courses]
+        return (get_course_participants_overlap(course_ids)
+                .filter(courses__gte=min_courses)
+                .values_list("student_id", "student__last_name",
+                             "student__first_name", "student__username",
+                             "courses")
+                .order_by("student__last_name", "student__first_name",
+                          "student_id"))
+
+    def get_csv_response(self):
+        courses = self.get_selected_courses()
+        try:
+            min_courses = int(self.request.GET.get("min_courses", len(courses)))
+        except ValueError:
+            return HttpResponseBadRequest()
+        if not courses:
+            return HttpResponseBadRequest()
+        headers = ["id", "last_name", "first_name", "username", "courses"]
+        participants = self.get_participants(courses, min_courses=max(min_courses, 1))
+        rows = (headers, *participants.iterator())
+        filename = f"{datetime.date.today()}-course-participants-overlap.csv"
+        return csv_streaming_response(rows, filename)
+
     def get_context_data(self, **kwargs):
         term_pair = get_current_term_pair()
         all_courses_in_term = Course.objects.filter(
             semester__index=term_pair.index
         ).select_related("meta_course")
-        # Get participants
-        query_courses = self.request.GET.getlist("course_offerings[]", [])
-        query_courses = [int(t) for t in query_courses if t]
-        results = list(
-            Course.objects.filter(pk__in=query_courses)
-            .select_related("meta_course")
-            .prefetch_related(
-                Prefetch(
-                    "enrollment_set",
-                    queryset=(
-                        Enrollment.active.select_related("student").only(
-                            "pk",
-                            "course_id",
-                            "student_id",
-                            "student__username",
-                            "student__first_name",
-                            "student__last_name"
-                        )
-                    ),
-                )
-            )
-        )
-        if len(results) > 1:
-            first_course, second_course = (
-                {e.student_id for e in co.enrollment_set.all()} for co in results
-            )
-            intersection = first_course.intersection(second_course)
-        else:
-            intersection = set()
+        courses = self.get_selected_courses()
+        intersection = []
+        overlap_counts = []
+        union_size = 0
+        if len(courses) > 1:
+            # Number of students by the number of selected courses they attend
+            course_ids = [c.pk for c in courses]
+            overlap_counts = list(get_course_participants_overlap_counts(course_ids))
+            union_size = sum(students for _, students in overlap_counts)
+            intersection = list(self.get_participants(courses, min_courses=len(courses)))
         context = {
             "course_offerings": all_courses_in_term,
             "intersection": intersection,
+            "overlap_counts": overlap_counts,
+            "union_size": union_size,
             "current_term": "{} {}".format(_(term_pair.type), term_pair.year),
-            "results": results,
-            "query": {"course_offerings": query_courses},
+            "results": courses,
+            "query": {"course_offerings": [c.pk for c in courses]},
         }
         return context
 
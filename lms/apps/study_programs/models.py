@@ -92,7 +92,7 @@ class StudyProgram(TimeStampedModel):
         """Returns all core courses sorted by name"""
         return (MetaCourse.objects
                 .filter(studyprogramcoursegroup__in=self.course_groups.all())
-                .defer("description", "created", "modified"))
+                .defer("description", "description_html", "created", "modified"))
 
 
 class StudyProgramCourseGroup(models.Model):
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_alter_task_task_params"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("processed_at__isnull", True)),
+                fields=["created"],
+                name="tasks_unprocessed_idx",
+            ),
+        ),
+    ]
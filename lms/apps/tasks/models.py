@@ -2,13 +2,13 @@ import json
 import logging
 from datetime import timedelta
 from hashlib import sha1
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from model_utils.fields import AutoLastModifiedField
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.utils import formats, timezone
 
@@ -42,6 +42,37 @@ class TaskManager(models.Manager):
         locked = Q(locked_by__isnull=False) | Q(locked_at__gte=expires_at)
         return qs.filter(locked)
 
+    def claim(self, worker_id: str, limit: int = 1) -> List["Task"]:
+        """
+        Locks up to `limit` unprocessed tasks for the worker. Rows already
+        locked by a concurrent transaction are skipped, so several workers
+        can drain the table without waiting on each other.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            candidates = (self.unlocked(now)
+                          .filter(processed_at__isnull=True)
+                          .select_for_update(skip_locked=True)
+                          .order_by('created')
+                          .values_list('pk', flat=True))
+            task_ids = list(candidates[:limit])
+            if not task_ids:
+                return []
+            (self.get_queryset()
+             .filter(pk__in=task_ids)
+             .update(locked_by=worker_id, locked_at=now, modified=now))
+        return list(self.get_queryset()
+                    .filter(pk__in=task_ids)
+                    .order_by('created'))
+
+    def complete_many(self, tasks: Iterable["Task"], error: str = '') -> int:
+        """Marks tasks as processed with a single UPDATE statement."""
+        now = timezone.now()
+        task_ids = [t.pk for t in tasks]
+        return (self.get_queryset()
+                .filter(pk__in=task_ids, processed_at__isnull=True)
+                .update(processed_at=now, modified=now, error=error))
+
     def get_task(self, task_name, kwargs=None):
         kwargs = kwargs or {}
         task_params = {k: v for k, v in sorted(kwargs.items())}
@@ -92,6 +123,13 @@ class Task(models.Model):
 
     class Meta:
         db_table = 'tasks'
+        indexes = [
+            # Supports `TaskManager.claim`: only the tail of unprocessed
+            # tasks ordered by creation time is scanned
+            models.Index(fields=['created'],
+                         condition=Q(processed_at__isnull=True),
+                         name='tasks_unprocessed_idx'),
+        ]
 
     def __str__(self):
         return u'{}'.format(self.verbose_name or self.task_name)
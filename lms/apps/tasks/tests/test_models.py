@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+import pytest
+
+from django.utils import timezone
+
+from tasks.models import Task
+
+
+def _create_tasks(count):
+    now = timezone.now()
+    tasks = []
+    for i in range(count):
+        task = Task.build("tasks.test", kwargs={"i": i})
+        task.save()
+        tasks.append(task)
+    # Creation order is the reverse of the primary key order
+    for i, task in enumerate(tasks):
+        Task.objects.filter(pk=task.pk).update(created=now - timedelta(minutes=i))
+    return list(reversed(tasks))
+
+
+@pytest.mark.django_db
+def test_task_manager_claim():
+    task1, task2, task3, task4 = _create_tasks(4)
+    claimed = Task.objects.claim("worker1", limit=2)
+    assert [t.pk for t in claimed] == [task1.pk, task2.pk]
+    assert all(t.locked_by == "worker1" and t.locked_at for t in claimed)
+    # Locked and processed tasks are skipped
+    Task.objects.filter(pk=task3.pk).update(processed_at=timezone.now())
+    claimed = Task.objects.claim("worker2", limit=10)
+    assert [t.pk for t in claimed] == [task4.pk]
+    assert Task.objects.claim("worker3") == []
+
+
+@pytest.mark.django_db
+def test_task_manager_claim_expired_lock():
+    task1, task2 = _create_tasks(2)
+    Task.objects.claim("worker1", limit=2)
+    expired_at = timezone.now() - timedelta(seconds=Task.MAX_RUN_TIME + 1)
+    Task.objects.filter(pk=task2.pk).update(locked_at=expired_at)
+    claimed = Task.objects.claim("worker2", limit=2)
+    assert [t.pk for t in claimed] == [task2.pk]
+    assert claimed[0].locked_by == "worker2"
+
+
+@pytest.mark.django_db
+def test_task_manager_complete_many():
+    task1, task2, task3 = _create_tasks(3)
+    processed_at = timezone.now() - timedelta(days=1)
+    Task.objects.filter(pk=task3.pk).update(processed_at=processed_at)
+    assert Task.objects.complete_many([task1, task2, task3], error="Failed") == 2
+    task1.refresh_from_db()
+    assert task1.is_failed
+    task3.refresh_from_db()
+    assert task3.processed_at == processed_at
+    assert task3.error == ""
+    assert Task.objects.complete_many([task1]) == 0
@@ -1,11 +1,12 @@
-from django.db.models import Case, Count, F, Q, Value, When
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
 from django.forms import SelectMultiple
 from django_filters.fields import MultipleChoiceField
 from django_filters.rest_framework import CharFilter, FilterSet
 
 from core.filters import CharInFilter, NumberInFilter
-from learning.settings import StudentStatuses, GradingSystems
-from users.models import StudentProfile
+from learning.settings import StudentStatuses
+from users.models import NAME_SEARCH_CONFIG, StudentProfile, get_name_search_vector
 
 
 class SelectMultipleCSVSupport(SelectMultiple):
@@ -34,15 +35,10 @@ class MultipleChoiceCSVField(MultipleChoiceField):
     widget = SelectMultipleCSVSupport
 
 
-def replace_single_quotes(column_name):
-    """Returns `replace` postgres function call that removes single quotes"""
-    return f"replace({column_name}, '''', '')"
-
-
 class StudentFilter(FilterSet):
     ENROLLMENTS_MAX = 12
 
-    _lexeme_trans_map = dict((ord(c), None) for c in '*|&:')
+    _lexeme_trans_map = dict((ord(c), None) for c in '*|&:!()<>\\')
 
     name = CharFilter(method='name_filter')
     profile_types = CharInFilter(field_name='type')
@@ -77,20 +73,10 @@ class StudentFilter(FilterSet):
         except ValueError:
             return queryset
 
-        passing_grade = GradingSystems.get_passing_grade_expr('user__enrollment')
-        queryset = queryset.annotate(
-            courses_total=
-            # Remove unsuccessful grades, then distinctly count by pk
-            Count(Case(
-                When(user__enrollment__grade__lt=passing_grade,
-                     then=Value(None)),
-                default=F("user__enrollment__course__meta_course_id")
-            ), distinct=True)
-        )
-        condition = Q(courses_total__in=[v for v in value_list
-                                         if v <= self.ENROLLMENTS_MAX])
+        condition = Q(passed_meta_courses_count__in=[v for v in value_list
+                                                     if v <= self.ENROLLMENTS_MAX])
         if any(value > self.ENROLLMENTS_MAX for value in value_list):
-            condition |= Q(courses_total__gt=self.ENROLLMENTS_MAX)
+            condition |= Q(passed_meta_courses_count__gt=self.ENROLLMENTS_MAX)
         return queryset.filter(condition)
 
     def status_filter(self, queryset, name, value):
@@ -106,22 +92,22 @@ class StudentFilter(FilterSet):
         tsquery = self._form_name_tsquery(qstr)
         if tsquery is None:
             return queryset
-        else:
-            tsvector_text = (f"{replace_single_quotes('users_user.first_name')}"
-                             f" || ' ' || "
-                             f"{replace_single_quotes('users_user.last_name')}")
-            qs = (queryset
-                  .extra(where=[f"to_tsvector({tsvector_text}) @@ to_tsquery({replace_single_quotes('%s')})"],
-                         params=[tsquery])
-                  .exclude(user__first_name__exact='',
-                           user__last_name__exact=''))
-            return qs
+        # The expression must match `users_user_name_search_idx`
+        search_query = SearchQuery(tsquery, config=NAME_SEARCH_CONFIG,
+                                   search_type='raw')
+        qs = (queryset
+              .alias(name_search=get_name_search_vector(prefix='user__'))
+              .filter(name_search=search_query)
+              .exclude(user__first_name__exact='',
+                       user__last_name__exact=''))
+        return qs
 
     def _form_name_tsquery(self, qstr):
         if qstr is None or not (2 <= len(qstr) < 100):
             return
         lexems = []
-        for s in qstr.split(' '):
+        # Single quote splits words in the same way as the tsvector parser does
+        for s in qstr.replace("'", ' ').split(' '):
             lexeme = s.translate(self._lexeme_trans_map).strip()
             if len(lexeme) > 0:
                 lexems.append(lexeme)
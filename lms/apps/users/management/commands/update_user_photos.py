@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from users.models import User
+from users.tasks import warmup_user_thumbnails
+
+
+class Command(BaseCommand):
+    help = ("Stores dimensions of user photos uploaded before they were "
+            "saved on upload. With --thumbnails also enqueues generation "
+            "of photo thumbnails of all sizes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', default=False,
+                            help='Re-read dimensions of all photos')
+        parser.add_argument('--batch-size', dest='batch_size', type=int,
+                            default=100, help='Users per query or job')
+        parser.add_argument('--thumbnails', action='store_true', default=False,
+                            help='Enqueue thumbnails generation')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = User.objects.exclude(photo='').order_by('pk')
+        queryset = users
+        if not options['all']:
+            queryset = queryset.filter(Q(photo_width__isnull=True) |
+                                       Q(photo_height__isnull=True))
+        user_ids = list(queryset.values_list('pk', flat=True))
+        updated, failed = 0, 0
+        for i in range(0, len(user_ids), batch_size):
+            batch = (User.objects
+                     .filter(pk__in=user_ids[i:i + batch_size])
+                     .only('pk', 'photo'))
+            objects = []
+            for user in batch:
+                try:
+                    user.photo_width = user.photo.width
+                    user.photo_height = user.photo.height
+                except (IOError, OSError):
+                    failed += 1
+                    continue
+                objects.append(user)
+            User.objects.bulk_update(objects, ['photo_width', 'photo_height'])
+            updated += len(objects)
+        self.stdout.write(f"Photo dimensions updated: {updated}, failed: {failed}")
+        if options['thumbnails']:
+            user_ids = list(users.values_list('pk', flat=True))
+            for i in range(0, len(user_ids), batch_size):
+                warmup_user_thumbnails.delay(user_ids=user_ids[i:i + batch_size])
+            self.stdout.write(f"Thumbnails generation enqueued for "
+                              f"{len(user_ids)} users")
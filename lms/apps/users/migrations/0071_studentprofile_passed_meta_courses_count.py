@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from learning.settings import GradingSystems
+
+
+def populate_passed_meta_courses_count(apps, schema_editor):
+    Enrollment = apps.get_model("learning", "Enrollment")
+    StudentProfile = apps.get_model("users", "StudentProfile")
+    passing_grade = GradingSystems.get_passing_grade_expr()
+    passed_meta_course = Case(
+        When(grade__lt=passing_grade, then=Value(None)),
+        default=F("course__meta_course_id"),
+    )
+    total = Coalesce(Subquery(
+        Enrollment.objects
+        .filter(student_id=OuterRef("user_id"))
+        .order_by()
+        .values("student_id")
+        .annotate(total=Count(passed_meta_course, distinct=True))
+        .values("total")
+    ), Value(0))
+    StudentProfile.objects.update(passed_meta_courses_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0062_assigneereviewload"),
+        ("users", "0070_user_name_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentprofile",
+            name="passed_meta_courses_count",
+            field=models.PositiveSmallIntegerField(
+                db_index=True, default=0, editable=False, verbose_name="Passed Courses"
+            ),
+        ),
+        migrations.RunPython(populate_passed_meta_courses_count,
+                             reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0071_studentprofile_passed_meta_courses_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="photo_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="photo_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -9,11 +9,14 @@ from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import AnonymousUser, PermissionsMixin, _user_has_perm
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.encoding import force_bytes, smart_str
 from django.utils.functional import cached_property
@@ -58,6 +61,19 @@ TELEGRAM_USERNAME_VALIDATOR = RegexValidator(regex=TELEGRAM_REGEX)
 # single hyphens, and cannot begin or end with a hyphen
 GITHUB_LOGIN_VALIDATOR = RegexValidator(regex="^[a-zA-Z0-9](-?[a-zA-Z0-9])*$")
 
+# Names are not stemmed, also the config must be explicit to make
+# `to_tsvector` immutable and the expression indexable
+NAME_SEARCH_CONFIG = 'simple'
+
+
+def get_name_search_vector(prefix: str = '') -> SearchVector:
+    """
+    Returns full name search vector of the user. Use `prefix` to build
+    the same expression through relation, e.g. `prefix='user__'`
+    """
+    return SearchVector(f'{prefix}first_name', f'{prefix}last_name',
+                        config=NAME_SEARCH_CONFIG)
+
 
 class LearningPermissionsMixin:
     @property
@@ -281,6 +297,12 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
         _("CSCUser|photo"),
         upload_to=user_photo_upload_to,
         blank=True)
+    # Filled on upload instead of `ImageField.width_field` which reads
+    # the image on model init if values are empty
+    photo_width = models.PositiveIntegerField(
+        editable=False, blank=True, null=True)
+    photo_height = models.PositiveIntegerField(
+        editable=False, blank=True, null=True)
     cropbox_data = models.JSONField(
         blank=True,
         null=True
@@ -353,6 +375,19 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
         db_table = 'users_user'
         verbose_name = _("CSCUser|user")
         verbose_name_plural = _("CSCUser|users")
+        indexes = [
+            GinIndex(get_name_search_vector(),
+                     name='users_user_name_search_idx'),
+            # Speed up `icontains` lookups, e.g. admin search
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'),
+                     name='users_user_first_name_trgm_idx'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'),
+                     name='users_user_last_name_trgm_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'),
+                     name='users_user_email_trgm_idx'),
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'),
+                     name='users_user_username_trgm_idx'),
+        ]
 
     def get_group_permissions(self, obj=None):
         return PermissionsMixin.get_group_permissions(self, obj)
@@ -381,8 +416,33 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
         if not self.calendar_key:
             self.calendar_key = generate_hash(b'calendar',
                                               force_bytes(self.email))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'photo' in update_fields:
+            updated = self._update_photo_dimensions()
+            if updated and update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'photo_width',
+                                           'photo_height'}
         super().save(**kwargs)
 
+    def _update_photo_dimensions(self) -> bool:
+        """
+        Reads dimensions of the newly uploaded photo before it's sent to
+        the storage. Returns True if values were changed.
+        """
+        if not self.photo:
+            width, height = None, None
+        elif self.photo._committed:
+            return False
+        else:
+            try:
+                width, height = self.photo.width, self.photo.height
+            except (IOError, OSError):
+                width, height = None, None
+        if (width, height) == (self.photo_width, self.photo_height):
+            return False
+        self.photo_width, self.photo_height = width, height
+        return True
+
     def add_group(self, role) -> None:
         self.groups.get_or_create(user=self, role=role)
 
@@ -496,11 +556,15 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
     @property
     def photo_data(self):
         if self.photo:
+            width, height = self.photo_width, self.photo_height
             try:
+                if width is None or height is None:
+                    # Not backfilled yet, see `update_user_photos` command
+                    width, height = self.photo.width, self.photo.height
                 return {
                     "url": self.photo.url,
-                    "width": self.photo.width,
-                    "height": self.photo.height,
+                    "width": width,
+                    "height": height,
                     "cropbox": self.cropbox_data
                 }
             except (IOError, OSError):
@@ -531,58 +595,12 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
     def stats(self, semester, enrollments: Optional[EnrollmentQuerySet] = None):
         """
         Stats for SUCCESSFULLY completed courses and enrollments in
-        requested term.
-        Additional DB queries may occur:
-            * enrollment_set
-            * enrollment_set__course (for each enrollment)
-            * enrollment_set__course__courseclasses (for each course)
+        requested term. Use `learning.selectors.get_students_stats` to
+        collect stats of many students at once.
         """
-        center_courses = set()
-        club_courses = set()
-        failed_total = 0
-        in_current_term_total = 0
-        in_current_term_courses = set()
-        in_current_term_passed = 0
-        in_current_term_failed = 0
-        in_current_term_in_progress = 0
-        enrollments = enrollments or self.enrollment_set(manager='active').all()
-        for e in enrollments:
-            in_current_term = e.course.semester_id == semester.pk
-            grading_system = e.course_program_binding.grading_system
-            if in_current_term:
-                in_current_term_total += 1
-                in_current_term_courses.add(e.course.meta_course_id)
-            if e.grade >= grading_system.pass_from:
-                center_courses.add(e.course.meta_course_id)
-                in_current_term_passed += int(in_current_term)
-            elif in_current_term:
-                if e.grade < grading_system.pass_from:
-                    failed_total += 1
-                    in_current_term_failed += 1
-                else:
-                    in_current_term_in_progress += 1
-            else:
-                failed_total += 1
-
-        return {
-            "failed": {"total": failed_total},
-            # All the time
-            "passed": {
-                "total": len(center_courses) + len(club_courses),
-                "adjusted": len(center_courses),
-                "center_courses": center_courses,
-                "club_courses": club_courses,
-            },
-            # FIXME: collect stats for each term
-            "in_term": {
-                "total": in_current_term_total,
-                "courses": in_current_term_courses,  # center and club courses
-                "passed": in_current_term_passed,  # center and club
-                "failed": in_current_term_failed,  # center and club
-                # FIXME: adusted value, not int
-                "in_progress": in_current_term_in_progress,
-            }
-        }
+        from learning.selectors import get_students_stats
+        stats = get_students_stats(semester, [self.pk], enrollments=enrollments)
+        return stats[self.pk]
 
 
 class StudentTypes(DjangoChoices):
@@ -680,6 +698,12 @@ class StudentProfile(TimeStampedModel):
     is_paid_basis = models.BooleanField(
         verbose_name=_("Paid Basis"),
         default=False)
+    # Denormalized value, shared by all profiles of the user
+    passed_meta_courses_count = models.PositiveSmallIntegerField(
+        verbose_name=_("Passed Courses"),
+        editable=False,
+        default=0,
+        db_index=True)
     academic_disciplines = models.ManyToManyField(
         'study_programs.AcademicDiscipline',
         verbose_name=_("Fields of study"),
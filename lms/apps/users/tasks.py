@@ -1,9 +1,12 @@
+from typing import List
+
 from django.conf import settings
 from django_rq import job
 
 from core.urls import reverse, replace_hostname
 from core.utils import create_multipart_email
-from users.models import City
+from users.models import City, User
+from users.thumbnails import generate_user_thumbnails
 
 
 @job('default')
@@ -22,3 +25,12 @@ def send_new_city_email(city_id):
         settings.ADMIN_NOTIFICATIONS_EMAILS,
     )
     msg.send()
+
+
+@job('default')
+def warmup_user_thumbnails(*, user_ids: List[int]) -> int:
+    users = (User.objects
+             .filter(pk__in=user_ids)
+             .exclude(photo='')
+             .only('pk', 'photo', 'cropbox_data', 'gender'))
+    return sum(generate_user_thumbnails(user) for user in users)
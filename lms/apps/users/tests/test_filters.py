@@ -1,5 +1,6 @@
 import datetime
 import pytest
+from django.core.cache import cache
 from django.db import models
 from urllib.parse import urlencode
 
@@ -58,6 +59,12 @@ def test_student_search_by_name(client, settings, program_run_cub):
     search(client, name='ан', expected_count=0)
     # Make sure `ts_vector` works fine with single quotes
     search(client, name="'d", expected_count=0)
+    StudentFactory(student_profile__academic_program_enrollment=program_run_cub,
+                   last_name="O'Brien", first_name="Conan")
+    search(client, name="o'bri", expected_count=1)
+    search(client, name="conan o'brien", expected_count=1)
+    search(client, name="ив ив", expected_count=1)
+    search(client, name="ив (ив) !", expected_count=1)
 
 
 @pytest.mark.django_db
@@ -306,3 +313,44 @@ def test_filter_student_search_by_program_and_uni(
         expected_count=len(students_3)
     )
     assert {s.pk for s in students_3} == {r["user_id"] for r in results["results"]}
+
+
+@pytest.mark.django_db
+def test_student_search_count_free_pagination(client):
+    cache.clear()
+    curator = CuratorFactory()
+    client.login(curator)
+    StudentFactory.create_batch(3)
+    url = reverse_lazy('staff:student_search_json')
+    response = client.get(f'{url}?limit=2')
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data['count'] == 3
+    assert len(response_data['results']) == 2
+    assert 'offset=2' in response_data['next']
+    StudentFactory()
+    # Total is taken from the cache while the last page is not reached
+    response = client.get(f'{url}?limit=2')
+    response_data = response.json()
+    assert response_data['count'] == 3
+    assert response_data['next'] is not None
+    response = client.get(f'{url}?limit=2&offset=2')
+    response_data = response.json()
+    assert response_data['count'] == 4
+    assert len(response_data['results']) == 2
+    assert response_data['next'] is None
+
+
+@pytest.mark.django_db
+def test_student_search_count_free_pagination_out_of_range_empty(client):
+    cache.clear()
+    curator = CuratorFactory()
+    client.login(curator)
+    StudentFactory()
+    url = reverse_lazy('staff:student_search_json')
+    # Without filters the queryset is empty, count query can't be compiled
+    response = client.get(f'{url}?offset=500')
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data['results'] == []
+    assert response_data['count'] == 0
@@ -1,5 +1,9 @@
+from io import BytesIO
+
 import pytest
+from PIL import Image
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 from core.tests.settings import ANOTHER_DOMAIN_ID, TEST_DOMAIN_ID
 from core.utils import instance_memoize
@@ -252,3 +256,21 @@ def test_student_profile_validation(program_run_cub):
         profile.full_clean()
 
 
+@pytest.mark.django_db
+def test_user_photo_dimensions():
+    buffer = BytesIO()
+    Image.new('RGB', (50, 70)).save(buffer, format='PNG')
+    user = UserFactory()
+    assert user.photo_data is None
+    user.photo = SimpleUploadedFile('photo.png', buffer.getvalue(),
+                                    content_type='image/png')
+    user.save(update_fields=['photo'])
+    user.refresh_from_db()
+    assert user.photo_width == 50
+    assert user.photo_height == 70
+    assert user.photo_data['width'] == 50
+    user.photo = None
+    user.save()
+    user.refresh_from_db()
+    assert user.photo_width is None
+    assert user.photo_data is None
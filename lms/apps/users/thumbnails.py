@@ -1,16 +1,33 @@
-from typing import Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
 
+from sorl.thumbnail import default
 from sorl.thumbnail import get_thumbnail as sorl_get_thumbnail
-from sorl.thumbnail.images import BaseImageFile, DummyImageFile
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import (
+    BaseImageFile, DummyImageFile, ImageFile, deserialize_image_file
+)
+from sorl.thumbnail.kvstores.base import add_prefix
 
 from django import forms
+from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.core import checks
 from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db.models import ImageField
 
+from core.queues import enqueue_unique
 from users.constants import GenderTypes, ThumbnailSizes
 
+logger = logging.getLogger(__name__)
+
+# Missing thumbnails generated inline while resolving a batch, the rest
+# are replaced with stubs and generated in the background
+THUMBNAIL_BATCH_MAX_GENERATED = getattr(settings, "THUMBNAIL_BATCH_MAX_GENERATED", 10)
+THUMBNAIL_BATCH_WORKERS = getattr(settings, "THUMBNAIL_BATCH_WORKERS", 4)
+
 
 # TODO: add validation for unbound coords and width=img.width
 class CropboxData(forms.Form):
@@ -226,3 +243,136 @@ def get_thumbnail(path_to_img, geometry, stub_factory=None, **options) -> Option
         else:
             thumbnail = None  # DummyImageFile -> None
     return thumbnail
+
+
+def generate_user_thumbnails(user, geometries: Iterable[str] = ThumbnailSizes.values) -> int:
+    """
+    Generates photo thumbnails with the same options as templates do, so
+    they are served from the key-value store afterwards. Returns the number
+    of generated thumbnails.
+    """
+    generated = 0
+    for geometry in geometries:
+        if get_user_thumbnail(user, geometry, use_stub=False) is not None:
+            generated += 1
+    return generated
+
+
+class ThumbnailRequest(NamedTuple):
+    image: Any  # image field file or path
+    geometry: str
+    options: Dict[str, Any]
+
+
+class ThumbnailsBatch(NamedTuple):
+    thumbnails: List[Optional[BaseImageFile]]
+    hits: int
+    generated: int
+    # Indexes of requests with missing thumbnails that were not generated
+    deferred: List[int]
+
+
+def _get_thumbnail_name(source: ImageFile, geometry: str,
+                        options: Dict[str, Any]) -> str:
+    """Mirrors options processing of the sorl `ThumbnailBackend.get_thumbnail`"""
+    backend = default.backend
+    options = dict(options)
+    if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault('format', backend._get_format(source))
+    for key, value in backend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in backend.extra_options:
+        value = getattr(sorl_settings, attr)
+        if value != getattr(sorl_defaults, attr):
+            options.setdefault(key, value)
+    return backend._get_thumbnail_filename(source, geometry, options)
+
+
+def _get_cached_thumbnails(thumbnails: List[ImageFile]) -> List[Optional[ImageFile]]:
+    """Fetches thumbnails from the key-value store in a single round trip"""
+    kvstore = default.kvstore
+    keys = [add_prefix(thumbnail.key) for thumbnail in thumbnails]
+    connection = getattr(kvstore, 'connection', None)
+    if keys and hasattr(connection, 'mget'):
+        values = connection.mget(keys)
+    else:
+        values = [kvstore._get_raw(key) for key in keys]
+    return [deserialize_image_file(value) if value else None for value in values]
+
+
+def _generate_thumbnail(request: ThumbnailRequest) -> Optional[BaseImageFile]:
+    try:
+        thumbnail = sorl_get_thumbnail(request.image, request.geometry,
+                                       **request.options)
+    except Exception as e:
+        logger.exception(e)
+        return None
+    return None if isinstance(thumbnail, DummyImageFile) else thumbnail
+
+
+def get_thumbnails(requests: List[ThumbnailRequest],
+                   max_generated: int = THUMBNAIL_BATCH_MAX_GENERATED) -> ThumbnailsBatch:
+    """
+    Resolves thumbnails of many images with one key-value store query.
+    Up to `max_generated` missing thumbnails are generated in a thread
+    pool, thumbnails of other requests are returned as None along with
+    their indexes.
+    """
+    thumbnails: List[Optional[BaseImageFile]] = [None] * len(requests)
+    indexes, names = [], []
+    for i, request in enumerate(requests):
+        if request.image:
+            source = ImageFile(request.image)
+            indexes.append(i)
+            names.append(ImageFile(_get_thumbnail_name(source, request.geometry,
+                                                       request.options),
+                                   default.storage))
+    missing = []
+    for i, cached in zip(indexes, _get_cached_thumbnails(names)):
+        if cached is not None:
+            thumbnails[i] = cached
+        else:
+            missing.append(i)
+    generate, deferred = missing[:max_generated], missing[max_generated:]
+    if generate:
+        workers = min(THUMBNAIL_BATCH_WORKERS, len(generate))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            generated = executor.map(_generate_thumbnail,
+                                     [requests[i] for i in generate])
+            for i, thumbnail in zip(generate, generated):
+                thumbnails[i] = thumbnail
+    batch = ThumbnailsBatch(thumbnails=thumbnails,
+                            hits=len(indexes) - len(missing),
+                            generated=len(generate),
+                            deferred=deferred)
+    logger.info(f"Thumbnails batch of {len(indexes)} images: {batch.hits} hits, "
+                f"{batch.generated} generated, {len(deferred)} deferred")
+    return batch
+
+
+def get_users_thumbnails(users: Iterable, geometry: str, stub_official=True,
+                         **options) -> Dict[int, BaseImageFile]:
+    """
+    Batch version of the `get_user_thumbnail`. Returns thumbnails by user id,
+    stubs are used for users without a photo or with a deferred thumbnail.
+    """
+    from users.tasks import warmup_user_thumbnails
+    users = list(users)
+    options.setdefault("crop", "center top")
+    requests = [ThumbnailRequest(image=getattr(user, "photo", None),
+                                 geometry=geometry,
+                                 options={"cropbox": user.photo_thumbnail_cropbox(),
+                                          **options})
+                for user in users]
+    batch = get_thumbnails(requests)
+    if batch.deferred:
+        # Coalesce warmups requested by repeated renders of the same page
+        user_ids = sorted(users[i].pk for i in batch.deferred)
+        enqueue_unique(warmup_user_thumbnails, user_ids=user_ids)
+    thumbnails = {}
+    for user, thumbnail in zip(users, batch.thumbnails):
+        if thumbnail is None:
+            factory = get_stub_factory(user.gender, official=stub_official)
+            thumbnail = factory(geometry=geometry)
+        thumbnails[user.pk] = thumbnail
+    return thumbnails
@@ -4,7 +4,7 @@ from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
-from django.db.models import Count, Prefetch
+from django.db.models import Prefetch
 from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
@@ -37,6 +37,7 @@ from .permissions import (
     ViewAccountConnectedServiceProvider, UpdateStudentProfileStudentId, ViewProfile
 )
 from .services import get_student_profiles, assign_role
+from .tasks import warmup_user_thumbnails
 
 
 class StudentApplicationView(generic.FormView):
@@ -183,29 +184,19 @@ class UserDetailView(PermissionRequiredMixin, generic.TemplateView):
         context["appData"] = js_app_data
         # Collect stats about successfully passed courses
         if u.is_curator:
-            # TODO: add derivable classes_total field to Course model
-            queryset = (profile_user.enrollment_set(manager='active')
-                        .annotate(classes_total=Count('course__courseclass')))
-            context['stats'] = profile_user.stats(current_semester,
-                                                  enrollments=queryset)
+            context['stats'] = profile_user.stats(current_semester)
         if can_view_personal_data:
             context['enrollments'] = profile_user.enrollment_set.all()
 
             student_profiles = get_student_profiles(user=profile_user,
                                                     fetch_status_history=True)
             # Aggregate stats needed for student profiles
-            passed_courses = set()
-            in_current_term = set()
-            for enrollment in profile_user.enrollment_set.all():
-                grading_system = enrollment.course_program_binding.grading_system
-                if enrollment.grade >= grading_system.pass_from:
-                    passed_courses.add(enrollment.course.meta_course_id)
-                if enrollment.course.semester_id == current_semester.pk:
-                    in_current_term.add(enrollment.course.meta_course_id)
+            stats = profile_user.stats(current_semester,
+                                       enrollments=Enrollment.objects.all())
             context['student_profiles'] = student_profiles
             context['syllabus_legend'] = {
-                'passed_courses': passed_courses,
-                'in_current_term': in_current_term
+                'passed_courses': stats['passed']['center_courses'],
+                'in_current_term': stats['in_term']['courses']
             }
             if student_profiles:
                 main_profile = student_profiles[0]  # because of profile ordering
@@ -330,6 +321,7 @@ class ProfileImageUpdate(generic.base.View):
         if thumbnail:
             user.cropbox_data = crop_data_form.to_json()
             user.save(update_fields=['cropbox_data'])
+            warmup_user_thumbnails.delay(user_ids=[user.pk])
             ret_json = {"success": True, "thumbnail": thumbnail.url}
         else:
             ret_json = {"success": False, "reason": "Thumbnail generation error"}
@@ -345,6 +337,7 @@ class ProfileImageUpdate(generic.base.View):
         user.photo = image_file
         user.cropbox_data = {}
         user.save(update_fields=['photo', 'cropbox_data'])
+        warmup_user_thumbnails.delay(user_ids=[user.pk])
         image_url = user.photo.url
 
         # TODO: generate default crop settings and return them
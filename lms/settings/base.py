@@ -198,6 +198,11 @@ LOGO_PATH = "v1/img/center/logo.svg"
 # Provide zero value to disable counter rendering
 
 DJANGO_ROOT_DIR = Path(django.__file__).parent
+# Templates are precompiled into this directory by the `compile_jinja2_templates`
+# command at build time (see nix/jinja2-bytecode.nix)
+JINJA2_BYTECODE_CACHE_ENABLED = env.bool("JINJA2_BYTECODE_CACHE_ENABLED", default=True)
+JINJA2_BYTECODE_CACHE_DIR = env.str("JINJA2_BYTECODE_CACHE_DIR",
+                                    default=str(ROOT_DIR / "jinja2_bytecode"))
 TEMPLATES: List[Dict[str, Any]] = [
     {
         "BACKEND": "django_jinja.backend.Jinja2",
@@ -248,8 +253,8 @@ TEMPLATES: List[Dict[str, Any]] = [
             ],
             "bytecode_cache": {
                 "name": "default",
-                "backend": "django_jinja.cache.BytecodeCache",
-                "enabled": False,
+                "backend": "core.jinja2.cache.SourceChecksumBytecodeCache",
+                "enabled": JINJA2_BYTECODE_CACHE_ENABLED,
             },
             "newstyle_gettext": True,
             "auto_reload": DEBUG,
@@ -7,6 +7,7 @@
   productionEnv,
   frontendAssets,
   staticAssets,
+  jinja2Bytecode,
 
   uwsgi,
   busybox,
@@ -67,6 +68,9 @@ dockerTools.buildLayeredImage {
     cp -rL ${staticAssets}/static/* /var/www/static/
     cp -rL ${frontendAssets}/assets/* /var/www/frontend-code/assets/
     cp -L ${../docker-files/uwsgi.ini} /etc/uwsgi.ini
+    # Precompiled templates, the directory stays writable for the bytecode cache
+    cp -rL ${jinja2Bytecode}/jinja2_bytecode /var/www/code/
+    chmod -R u+w /var/www/code/jinja2_bytecode
 
     ${shadow}/bin/groupadd --gid 101 appuser
     ${shadow}/bin/useradd --uid 101 --gid 101 --no-create-home --shell /bin/bash appuser
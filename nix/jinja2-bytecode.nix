@@ -0,0 +1,35 @@
+{
+  stdenvNoCC,
+  pythonEnv,
+  src,
+  tzdata,
+}:
+stdenvNoCC.mkDerivation {
+  inherit src;
+  pname = "lms-jinja2-bytecode";
+  version = "0-unstable";
+
+  nativeBuildInputs = [
+    pythonEnv
+  ];
+
+  buildPhase = ''
+    runHook preBuild
+
+    mkdir -p "$JINJA2_BYTECODE_CACHE_DIR"
+    python manage.py compile_jinja2_templates
+
+    runHook postBuild
+  '';
+
+  env = {
+    DJANGO_SETTINGS_MODULE = "lms.settings.extended";
+    ENV_FILE = "${src}/lms/settings/.env.example";
+    PYTHONTZPATH = "${tzdata}/share/zoneinfo";
+    DJANGO_SECRET_KEY = "build-time-secret-key-not-for-production";
+    DATABASE_URL = "sqlite:///:memory:";
+    JINJA2_BYTECODE_CACHE_DIR = "${placeholder "out"}/jinja2_bytecode";
+  };
+
+  doFixup = false;
+}